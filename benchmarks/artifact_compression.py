@@ -0,0 +1,58 @@
+"""Compare stored size and load-plus-validate time of artifact compression codecs.
+
+Artifacts are built from the benchmark corpus (``corpus.py``), which compresses
+roughly like real text rather than like repeated boilerplate. For every format and
+codec the artifact is serialized once, then loaded with ``deserialize_artifact``
+(decompress, decode and pydantic validation) ``--repeat`` times.
+
+Usage::
+
+    python benchmarks/artifact_compression.py --pages 50 300 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from uuid import uuid4
+
+from corpus import CorpusSpec, generate_document
+
+from vectorless_rag_service.indexing.index_builder import BaselineIndexBuilder
+from vectorless_rag_service.storage.artifacts import deserialize_artifact, serialize_artifact
+from vectorless_rag_service.storage.compression import build_codec
+
+CODECS = [("none", None), ("gzip", 1), ("gzip", 6), ("zstd", 3), ("zstd", 9)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Artifact compression benchmark")
+    parser.add_argument("--pages", type=int, nargs="+", default=[50, 300])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'pages':>5} {'format':>6} {'codec':>7} {'kb':>8} {'ratio':>6} {'load_ms':>8}")
+    for pages in args.pages:
+        document_id = uuid4()
+        artifact = BaselineIndexBuilder(max_pages=pages).build(
+            document_id, generate_document(CorpusSpec(pages=pages))
+        )
+        for artifact_format in ("json", "binary"):
+            baseline = len(serialize_artifact(artifact, artifact_format))
+            for name, level in CODECS:
+                data = serialize_artifact(artifact, artifact_format, build_codec(name, level))
+                timings = []
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    deserialize_artifact(data, artifact_format)
+                    timings.append(time.perf_counter() - start)
+                label = name if level is None else f"{name}-{level}"
+                print(
+                    f"{pages:>5} {artifact_format:>6} {label:>7} {len(data) / 1024:>8.0f} "
+                    f"{baseline / len(data):>6.2f} {statistics.median(timings) * 1000:>8.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
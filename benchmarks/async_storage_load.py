@@ -0,0 +1,140 @@
+"""Compare request latency with blocking and thread-offloaded artifact reads.
+
+A mixed open-loop load of artifact queries (against a store with injected I/O
+latency) and cheap health checks is driven through the ASGI app at a fixed arrival
+rate. Latency is measured from each request's scheduled start, so time spent
+waiting behind a blocked event loop is counted. With blocking reads every slow
+query stalls the loop and the p99 of both routes grows with the backlog; with
+``ThreadedArtifactStore`` the health checks stay fast and queries cost roughly the
+injected latency.
+
+Usage::
+
+    python benchmarks/async_storage_load.py --requests 400 --rate 200 --latency-ms 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from uuid import UUID, uuid4
+
+import httpx
+from fastapi import FastAPI
+
+from vectorless_rag_service.core.interfaces import ArtifactStore, AsyncArtifactStore
+from vectorless_rag_service.core.models import IndexArtifact
+from vectorless_rag_service.indexing.index_builder import BaselineIndexBuilder
+from vectorless_rag_service.storage.artifacts import ThreadedArtifactStore
+
+
+class SlowArtifactStore(ArtifactStore):
+    """In-memory store that sleeps on every read, like a slow disk or S3 call."""
+
+    def __init__(self, latency_seconds: float) -> None:
+        self.latency_seconds = latency_seconds
+        self.artifacts: dict[UUID, IndexArtifact] = {}
+
+    def put(self, document_id: UUID, artifact: IndexArtifact) -> str:
+        self.artifacts[document_id] = artifact
+        return f"memory://{document_id}"
+
+    def get(self, document_id: UUID) -> IndexArtifact:
+        time.sleep(self.latency_seconds)
+        return self.artifacts[document_id]
+
+    def exists(self, document_id: UUID) -> bool:
+        time.sleep(self.latency_seconds)
+        return document_id in self.artifacts
+
+
+class BlockingArtifactStore(AsyncArtifactStore):
+    """Async signature over direct sync calls: what the routes used to do."""
+
+    def __init__(self, inner: ArtifactStore) -> None:
+        self.inner = inner
+
+    async def put(self, document_id: UUID, artifact: IndexArtifact) -> str:
+        return self.inner.put(document_id, artifact)
+
+    async def get(self, document_id: UUID) -> IndexArtifact:
+        return self.inner.get(document_id)
+
+    async def exists(self, document_id: UUID) -> bool:
+        return self.inner.exists(document_id)
+
+
+def build_app(store: AsyncArtifactStore) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/healthz")
+    async def healthz():
+        return {"status": "ok"}
+
+    @app.get("/artifacts/{document_id}")
+    async def artifact(document_id: UUID):
+        if not await store.exists(document_id):
+            return {"nodes": 0}
+        return {"nodes": len((await store.get(document_id)).nodes)}
+
+    return app
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run_load(
+    store: AsyncArtifactStore, document_id: UUID, requests: int, rate: float
+) -> dict[str, list[float]]:
+    transport = httpx.ASGITransport(app=build_app(store))
+    latencies: dict[str, list[float]] = {"query": [], "healthz": []}
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        origin = time.perf_counter()
+
+        async def one(index: int) -> None:
+            kind = "healthz" if index % 2 else "query"
+            path = "/healthz" if kind == "healthz" else f"/artifacts/{document_id}"
+            scheduled = origin + index / rate
+            await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+            response = await client.get(path)
+            latencies[kind].append(time.perf_counter() - scheduled)
+            response.raise_for_status()
+
+        await asyncio.gather(*(one(index) for index in range(requests)))
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Blocking vs threaded artifact store latency")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--rate", type=float, default=200.0, help="requests per second")
+    parser.add_argument("--latency-ms", type=float, default=10.0)
+    parser.add_argument("--threads", type=int, default=16)
+    args = parser.parse_args()
+
+    inner = SlowArtifactStore(args.latency_ms / 1000)
+    document_id = uuid4()
+    inner.put(document_id, BaselineIndexBuilder().build(document_id, "1 Intro\n\nHello."))
+    stores: dict[str, AsyncArtifactStore] = {
+        "blocking": BlockingArtifactStore(inner),
+        "threaded": ThreadedArtifactStore(inner, max_threads=args.threads),
+    }
+
+    print(f"{'store':>9} {'route':>8} {'p50_ms':>8} {'p99_ms':>8} {'wall_s':>7}")
+    for name, store in stores.items():
+        start = time.perf_counter()
+        latencies = asyncio.run(run_load(store, document_id, args.requests, args.rate))
+        wall = time.perf_counter() - start
+        for route, values in latencies.items():
+            p50 = statistics.median(values) * 1000
+            p99 = percentile(values, 0.99) * 1000
+            print(f"{name:>9} {route:>8} {p50:>8.1f} {p99:>8.1f} {wall:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
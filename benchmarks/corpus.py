@@ -0,0 +1,63 @@
+"""Synthetic contract-like documents for benchmarks.
+
+Words are drawn from a Zipf-distributed generated vocabulary, so text tokenizes
+and compresses roughly like real prose rather than like repeated boilerplate.
+Every document is fully determined by its ``CorpusSpec``.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import asdict, dataclass
+
+SYLLABLES = ["ter", "min", "ob", "lig", "ser", "vice", "pro", "vid", "data", "cus", "tom", "al"]
+QUESTIONS = [
+    "termination notice period",
+    "what is the summary?",
+    "data retention obligations",
+    "service level credits",
+    "Section 12",
+    "liability cap",
+]
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    pages: int = 100
+    # Headings per page; fractional values spread headings over several pages.
+    headings_per_page: float = 1.0
+    paragraph_words: tuple[int, int] = (25, 45)
+    # Characters per page before a new page starts, matching the parser's threshold.
+    page_chars: int = 2000
+    vocabulary: int = 3000
+    seed: int = 7
+
+    def as_dict(self) -> dict[str, object]:
+        return asdict(self)
+
+
+def generate_document(spec: CorpusSpec) -> str:
+    rng = random.Random(spec.seed)
+    vocabulary = [
+        "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3)))
+        for _ in range(spec.vocabulary)
+    ]
+    weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+    paragraphs: list[str] = []
+    headings = 0.0
+    for page in range(1, spec.pages + 1):
+        headings += spec.headings_per_page
+        page_headings = int(headings)
+        headings -= page_headings
+        size = 0
+        section = 0
+        while size <= spec.page_chars:
+            if section < page_headings and size >= section * spec.page_chars / page_headings:
+                section += 1
+                paragraph = f"{page}.{section} Section {page}.{section}"
+            else:
+                words = rng.choices(vocabulary, weights, k=rng.randint(*spec.paragraph_words))
+                paragraph = " ".join(words).capitalize() + "."
+            paragraphs.append(paragraph)
+            size += len(paragraph) + 2
+    return "\n\n".join(paragraphs)
@@ -0,0 +1,417 @@
+"""Open-loop HTTP load test of the upload, index, job polling and query flow.
+
+Operations arrive at ``--rate`` per second (evenly spaced, or Poisson with
+``--arrival poisson``). Each arrival picks an operation from ``--mix``. A request
+starts at its scheduled time whether or not earlier requests have finished, and
+its latency is measured from that time. Any wait behind a saturated server or
+connection pool is therefore included.
+
+- ``upload`` posts a generated document (see ``corpus.py``) as a text file. Every
+  upload gets a unique first line, so none are deduplicated.
+- ``index`` starts a build of a document that has been uploaded but not yet
+  indexed. The job is then polled every ``--poll-interval`` until it finishes.
+  Time-to-index runs from the index request to the first poll that sees success.
+- ``poll`` fetches a random known job.
+- ``query`` asks a random question of a random indexed document.
+
+Before the run, ``--documents`` documents are uploaded and indexed so that
+queries have targets from the start. Without ``--url``, a uvicorn server is
+started on a free port with a temporary data directory. ``VRS_*`` variables in
+the environment override the generated settings, and ``--workers`` sets the
+process count.
+
+Per-endpoint throughput, p50/p95/p99 latency and error rates are printed. The
+same numbers, plus time-to-index, are written as JSON with ``--output``.
+
+Usage::
+
+    python benchmarks/http_load.py --duration 30 --rate 20 --output load.json
+    python benchmarks/http_load.py --url http://localhost:8000 --mix upload=1,index=1,query=20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+import httpx
+from corpus import QUESTIONS, CorpusSpec, generate_document
+
+ENDPOINTS = {
+    "upload": "POST /v1/documents",
+    "index": "POST /v1/documents/{document_id}/index",
+    "poll": "GET /v1/jobs/{job_id}",
+    "query": "POST /v1/query",
+}
+DEFAULT_MIX = "upload=1,index=1,poll=2,query=16"
+
+
+@dataclass
+class Sample:
+    operation: str
+    latency: float
+    # None when the request failed before a response arrived.
+    status: int | None
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    mix: dict[str, float] = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(
+                f"unknown operation {name!r}; choose from {', '.join(ENDPOINTS)}"
+            )
+        mix[name] = float(weight) if weight else 1.0
+    if not any(weight > 0 for weight in mix.values()):
+        raise argparse.ArgumentTypeError("the mix needs at least one positive weight")
+    return mix
+
+
+class LoadRun:
+    """Documents and jobs created so far, plus every recorded sample."""
+
+    def __init__(
+        self, client: httpx.AsyncClient, text: str, poll_interval: float, rng: random.Random
+    ) -> None:
+        self.client = client
+        self.text = text
+        self.poll_interval = poll_interval
+        self.rng = rng
+        self.recording = True
+        self.samples: list[Sample] = []
+        self.skipped: Counter[str] = Counter()
+        self.uploaded: list[str] = []
+        self.indexed: list[str] = []
+        self.jobs: list[str] = []
+        self.time_to_index: list[float] = []
+        self.index_failures = 0
+        self.trackers: set[asyncio.Task[None]] = set()
+
+    async def _request(
+        self, operation: str, method: str, path: str, scheduled: float, **kwargs: Any
+    ) -> httpx.Response | None:
+        status = None
+        try:
+            response = await self.client.request(method, path, **kwargs)
+            status = response.status_code
+        except httpx.HTTPError:
+            response = None
+        if self.recording:
+            self.samples.append(Sample(operation, time.perf_counter() - scheduled, status))
+        return response if response is not None and response.is_success else None
+
+    async def upload(self, scheduled: float) -> None:
+        text = f"Load test document {uuid4()}\n\n{self.text}"
+        files = {"file": ("load.txt", text.encode("utf-8"), "text/plain")}
+        response = await self._request("upload", "POST", "/v1/documents", scheduled, files=files)
+        if response is not None:
+            self.uploaded.append(response.json()["document_id"])
+
+    async def index(self, scheduled: float) -> None:
+        if not self.uploaded:
+            self.skipped["index"] += 1
+            return
+        document_id = self.uploaded.pop(0)
+        response = await self._request(
+            "index", "POST", f"/v1/documents/{document_id}/index", scheduled
+        )
+        if response is None:
+            return
+        job_id = response.json()["job_id"]
+        self.jobs.append(job_id)
+        tracker = asyncio.create_task(self._track(document_id, job_id, scheduled))
+        self.trackers.add(tracker)
+        tracker.add_done_callback(self.trackers.discard)
+
+    async def _track(self, document_id: str, job_id: str, started: float) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            response = await self._request("poll", "GET", f"/v1/jobs/{job_id}", time.perf_counter())
+            status = None if response is None else response.json()["status"]
+            if status == "succeeded":
+                self.time_to_index.append(time.perf_counter() - started)
+                self.indexed.append(document_id)
+                return
+            if status == "failed":
+                self.index_failures += 1
+                return
+
+    async def poll(self, scheduled: float) -> None:
+        if not self.jobs:
+            self.skipped["poll"] += 1
+            return
+        job_id = self.rng.choice(self.jobs)
+        await self._request("poll", "GET", f"/v1/jobs/{job_id}", scheduled)
+
+    async def query(self, scheduled: float) -> None:
+        if not self.indexed:
+            self.skipped["query"] += 1
+            return
+        body = {
+            "document_id": self.rng.choice(self.indexed),
+            "question": self.rng.choice(QUESTIONS),
+        }
+        await self._request("query", "POST", "/v1/query", scheduled, json=body)
+
+    async def drain(self, timeout: float) -> int:
+        """Wait for outstanding index jobs; return how many did not finish in time."""
+        if self.trackers:
+            await asyncio.wait(set(self.trackers), timeout=timeout)
+        unfinished = len(self.trackers)
+        for tracker in list(self.trackers):
+            tracker.cancel()
+        return unfinished
+
+
+async def open_loop(
+    run: LoadRun, mix: dict[str, float], rate: float, duration: float, poisson: bool
+) -> float:
+    """Issue operations on schedule for ``duration`` seconds; return the elapsed time."""
+    handlers: dict[str, Callable[[float], Awaitable[None]]] = {
+        "upload": run.upload,
+        "index": run.index,
+        "poll": run.poll,
+        "query": run.query,
+    }
+    operations = list(mix)
+    weights = [mix[operation] for operation in operations]
+    tasks = []
+    origin = time.perf_counter()
+    offset = 0.0
+    while True:
+        offset += run.rng.expovariate(rate) if poisson else 1 / rate
+        if offset >= duration:
+            break
+        scheduled = origin + offset
+        await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+        operation = run.rng.choices(operations, weights)[0]
+        tasks.append(asyncio.create_task(handlers[operation](scheduled)))
+    await asyncio.gather(*tasks)
+    return time.perf_counter() - origin
+
+
+def summarize(run: LoadRun, elapsed: float, unfinished: int) -> dict[str, Any]:
+    endpoints: dict[str, Any] = {}
+    for operation, endpoint in ENDPOINTS.items():
+        samples = [sample for sample in run.samples if sample.operation == operation]
+        if not samples:
+            continue
+        latencies = [sample.latency for sample in samples]
+        errors = sum(1 for sample in samples if sample.status is None or sample.status >= 400)
+        statuses = Counter(str(sample.status or "error") for sample in samples)
+        endpoints[endpoint] = {
+            "requests": len(samples),
+            "errors": errors,
+            "error_rate": errors / len(samples),
+            "throughput_per_s": len(samples) / elapsed,
+            "mean_ms": statistics.fmean(latencies) * 1000,
+            "p50_ms": percentile(latencies, 0.5) * 1000,
+            "p95_ms": percentile(latencies, 0.95) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000,
+            "status_codes": dict(sorted(statuses.items())),
+        }
+    times = run.time_to_index
+    time_to_index: dict[str, Any] = {
+        "succeeded": len(times),
+        "failed": run.index_failures,
+        "unfinished": unfinished,
+    }
+    if times:
+        time_to_index |= {
+            "p50_s": percentile(times, 0.5),
+            "p95_s": percentile(times, 0.95),
+            "p99_s": percentile(times, 0.99),
+        }
+    return {
+        "elapsed_s": elapsed,
+        "requests": len(run.samples),
+        "throughput_per_s": len(run.samples) / elapsed,
+        "endpoints": endpoints,
+        "time_to_index": time_to_index,
+        "skipped": dict(run.skipped),
+    }
+
+
+async def run_load(args: argparse.Namespace, url: str) -> dict[str, Any]:
+    rng = random.Random(args.seed)
+    text = generate_document(CorpusSpec(pages=args.pages, seed=args.seed))
+    limits = httpx.Limits(max_connections=args.connections, max_keepalive_connections=None)
+    async with httpx.AsyncClient(
+        base_url=url,
+        headers={"X-API-Key": args.api_key},
+        limits=limits,
+        timeout=args.timeout,
+    ) as client:
+        run = LoadRun(client, text, args.poll_interval, rng)
+        run.recording = False
+        now = time.perf_counter()
+        await asyncio.gather(*(run.upload(now) for _ in range(args.documents)))
+        await asyncio.gather(*(run.index(now) for _ in range(args.documents)))
+        await run.drain(args.drain_timeout)
+        if not run.indexed and args.mix.get("query"):
+            print("warning: no document was indexed before the run", file=sys.stderr)
+        run.time_to_index.clear()
+        run.index_failures = 0
+
+        run.recording = True
+        elapsed = await open_loop(
+            run, args.mix, args.rate, args.duration, args.arrival == "poisson"
+        )
+        run.recording = False
+        unfinished = await run.drain(args.drain_timeout)
+    return summarize(run, elapsed, unfinished)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def local_server(workers: int, api_key: str, data_dir: Path) -> Iterator[str]:
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+    env = dict(os.environ)
+    for name, value in {
+        "VRS_DATABASE__URL": f"sqlite:///{data_dir}/metadata.db",
+        "VRS_STORAGE__LOCAL_PATH": str(data_dir / "artifacts"),
+        "VRS_STORAGE__BLOB_PATH": str(data_dir / "blobs"),
+        "VRS_QUERY_CACHE__PATH": str(data_dir / "query_cache.db"),
+        "VRS_AUTH__API_KEY": api_key,
+    }.items():
+        env.setdefault(name, value)
+    command = [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "vectorless_rag_service.main:app",
+        "--host",
+        "127.0.0.1",
+        "--port",
+        str(port),
+        "--workers",
+        str(workers),
+        "--no-access-log",
+    ]
+    log_path = data_dir / "server.log"
+    headers = {"X-API-Key": env["VRS_AUTH__API_KEY"]}
+    with log_path.open("wb") as log:
+        process = subprocess.Popen(command, env=env, stdout=log, stderr=subprocess.STDOUT)
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"server exited early; see {log_path}")
+            try:
+                if httpx.get(f"{url}/healthz", headers=headers, timeout=1).is_success:
+                    break
+            except httpx.HTTPError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"server did not become healthy; see {log_path}")
+            time.sleep(0.1)
+        yield url
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Open-loop HTTP load test")
+    parser.add_argument("--url", help="Target a running server instead of starting one")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers when local")
+    parser.add_argument("--data-dir", type=Path, help="Local server data (default: temporary)")
+    parser.add_argument("--api-key", default="dev-key")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX))
+    parser.add_argument("--rate", type=float, default=20.0, help="operations per second")
+    parser.add_argument("--arrival", choices=["uniform", "poisson"], default="uniform")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of arrivals")
+    parser.add_argument("--documents", type=int, default=3, help="indexed before the run")
+    parser.add_argument("--pages", type=int, default=10, help="pages per uploaded document")
+    parser.add_argument("--poll-interval", type=float, default=0.25)
+    parser.add_argument("--drain-timeout", type=float, default=60.0)
+    parser.add_argument("--connections", type=int, default=100)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    args = parser.parse_args()
+
+    if args.url is not None:
+        summary = asyncio.run(run_load(args, args.url))
+    else:
+        with tempfile.TemporaryDirectory() as temporary:
+            data_dir = args.data_dir or Path(temporary)
+            data_dir.mkdir(parents=True, exist_ok=True)
+            with local_server(args.workers, args.api_key, data_dir.resolve()) as url:
+                summary = asyncio.run(run_load(args, url))
+
+    print(
+        f"{'endpoint':>38} {'reqs':>6} {'rps':>7} {'p50_ms':>8} {'p95_ms':>8} "
+        f"{'p99_ms':>8} {'errors':>7}"
+    )
+    for endpoint, stats in summary["endpoints"].items():
+        print(
+            f"{endpoint:>38} {stats['requests']:>6} {stats['throughput_per_s']:>7.1f} "
+            f"{stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f} "
+            f"{stats['error_rate']:>7.1%}"
+        )
+    time_to_index = summary["time_to_index"]
+    if "p50_s" in time_to_index:
+        print(
+            f"time to index: p50 {time_to_index['p50_s']:.2f}s p95 {time_to_index['p95_s']:.2f}s "
+            f"p99 {time_to_index['p99_s']:.2f}s over {time_to_index['succeeded']} jobs"
+        )
+
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        report = {
+            "created_at": datetime.now(UTC).isoformat(),
+            "target": args.url or f"local uvicorn, {args.workers} worker(s)",
+            "config": {
+                "mix": args.mix,
+                "rate": args.rate,
+                "arrival": args.arrival,
+                "duration_s": args.duration,
+                "documents": args.documents,
+                "pages": args.pages,
+                "poll_interval_s": args.poll_interval,
+                "connections": args.connections,
+                "seed": args.seed,
+            },
+            **summary,
+        }
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
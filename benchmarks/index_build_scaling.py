@@ -0,0 +1,41 @@
+"""Measure how BaselineIndexBuilder.build time scales with page count.
+
+Usage::
+
+    python benchmarks/index_build_scaling.py --pages 25 50 100 200 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from uuid import uuid4
+
+from corpus import CorpusSpec, generate_document
+
+from vectorless_rag_service.indexing.index_builder import BaselineIndexBuilder
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="BaselineIndexBuilder scaling benchmark")
+    parser.add_argument("--pages", type=int, nargs="+", default=[25, 50, 100, 200, 300])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    builder = BaselineIndexBuilder(max_pages=max(args.pages))
+    print(f"{'pages':>6} {'built':>6} {'median_ms':>10} {'us_per_page':>12}")
+    for pages in args.pages:
+        text = generate_document(CorpusSpec(pages=pages))
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            artifact = builder.build(uuid4(), text)
+            timings.append(time.perf_counter() - start)
+        built = artifact.nodes[0].page_end
+        median = statistics.median(timings)
+        print(f"{pages:>6} {built:>6} {median * 1000:>10.1f} {median / built * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""LLM tree navigation against the deterministic fake LLM server, fully offline.
+
+The fake server (``vectorless_rag_service.llm.fake_server``) runs in this process on
+a free port, with ``--latency-ms`` of simulated model latency per call. Queries are
+drawn with a fixed seed from ``--distinct`` questions about a generated document, so
+repeats exercise the decision cache, and are sent by ``--clients`` threads. Each
+configuration of the concurrency cap, with and without the cache, reports the
+latency per query, the LLM calls made and the queries that fell back to the
+baseline retriever. The baseline retriever's latency is reported for reference.
+
+Usage::
+
+    python benchmarks/llm_navigation.py --pages 40 --queries 200 --latency-ms 40
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import socket
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+import httpx
+import uvicorn
+from corpus import QUESTIONS, CorpusSpec, generate_document
+
+from vectorless_rag_service.core.interfaces import VectorlessRetriever
+from vectorless_rag_service.core.models import IndexArtifact, QueryRequest
+from vectorless_rag_service.indexing.index_builder import BaselineIndexBuilder
+from vectorless_rag_service.llm.client import HttpLLMClient
+from vectorless_rag_service.llm.fake_server import create_fake_llm_app
+from vectorless_rag_service.retrieval.baseline_retriever import BaselineTreeRetriever
+from vectorless_rag_service.retrieval.llm_navigator import LLMNavigationRetriever
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_fake_llm(latency_ms: float) -> str:
+    port = free_port()
+    config = uvicorn.Config(
+        create_fake_llm_app(latency_ms / 1000), host="127.0.0.1", port=port, log_level="warning"
+    )
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    url = f"http://127.0.0.1:{port}/v1"
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("fake LLM server did not start")
+        time.sleep(0.05)
+    return url
+
+
+def llm_calls(url: str) -> int:
+    return httpx.get(f"{url}/stats").json()["calls"]
+
+
+def run(
+    retriever: VectorlessRetriever,
+    artifact: IndexArtifact,
+    requests: list[QueryRequest],
+    clients: int,
+) -> tuple[list[float], int]:
+    def one(request: QueryRequest) -> tuple[float, bool]:
+        start = time.perf_counter()
+        response = retriever.retrieve(artifact, request)
+        # The baseline's trace scores nodes; navigation records confidences.
+        fell_back = "score=" in response.trace.decisions[-1]
+        return time.perf_counter() - start, fell_back
+
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        results = list(pool.map(one, requests))
+    return [latency for latency, _ in results], sum(fell_back for _, fell_back in results)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="LLM navigation benchmark")
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--distinct", type=int, default=40)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=40.0)
+    parser.add_argument("--max-concurrency", type=int, nargs="+", default=[4, 16])
+    parser.add_argument("--deadline", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    spec = CorpusSpec(pages=args.pages, headings_per_page=3)
+    artifact = BaselineIndexBuilder(max_pages=args.pages).build(uuid4(), generate_document(spec))
+    rng = random.Random(args.seed)
+    pool = list(QUESTIONS) + [
+        f"Section {page}.{section}" for page in range(1, args.pages + 1) for section in (1, 2, 3)
+    ]
+    questions = rng.sample(pool, min(args.distinct, len(pool)))
+    requests = [
+        QueryRequest(document_id=artifact.document_id, question=rng.choice(questions))
+        for _ in range(args.queries)
+    ]
+    url = start_fake_llm(args.latency_ms)
+
+    print(
+        f"{'retriever':>9} {'cap':>4} {'cache':>5} {'p50_ms':>8} {'p95_ms':>8} "
+        f"{'qps':>7} {'llm_calls':>9} {'fallbacks':>9}"
+    )
+    start = time.perf_counter()
+    latencies, _ = run(BaselineTreeRetriever(), artifact, requests, args.clients)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{'baseline':>9} {'-':>4} {'-':>5} {statistics.median(latencies) * 1000:>8.1f} "
+        f"{statistics.quantiles(latencies, n=20)[18] * 1000:>8.1f} "
+        f"{len(requests) / elapsed:>7.1f} {0:>9} {0:>9}"
+    )
+    for cap in args.max_concurrency:
+        for cache_entries in (0, 10_000):
+            navigator = LLMNavigationRetriever(
+                HttpLLMClient(url, "fake", max_connections=cap),
+                BaselineTreeRetriever(),
+                max_concurrency=cap,
+                deadline_seconds=args.deadline,
+                cache_entries=cache_entries,
+                preview_chars=200,
+            )
+            calls_before = llm_calls(url)
+            start = time.perf_counter()
+            latencies, fallbacks = run(navigator, artifact, requests, args.clients)
+            elapsed = time.perf_counter() - start
+            navigator.close()
+            print(
+                f"{'llm':>9} {cap:>4} {'on' if cache_entries else 'off':>5} "
+                f"{statistics.median(latencies) * 1000:>8.1f} "
+                f"{statistics.quantiles(latencies, n=20)[18] * 1000:>8.1f} "
+                f"{len(requests) / elapsed:>7.1f} {llm_calls(url) - calls_before:>9} "
+                f"{fallbacks:>9}"
+            )
+
+
+if __name__ == "__main__":
+    main()
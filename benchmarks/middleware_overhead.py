@@ -0,0 +1,133 @@
+"""Per-request cost of the observability middleware.
+
+A minimal FastAPI app with one ``/v1/jobs/{job_id}`` route is called directly as an
+ASGI app, without a server or HTTP client. Each request uses a fresh job id. The
+app runs three ways: bare, wrapped in the previous ``BaseHTTPMiddleware``
+implementation (labelled by raw path), and wrapped in ``ObservabilityMiddleware``.
+For each, the benchmark reports the mean and p99 time per request, the overhead
+over the bare app, and the number of latency time series left behind.
+
+Usage::
+
+    python benchmarks/middleware_overhead.py --requests 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from fastapi import FastAPI, Request, Response
+from prometheus_client import CollectorRegistry, Counter, Histogram
+from starlette.middleware.base import BaseHTTPMiddleware
+from structlog.contextvars import bind_contextvars, clear_contextvars
+
+from vectorless_rag_service.observability.metrics import REQUEST_LATENCY
+from vectorless_rag_service.observability.middleware import ObservabilityMiddleware
+
+REGISTRY = CollectorRegistry()
+PATH_COUNT = Counter("bench_requests_total", "", ["method", "path", "status"], registry=REGISTRY)
+PATH_LATENCY = Histogram("bench_latency_seconds", "", ["method", "path"], registry=REGISTRY)
+
+
+class PathLabelledMiddleware(BaseHTTPMiddleware):
+    """What the API used before: BaseHTTPMiddleware, labelled by the raw path."""
+
+    async def dispatch(self, request: Request, call_next):
+        request_id = request.headers.get("X-Request-Id") or str(uuid.uuid4())
+        bind_contextvars(request_id=request_id)
+        start = time.time()
+        response: Response = await call_next(request)
+        duration = time.time() - start
+        PATH_LATENCY.labels(request.method, request.url.path).observe(duration)
+        PATH_COUNT.labels(request.method, request.url.path, response.status_code).inc()
+        response.headers["X-Request-Id"] = request_id
+        clear_contextvars()
+        return response
+
+
+def build_app(middleware: type | None) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/v1/jobs/{job_id}")
+    async def get_job(job_id: str):
+        return {"job_id": job_id, "status": "succeeded"}
+
+    if middleware is not None:
+        app.add_middleware(middleware)
+    return app
+
+
+async def call(app: FastAPI, path: str) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1),
+        "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200
+
+    await app(scope, receive, send)
+
+
+async def run(app: FastAPI, requests: int) -> list[float]:
+    for _ in range(200):
+        await call(app, f"/v1/jobs/{uuid.uuid4()}")
+    timings = []
+    for _ in range(requests):
+        path = f"/v1/jobs/{uuid.uuid4()}"
+        start = time.perf_counter()
+        await call(app, path)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def series(histogram: Histogram) -> int:
+    return sum(
+        1
+        for metric in histogram.collect()
+        for sample in metric.samples
+        if sample.name.endswith("_count")
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Observability middleware overhead")
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    variants: list[tuple[str, type | None, Histogram | None]] = [
+        ("none", None, None),
+        ("base_http", PathLabelledMiddleware, PATH_LATENCY),
+        ("asgi", ObservabilityMiddleware, REQUEST_LATENCY),
+    ]
+    print(f"{'middleware':>10} {'mean_us':>8} {'p99_us':>8} {'overhead_us':>11} {'series':>7}")
+    bare = None
+    for name, middleware, histogram in variants:
+        timings = asyncio.run(run(build_app(middleware), args.requests))
+        mean = statistics.fmean(timings) * 1e6
+        p99 = sorted(timings)[int(0.99 * len(timings))] * 1e6
+        bare = mean if bare is None else bare
+        count = series(histogram) if histogram is not None else 0
+        print(f"{name:>10} {mean:>8.1f} {p99:>8.1f} {mean - bare:>11.1f} {count:>7}")
+
+
+if __name__ == "__main__":
+    main()
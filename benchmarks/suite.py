@@ -0,0 +1,254 @@
+"""Microbenchmarks for the indexing and retrieval hot paths.
+
+Each stage runs against a generated corpus (see ``corpus.py``). After a warm-up, every
+stage is timed ``--repeat`` times and reported with latency percentiles and throughput.
+Stages faster than ``--min-sample-ms`` are called several times per sample, and the
+per-call average is recorded. One extra run under ``tracemalloc`` gives each stage's
+peak memory. That run is kept out of the timings because tracing slows
+allocation-heavy code.
+
+Results are written as JSON. With ``--baseline``, each stage's median latency and peak
+memory are compared against a saved run. The process exits with status 1 when either
+grows by more than ``--threshold``.
+
+Usage::
+
+    python benchmarks/suite.py --output benchmarks/results/latest.json
+    python benchmarks/suite.py --baseline benchmarks/results/baseline.json --threshold 0.25
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from uuid import uuid4
+
+from corpus import QUESTIONS, CorpusSpec, generate_document
+
+from vectorless_rag_service.core.models import QueryRequest
+from vectorless_rag_service.indexing.index_builder import BaselineIndexBuilder
+from vectorless_rag_service.indexing.parser import iter_sections, parse_text
+from vectorless_rag_service.retrieval.baseline_retriever import BaselineTreeRetriever
+from vectorless_rag_service.retrieval.postings_retriever import PostingsRetriever
+from vectorless_rag_service.storage.artifacts import deserialize_artifact, serialize_artifact
+from vectorless_rag_service.storage.compression import build_codec
+
+
+@dataclass
+class Stage:
+    name: str
+    unit: str
+    units: int
+    run: Callable[[], object]
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def build_stages(spec: CorpusSpec, compression: str) -> list[Stage]:
+    text = generate_document(spec)
+    builder = BaselineIndexBuilder(max_pages=spec.pages)
+    pages = parse_text(text, spec.pages)
+    document_id = uuid4()
+    artifact = builder.build(document_id, text)
+    tree = BaselineTreeRetriever()
+    content = PostingsRetriever(fallback=tree)
+    requests = [
+        QueryRequest(document_id=document_id, question=question, mode=mode)
+        for question in QUESTIONS
+        for mode in ("vectorless", "content")
+    ]
+    tree_requests = [request for request in requests if request.mode == "vectorless"]
+    content_requests = [request for request in requests if request.mode == "content"]
+    codec = build_codec(compression)
+    encoded = {
+        artifact_format: serialize_artifact(artifact, artifact_format, codec)
+        for artifact_format in ("json", "binary")
+    }
+
+    stages = [
+        Stage("parse_text", "pages", len(pages), lambda: parse_text(text, spec.pages)),
+        Stage(
+            "iter_sections",
+            "pages",
+            len(pages),
+            lambda: [list(iter_sections(page.text)) for page in pages],
+        ),
+        Stage("index_build", "pages", len(pages), lambda: builder.build(document_id, text)),
+        Stage(
+            "retrieve_tree",
+            "queries",
+            len(tree_requests),
+            lambda: [tree.retrieve(artifact, request) for request in tree_requests],
+        ),
+        Stage(
+            "retrieve_content",
+            "queries",
+            len(content_requests),
+            lambda: [content.retrieve(artifact, request) for request in content_requests],
+        ),
+    ]
+    for artifact_format, data in encoded.items():
+        stages.append(
+            Stage(
+                f"serialize_{artifact_format}",
+                "bytes",
+                len(data),
+                lambda fmt=artifact_format: serialize_artifact(artifact, fmt, codec),
+            )
+        )
+        stages.append(
+            Stage(
+                f"deserialize_{artifact_format}",
+                "bytes",
+                len(data),
+                lambda fmt=artifact_format, data=data: deserialize_artifact(data, fmt),
+            )
+        )
+    return stages
+
+
+def calls_per_sample(stage: Stage, min_sample_seconds: float) -> int:
+    """Batch fast stages so each timed sample is long enough to measure reliably."""
+    start = time.perf_counter()
+    stage.run()
+    elapsed = time.perf_counter() - start
+    return max(1, math.ceil(min_sample_seconds / elapsed)) if elapsed else 1000
+
+
+def measure(stage: Stage, repeat: int, warmup: int, min_sample_seconds: float) -> dict[str, object]:
+    for _ in range(warmup):
+        stage.run()
+    calls = calls_per_sample(stage, min_sample_seconds)
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        for _ in range(calls):
+            stage.run()
+        timings.append((time.perf_counter() - start) / calls)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        stage.run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    p50 = statistics.median(timings)
+    return {
+        "unit": stage.unit,
+        "units": stage.units,
+        "samples": repeat,
+        "calls_per_sample": calls,
+        "mean_ms": statistics.fmean(timings) * 1000,
+        "p50_ms": p50 * 1000,
+        "p95_ms": percentile(timings, 0.95) * 1000,
+        "p99_ms": percentile(timings, 0.99) * 1000,
+        "throughput_per_s": stage.units / p50 if p50 else 0.0,
+        "peak_kib": peak / 1024,
+    }
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], threshold: float) -> list[str]:
+    """Return a description of every stage that regressed beyond ``threshold``."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for metric in ("p50_ms", "peak_kib"):
+            if previous[metric] and current[metric] > previous[metric] * (1 + threshold):
+                change = current[metric] / previous[metric] - 1
+                regressions.append(
+                    f"{name} {metric}: {previous[metric]:.1f} -> {current[metric]:.1f} "
+                    f"(+{change:.0%})"
+                )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Indexing and retrieval microbenchmarks")
+    parser.add_argument("--pages", type=int, default=CorpusSpec.pages)
+    parser.add_argument("--headings-per-page", type=float, default=CorpusSpec.headings_per_page)
+    parser.add_argument(
+        "--paragraph-words", type=int, nargs=2, default=list(CorpusSpec.paragraph_words)
+    )
+    parser.add_argument("--seed", type=int, default=CorpusSpec.seed)
+    parser.add_argument("--compression", default="none", help="Codec for the serialize stages")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument(
+        "--min-sample-ms", type=float, default=20.0, help="Repeat fast stages within a sample"
+    )
+    parser.add_argument("--stage", action="append", help="Only run these stages")
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="Saved results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args()
+
+    spec = CorpusSpec(
+        pages=args.pages,
+        headings_per_page=args.headings_per_page,
+        paragraph_words=(args.paragraph_words[0], args.paragraph_words[1]),
+        seed=args.seed,
+    )
+    stages = [
+        stage
+        for stage in build_stages(spec, args.compression)
+        if not args.stage or stage.name in args.stage
+    ]
+
+    results: dict[str, dict] = {}
+    print(
+        f"{'stage':>18} {'p50_ms':>9} {'p95_ms':>9} {'p99_ms':>9} "
+        f"{'throughput':>16} {'peak_kib':>10}"
+    )
+    for stage in stages:
+        result = measure(stage, args.repeat, args.warmup, args.min_sample_ms / 1000)
+        results[stage.name] = result
+        throughput = f"{result['throughput_per_s']:.0f} {stage.unit}/s"
+        print(
+            f"{stage.name:>18} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} "
+            f"{result['p99_ms']:>9.2f} {throughput:>16} {result['peak_kib']:>10.0f}"
+        )
+
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        report = {
+            "created_at": datetime.now(UTC).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "corpus": spec.as_dict(),
+            "compression": args.compression,
+            "repeat": args.repeat,
+            "results": results,
+        }
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline.get("corpus") != json.loads(json.dumps(spec.as_dict())):
+            print("warning: baseline was recorded with a different corpus", file=sys.stderr)
+        regressions = compare(results, baseline["results"], args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ from __future__ import annotations
 from fastapi import Header, HTTPException, status
 
 from vectorless_rag_service.config import settings
+from vectorless_rag_service.observability.profiling import admin_key_matches
 
 
 def api_key_auth(x_api_key: str | None = Header(default=None)) -> None:
@@ -12,4 +13,9 @@ def api_key_auth(x_api_key: str | None = Header(default=None)) -> None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API key")
 
 
-__all__ = ["api_key_auth"]
+def admin_key_auth(x_admin_key: str | None = Header(default=None)) -> None:
+    if not admin_key_matches(x_admin_key):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin key")
+
+
+__all__ = ["admin_key_auth", "api_key_auth"]
@@ -1,39 +1,68 @@
 from __future__ import annotations
 
-import tempfile
-import time
-from pathlib import Path
-from typing import Annotated
+import hashlib
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Annotated, Any, Literal
 from uuid import UUID
 
-from fastapi import APIRouter, BackgroundTasks, Body, Depends, File, Header, UploadFile
-from fastapi.responses import JSONResponse
+import anyio
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    File,
+    Header,
+    Request,
+    UploadFile,
+)
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, Response
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from prometheus_client.openmetrics import exposition as openmetrics
 
-from vectorless_rag_service.api.deps import api_key_auth
+from vectorless_rag_service.api.deps import admin_key_auth, api_key_auth
 from vectorless_rag_service.api.errors import error_response
+from vectorless_rag_service.api.services import Services, ServicesDep
+from vectorless_rag_service.api.uploads import (
+    TextTooLong,
+    UploadTooLarge,
+    decode_text_file,
+    spool_upload,
+)
 from vectorless_rag_service.config import settings
-from vectorless_rag_service.core.models import DocumentCreate, JobStatus, QueryRequest
-from vectorless_rag_service.indexing.index_builder import BaselineIndexBuilder
-from vectorless_rag_service.indexing.parser import parse_pdf
+from vectorless_rag_service.core.models import (
+    BatchQueryRequest,
+    BatchQueryResponse,
+    BlobRef,
+    DocumentCreate,
+    IndexArtifact,
+    JobStatus,
+    QueryRequest,
+    QueryResponse,
+)
+from vectorless_rag_service.indexing.parser import iter_text_pages
+from vectorless_rag_service.indexing.pdf_pool import PdfParseTimeout
 from vectorless_rag_service.observability.logging import get_logger
 from vectorless_rag_service.observability.metrics import (
+    DOCUMENT_DEDUP_HITS,
     ERROR_COUNT,
-    INDEX_DURATION,
+    IDEMPOTENT_REPLAYS,
+    INDEX_REUSE,
     JOB_QUEUE_DEPTH,
+    exposition_registry,
+)
+from vectorless_rag_service.observability.stages import stage
+from vectorless_rag_service.storage.database import ping_db
+from vectorless_rag_service.storage.idempotency import (
+    IdempotencyKeyInProgress,
+    IdempotencyKeyReused,
 )
-from vectorless_rag_service.retrieval.pageindex_retriever import PageIndexRetriever
-from vectorless_rag_service.storage.artifacts import build_artifact_store
-from vectorless_rag_service.storage.database import init_db
-from vectorless_rag_service.storage.metadata_store import IndexArtifactStore, SqlMetadataStore
+from vectorless_rag_service.storage.metadata_store import DuplicateContentError
+from vectorless_rag_service.storage.query_cache import normalize_question
 
 router = APIRouter(dependencies=[Depends(api_key_auth)])
 logger = get_logger()
-metadata_store = SqlMetadataStore()
-artifact_store = build_artifact_store()
-index_record_store = IndexArtifactStore()
-index_builder = BaselineIndexBuilder(max_pages=settings.limits.max_pages)
-retriever = PageIndexRetriever()
 
 
 @router.get("/healthz")
@@ -44,101 +73,397 @@ async def healthz():
 @router.get("/readyz")
 async def readyz():
     try:
-        init_db()
+        await ping_db()
         return {"status": "ready"}
     except Exception as exc:
         ERROR_COUNT.labels("readiness").inc()
         return JSONResponse(status_code=503, content={"status": "error", "detail": str(exc)})
 
 
+async def _fingerprint(
+    request: Request, payload: DocumentCreate | None = None, file: UploadFile | None = None
+) -> str:
+    """Hash of a request's method, path and query, and body.
+
+    Multipart boundaries change between retries of the same upload, so a file is
+    hashed by its name, type and bytes rather than as the raw body.
+    """
+    digest = hashlib.sha256(f"{request.method} {request.url.path}?{request.url.query}".encode())
+    if payload is not None:
+        digest.update(b"\njson:" + payload.model_dump_json().encode())
+    if file is not None:
+        digest.update(f"\nfile:{file.filename}:{file.content_type}:".encode())
+        while chunk := await file.read(settings.limits.upload_chunk_bytes):
+            digest.update(chunk)
+        await file.seek(0)
+    return digest.hexdigest()
+
+
+async def _idempotent(
+    services: Services,
+    scope: str,
+    idempotency_key: str | None,
+    fingerprint: str,
+    run: Callable[[], Awaitable[dict[str, Any]]],
+):
+    """Run a request once per ``Idempotency-Key``, replaying its response to retries.
+
+    The key is reserved before ``run`` starts, so a concurrent request with the same
+    key gets a 409 rather than repeating the work. A key reused for a different
+    request gets a 422.
+    """
+    if idempotency_key is None:
+        return await run()
+    store = services.idempotency_store
+    try:
+        stored = await store.reserve(scope, idempotency_key, fingerprint)
+    except IdempotencyKeyReused:
+        error_response(
+            422, "idempotency_key_reused", "Idempotency-Key was used for a different request"
+        )
+    except IdempotencyKeyInProgress:
+        error_response(
+            409, "idempotency_key_in_progress", "A request with this Idempotency-Key is running"
+        )
+    if stored is not None:
+        # Label by operation only; scopes can embed a document id.
+        IDEMPOTENT_REPLAYS.labels(scope.partition(":")[0]).inc()
+        return JSONResponse(stored.body, status_code=stored.status_code)
+    try:
+        body = jsonable_encoder(await run())
+    except BaseException:
+        # Only successful responses are kept; the client may retry a failure.
+        with anyio.CancelScope(shield=True):
+            await store.release(scope, idempotency_key)
+        raise
+    await store.complete(scope, idempotency_key, 200, body)
+    return JSONResponse(body)
+
+
 @router.post("/v1/documents")
 async def create_document(
-    background_tasks: BackgroundTasks,
-    payload: Annotated[DocumentCreate | None, Body(default=None)] = None,
+    request: Request,
+    services: ServicesDep,
+    payload: Annotated[DocumentCreate | None, Body()] = None,
     file: Annotated[UploadFile | None, File()] = None,
-    idempotency_key: Annotated[str | None, Header(default=None)] = None,
+    idempotency_key: Annotated[str | None, Header()] = None,
 ):
-    _ = idempotency_key
+    fingerprint = await _fingerprint(request, payload, file) if idempotency_key else ""
+    return await _idempotent(
+        services,
+        "create_document",
+        idempotency_key,
+        fingerprint,
+        lambda: _create_document(services, payload, file),
+    )
+
+
+def _deduplicated(document_id: UUID) -> dict[str, Any]:
+    DOCUMENT_DEDUP_HITS.inc()
+    logger.info("document_deduplicated", document_id=str(document_id))
+    return {"document_id": document_id, "deduplicated": True}
+
+
+@dataclass
+class _Content:
+    filename: str | None
+    content_sha256: str
+    text_blob: BlobRef
+    raw_blob: BlobRef | None
+
+
+async def _store_content(
+    services: Services, payload: DocumentCreate | None, file: UploadFile | None
+) -> _Content | UUID:
+    """Parse and store an upload, or return the document that already has its content."""
     if file is None and (payload is None or payload.text is None):
         error_response(400, "invalid_request", "Provide a file or text payload")
 
     filename: str | None
+    raw_blob: BlobRef | None = None
     if file is not None:
         if file.content_type not in {"application/pdf", "text/plain"}:
             error_response(400, "invalid_content_type", "Only PDF or text files allowed")
-        contents = await file.read()
-        if len(contents) > settings.limits.max_upload_bytes:
+        chunk_size = settings.limits.upload_chunk_bytes
+        try:
+            upload = await spool_upload(file, settings.limits.max_upload_bytes, chunk_size)
+        except UploadTooLarge:
             error_response(413, "payload_too_large", "File exceeds size limit")
-        with tempfile.NamedTemporaryFile(delete=False) as tmp:
-            tmp.write(contents)
-            tmp_path = Path(tmp.name)
-        if file.content_type == "application/pdf":
-            pages = parse_pdf(str(tmp_path), settings.limits.max_pages)
-            text = "\n\n".join(page.text for page in pages)
-        else:
-            text = contents.decode("utf-8")
-        tmp_path.unlink(missing_ok=True)
+        try:
+            existing = await services.async_metadata_store.find_document_by_hash(upload.sha256)
+            if existing is not None:
+                return existing
+            if file.content_type == "application/pdf":
+                with stage("pdf_parse") as labels:
+                    pages = await services.pdf_pool.parse(
+                        str(upload.path), settings.limits.max_pages
+                    )
+                    labels.pages = len(pages)
+                text = "\n\n".join(page.text for page in pages)
+            else:
+                text = await anyio.to_thread.run_sync(
+                    decode_text_file, upload.path, settings.limits.max_text_length, chunk_size
+                )
+            if len(text) > settings.limits.max_text_length:
+                error_response(413, "payload_too_large", "Text exceeds size limit")
+            raw_blob = await anyio.to_thread.run_sync(services.text_store.put_raw_file, upload.path)
+        except TextTooLong:
+            error_response(413, "payload_too_large", "Text exceeds size limit")
+        except PdfParseTimeout:
+            error_response(422, "parse_timeout", "PDF parsing timed out")
+        except UnicodeDecodeError:
+            error_response(400, "invalid_encoding", "Text files must be UTF-8 encoded")
+        finally:
+            upload.path.unlink(missing_ok=True)
         filename = file.filename
+        content_sha256 = upload.sha256
     else:
         text = payload.text or "" if payload else ""
         filename = None
+        content_sha256 = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        existing = await services.async_metadata_store.find_document_by_hash(content_sha256)
+        if existing is not None:
+            return existing
 
     if len(text) > settings.limits.max_text_length:
         error_response(413, "payload_too_large", "Text exceeds size limit")
 
-    document_id = metadata_store.create_document(filename)
-    metadata_store.save_document_text(document_id, text)
+    text_blob = await anyio.to_thread.run_sync(
+        lambda: services.text_store.put_pages(iter_text_pages(text))
+    )
+    return _Content(filename, content_sha256, text_blob, raw_blob)
+
+
+async def _create_document(
+    services: Services, payload: DocumentCreate | None, file: UploadFile | None
+) -> dict[str, Any]:
+    content = await _store_content(services, payload, file)
+    if isinstance(content, UUID):
+        return _deduplicated(content)
+    document_id = await services.async_metadata_store.create_document(
+        content.filename, content.content_sha256
+    )
+    await services.async_metadata_store.save_document_blobs(
+        document_id, content.text_blob, content.raw_blob
+    )
     logger.info("document_created", document_id=str(document_id))
-    return {"document_id": document_id}
+    return {"document_id": document_id, "deduplicated": False}
+
+
+@router.put("/v1/documents/{document_id}")
+async def replace_document(
+    document_id: UUID,
+    request: Request,
+    services: ServicesDep,
+    payload: Annotated[DocumentCreate | None, Body()] = None,
+    file: Annotated[UploadFile | None, File()] = None,
+    idempotency_key: Annotated[str | None, Header()] = None,
+):
+    fingerprint = await _fingerprint(request, payload, file) if idempotency_key else ""
+    return await _idempotent(
+        services,
+        f"replace_document:{document_id}",
+        idempotency_key,
+        fingerprint,
+        lambda: _replace_document(services, document_id, payload, file),
+    )
+
+
+async def _replace_document(
+    services: Services,
+    document_id: UUID,
+    payload: DocumentCreate | None,
+    file: UploadFile | None,
+) -> dict[str, Any]:
+    try:
+        await services.async_metadata_store.get_text_blob(document_id)
+    except ValueError:
+        error_response(404, "document_not_found", "Document not found")
+    content = await _store_content(services, payload, file)
+    if isinstance(content, UUID):
+        if content != document_id:
+            error_response(
+                409,
+                "duplicate_content",
+                "Another document has this content",
+                {"document_id": str(content)},
+            )
+        return {"document_id": document_id, "changed": False}
+    try:
+        await services.async_metadata_store.update_document(
+            document_id,
+            content.filename,
+            content.content_sha256,
+            content.text_blob,
+            content.raw_blob,
+        )
+    except DuplicateContentError:
+        error_response(409, "duplicate_content", "Another document has this content")
+    except ValueError:
+        error_response(404, "document_not_found", "Document not found")
+    logger.info("document_replaced", document_id=str(document_id))
+    return {"document_id": document_id, "changed": True}
 
 
 @router.post("/v1/documents/{document_id}/index")
 async def index_document(
     document_id: UUID,
-    background_tasks: BackgroundTasks,
-    idempotency_key: Annotated[str | None, Header(default=None)] = None,
+    request: Request,
+    services: ServicesDep,
+    force: bool = False,
+    idempotency_key: Annotated[str | None, Header()] = None,
 ):
-    _ = idempotency_key
-    job_id = metadata_store.create_job(document_id)
-    JOB_QUEUE_DEPTH.inc()
+    fingerprint = await _fingerprint(request) if idempotency_key else ""
+    return await _idempotent(
+        services,
+        f"index_document:{document_id}",
+        idempotency_key,
+        fingerprint,
+        lambda: _index_document(services, document_id, force),
+    )
 
-    def run_index():
-        start = time.time()
-        try:
-            metadata_store.update_job(job_id, JobStatus.running.value, 0.1, None)
-            text = metadata_store.get_document_text(document_id)
-            artifact = index_builder.build(document_id, text)
-            uri = artifact_store.put(document_id, artifact)
-            index_record_store.record(document_id, uri)
-            metadata_store.update_job(job_id, JobStatus.succeeded.value, 1.0, None)
-            INDEX_DURATION.observe(time.time() - start)
-            logger.info("index_complete", document_id=str(document_id), job_id=str(job_id))
-        except Exception as exc:
-            metadata_store.update_job(job_id, JobStatus.failed.value, 1.0, str(exc))
-            ERROR_COUNT.labels("indexing").inc()
-            logger.exception("index_failed", document_id=str(document_id), job_id=str(job_id))
-        finally:
-            JOB_QUEUE_DEPTH.dec()
 
-    background_tasks.add_task(run_index)
+async def _index_document(services: Services, document_id: UUID, force: bool) -> dict[str, Any]:
+    try:
+        text_blob = await services.async_metadata_store.get_text_blob(document_id)
+    except ValueError:
+        error_response(404, "document_not_found", "Document not found")
+    if not force:
+        # A queued, running or finished build of the current text is still valid.
+        latest = await services.async_metadata_store.latest_job(document_id, text_blob.sha256)
+        if latest is not None and (
+            latest.status in (JobStatus.pending, JobStatus.running)
+            or (
+                latest.status == JobStatus.succeeded
+                and await services.async_artifact_store.exists(document_id)
+            )
+        ):
+            INDEX_REUSE.inc()
+            return {"job_id": latest.job_id, "status": latest.status.value}
+    job_id = await services.job_producer.enqueue(document_id, text_blob.sha256)
+    JOB_QUEUE_DEPTH.set(await services.job_producer.depth())
+    if services.index_workers is not None:
+        services.index_workers.wake()
     return {"job_id": job_id, "status": JobStatus.pending.value}
 
 
 @router.get("/v1/jobs/{job_id}")
-async def get_job(job_id: UUID):
-    job = metadata_store.get_job(job_id)
+async def get_job(job_id: UUID, services: ServicesDep):
+    job = await services.async_metadata_store.get_job(job_id)
     return job.model_dump()
 
 
+async def _versioned_artifact(
+    services: Services, document_id: UUID
+) -> tuple[IndexArtifact, str | None] | None:
+    """The artifact and the version it was read at, in one store read; None if missing."""
+    try:
+        artifact, version = await services.async_artifact_store.get_versioned(document_id)
+    except FileNotFoundError:
+        return None
+    return (artifact, version) if artifact is not None else None
+
+
+async def _run_retriever(
+    services: Services, artifact: IndexArtifact, requests: list[QueryRequest]
+) -> list[QueryResponse]:
+    retriever = services.retriever
+    if retriever.blocking:
+        # LLM navigation waits on network calls; keep them off the event loop.
+        return await anyio.to_thread.run_sync(retriever.retrieve_many, artifact, requests)
+    return retriever.retrieve_many(artifact, requests)
+
+
+async def _retrieve(
+    services: Services, artifact: IndexArtifact, version: str | None, requests: list[QueryRequest]
+) -> list[QueryResponse]:
+    """Answer one document's queries, from the result cache where possible.
+
+    ``version`` is the one the artifact was validated at, so a response is never
+    cached under a newer one and checking the cache costs no extra store request.
+    """
+    query_cache = services.query_cache
+    if query_cache is None or version is None:
+        return await _run_retriever(services, artifact, requests)
+
+    normalized = [
+        request.model_copy(update={"question": normalize_question(request.question)})
+        for request in requests
+    ]
+    tag = services.retriever.cache_tag
+    results = [await query_cache.get(request, version, tag) for request in normalized]
+    missing = [position for position, result in enumerate(results) if result is None]
+    if missing:
+        computed = await _run_retriever(services, artifact, [normalized[i] for i in missing])
+        for position, response in zip(missing, computed, strict=True):
+            results[position] = response
+            await query_cache.put(normalized[position], version, tag, response)
+    return [result for result in results if result is not None]
+
+
 @router.post("/v1/query")
-async def query_document(request: QueryRequest):
-    if not artifact_store.exists(request.document_id):
+async def query_document(request: QueryRequest, services: ServicesDep):
+    found = await _versioned_artifact(services, request.document_id)
+    if found is None:
         error_response(404, "index_not_found", "Index not found for document")
-    artifact = artifact_store.get(request.document_id)
-    response = retriever.retrieve(artifact, request)
+    response = (await _retrieve(services, *found, [request]))[0]
     return response.model_dump()
 
 
+@router.post("/v1/query:batch")
+async def query_batch(request: BatchQueryRequest, services: ServicesDep):
+    if len(request.queries) > settings.limits.max_batch_queries:
+        error_response(413, "payload_too_large", "Too many queries in batch")
+    positions: dict[UUID, list[int]] = {}
+    for position, query in enumerate(request.queries):
+        positions.setdefault(query.document_id, []).append(position)
+    artifacts = {
+        document_id: await _versioned_artifact(services, document_id) for document_id in positions
+    }
+    missing = [str(document_id) for document_id, found in artifacts.items() if found is None]
+    if missing:
+        error_response(
+            404, "index_not_found", "Index not found for document", {"document_ids": missing}
+        )
+
+    results: list[QueryResponse | None] = [None] * len(request.queries)
+    for document_id, indexes in positions.items():
+        found = artifacts[document_id]
+        if found is None:
+            continue
+        queries = [request.queries[index] for index in indexes]
+        for index, response in zip(
+            indexes, await _retrieve(services, *found, queries), strict=True
+        ):
+            results[index] = response
+    return BatchQueryResponse(
+        results=[result for result in results if result is not None]
+    ).model_dump()
+
+
+@router.get("/v1/admin/profiles/{profile_id}", dependencies=[Depends(admin_key_auth)])
+async def get_profile(
+    profile_id: UUID,
+    services: ServicesDep,
+    format: Literal["pstats", "text"] = "pstats",
+    limit: int = 50,
+):
+    store = services.profiles
+    path = store.path(profile_id)
+    if not path.exists():
+        error_response(404, "profile_not_found", "Profile not found")
+    if format == "text":
+        return PlainTextResponse(await anyio.to_thread.run_sync(store.summary, profile_id, limit))
+    return FileResponse(path, media_type="application/octet-stream", filename=path.name)
+
+
 @router.get("/metrics")
-async def metrics():
-    return JSONResponse(content=generate_latest().decode("utf-8"), media_type=CONTENT_TYPE_LATEST)
+async def metrics(services: ServicesDep, accept: Annotated[str, Header()] = ""):
+    JOB_QUEUE_DEPTH.set(await services.job_producer.depth())
+    registry = exposition_registry()
+    # Exemplars (trace ids on stage histograms) exist only in the OpenMetrics format.
+    if "application/openmetrics-text" in accept:
+        return Response(
+            openmetrics.generate_latest(registry), media_type=openmetrics.CONTENT_TYPE_LATEST
+        )
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,111 @@
+"""Stores, builders and pools used by the API, built once per app in its lifespan.
+
+Nothing here is created at import time, so importing the app stays cheap and tests
+get a fresh set of services for each app. Route handlers receive the services
+through the ``ServicesDep`` dependency.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Annotated
+
+from fastapi import Depends, Request
+
+from vectorless_rag_service.config import settings
+from vectorless_rag_service.core.interfaces import ArtifactStore
+from vectorless_rag_service.indexing.index_builder import BaselineIndexBuilder
+from vectorless_rag_service.indexing.pdf_pool import PdfParsePool
+from vectorless_rag_service.indexing.pipeline import IndexPipeline
+from vectorless_rag_service.indexing.worker import WorkerPool, build_worker_pool
+from vectorless_rag_service.observability.profiling import ProfileStore, build_profile_store
+from vectorless_rag_service.retrieval.baseline_retriever import BaselineTreeRetriever
+from vectorless_rag_service.retrieval.llm_navigator import build_llm_navigator
+from vectorless_rag_service.retrieval.pageindex_retriever import PageIndexRetriever
+from vectorless_rag_service.storage.artifacts import ThreadedArtifactStore, build_artifact_store
+from vectorless_rag_service.storage.document_text import (
+    DocumentTextStore,
+    build_document_text_store,
+)
+from vectorless_rag_service.storage.idempotency import (
+    AsyncIdempotencyStore,
+    build_idempotency_store,
+)
+from vectorless_rag_service.storage.job_queue import (
+    AsyncJobProducer,
+    build_job_producer,
+    build_job_queue,
+)
+from vectorless_rag_service.storage.metadata_store import (
+    AsyncSqlMetadataStore,
+    IndexArtifactStore,
+    SqlMetadataStore,
+)
+from vectorless_rag_service.storage.query_cache import QueryResultCache, build_query_cache
+
+
+@dataclass
+class Services:
+    metadata_store: SqlMetadataStore
+    artifact_store: ArtifactStore
+    index_builder: BaselineIndexBuilder
+    text_store: DocumentTextStore
+    # Inline index workers, started and stopped by the lifespan; None when disabled.
+    index_workers: WorkerPool | None
+    # Request handlers only use the async stores; the sync ones back the indexing pipeline.
+    async_metadata_store: AsyncSqlMetadataStore
+    async_artifact_store: ThreadedArtifactStore
+    job_producer: AsyncJobProducer
+    idempotency_store: AsyncIdempotencyStore
+    retriever: PageIndexRetriever
+    query_cache: QueryResultCache | None
+    pdf_pool: PdfParsePool
+    profiles: ProfileStore
+
+    def close(self) -> None:
+        self.pdf_pool.shutdown()
+        if self.retriever.navigator is not None:
+            self.retriever.navigator.close()
+
+
+def build_services() -> Services:
+    metadata_store = SqlMetadataStore()
+    artifact_store = build_artifact_store()
+    index_builder = BaselineIndexBuilder(max_pages=settings.limits.max_pages)
+    text_store = build_document_text_store()
+    pipeline = IndexPipeline(
+        metadata_store, artifact_store, index_builder, IndexArtifactStore(), text_store
+    )
+    return Services(
+        metadata_store=metadata_store,
+        artifact_store=artifact_store,
+        index_builder=index_builder,
+        text_store=text_store,
+        index_workers=(
+            build_worker_pool(
+                build_job_queue(), pipeline, f"api-{os.getpid()}", settings.worker.concurrency
+            )
+            if settings.worker.inline
+            else None
+        ),
+        async_metadata_store=AsyncSqlMetadataStore(),
+        async_artifact_store=ThreadedArtifactStore(artifact_store, settings.storage.io_threads),
+        job_producer=build_job_producer(),
+        idempotency_store=build_idempotency_store(),
+        retriever=PageIndexRetriever(navigator=build_llm_navigator(BaselineTreeRetriever())),
+        query_cache=build_query_cache(),
+        pdf_pool=PdfParsePool(
+            workers=settings.pdf.workers,
+            pages_per_task=settings.pdf.pages_per_task,
+            page_timeout_seconds=settings.pdf.page_timeout_seconds,
+        ),
+        profiles=build_profile_store(),
+    )
+
+
+def get_services(request: Request) -> Services:
+    return request.app.state.services
+
+
+ServicesDep = Annotated[Services, Depends(get_services)]
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import codecs
+import hashlib
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+import anyio
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from vectorless_rag_service.core.models import ErrorResponse
+
+# Allowance for multipart boundaries and part headers on top of the file limit.
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadTooLarge(ValueError):
+    pass
+
+
+class TextTooLong(ValueError):
+    pass
+
+
+class RequestBodyTooLarge(HTTPException):
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=413,
+            detail=ErrorResponse(
+                error_code="payload_too_large", message="Request body exceeds size limit"
+            ).model_dump(),
+        )
+
+
+class InvalidContentLength(HTTPException):
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=400,
+            detail=ErrorResponse(
+                error_code="invalid_content_length",
+                message="Content-Length must be a non-negative integer",
+            ).model_dump(),
+        )
+
+
+@dataclass
+class SpooledUpload:
+    path: Path
+    sha256: str
+    size: int
+
+
+async def spool_upload(file: UploadFile, max_bytes: int, chunk_size: int) -> SpooledUpload:
+    """Copy an upload to a temporary file in fixed-size chunks, hashing it on the way.
+
+    The size limit is checked as each chunk is read, so an oversized upload is
+    rejected without ever holding more than one chunk in memory. Disk writes run on
+    a worker thread so they never block the event loop.
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise UploadTooLarge(f"upload exceeds {max_bytes} bytes")
+    with tempfile.NamedTemporaryFile(delete=False) as tmp:
+        path = Path(tmp.name)
+        digest = hashlib.sha256()
+        try:
+            total = 0
+            while chunk := await file.read(chunk_size):
+                total += len(chunk)
+                if total > max_bytes:
+                    raise UploadTooLarge(f"upload exceeds {max_bytes} bytes")
+                digest.update(chunk)
+                await anyio.to_thread.run_sync(tmp.write, chunk)
+        except BaseException:
+            tmp.close()
+            path.unlink(missing_ok=True)
+            raise
+    return SpooledUpload(path=path, sha256=digest.hexdigest(), size=total)
+
+
+def decode_text_file(path: Path, max_chars: int, chunk_size: int) -> str:
+    """Incrementally decode a UTF-8 file, stopping as soon as it exceeds ``max_chars``."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    parts: list[str] = []
+    length = 0
+    with path.open("rb") as handle:
+        while chunk := handle.read(chunk_size):
+            text = decoder.decode(chunk)
+            length += len(text)
+            if length > max_chars:
+                raise TextTooLong(f"text exceeds {max_chars} characters")
+            parts.append(text)
+    parts.append(decoder.decode(b"", final=True))
+    return "".join(parts)
+
+
+class UploadSizeLimitMiddleware:
+    """Reject oversized request bodies on upload routes before they are buffered.
+
+    Applies to POST and PUT requests on ``paths`` and the routes below them.
+
+    A declared ``Content-Length`` above the limit is refused immediately, and one that
+    is not a plain decimal number gets a 400. Otherwise the body is counted as it is
+    received and the request fails once it crosses the limit.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_bytes: int, paths: tuple[str, ...]) -> None:
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+        self.paths = paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("POST", "PUT")
+            or not self._limited(scope["path"])
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length")
+        error: HTTPException | None = None
+        if content_length is not None:
+            # bytes.isdigit() is ASCII-only, so signs and junk get a 400 rather than a
+            # ValueError from int().
+            if not content_length.strip().isdigit():
+                error = InvalidContentLength()
+            elif int(content_length) > self.max_body_bytes:
+                error = RequestBodyTooLarge()
+        if error is not None:
+            response = JSONResponse({"detail": error.detail}, status_code=error.status_code)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_bytes:
+                    raise RequestBodyTooLarge()
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    def _limited(self, path: str) -> bool:
+        return any(path == prefix or path.startswith(prefix + "/") for prefix in self.paths)
@@ -9,10 +9,42 @@ class StorageSettings(BaseModel):
     local_path: str = "./data/artifacts"
     s3_bucket: str | None = None
     s3_endpoint: str | None = None
+    artifact_format: str = "json"
+    # "none", "gzip" or "zstd" (needs the zstd extra); readers detect the codec. Unset
+    # means gzip for JSON and none for binary, which stays memory-mappable and range-readable.
+    artifact_compression: str | None = None
+    # Codec default when unset: gzip 6, zstd 3.
+    artifact_compression_level: int | None = None
+    blob_path: str = "./data/blobs"
+    # Threads available to async routes for blocking artifact reads and writes.
+    io_threads: int = 16
+    # Keep at least io_threads so concurrent reads never wait for a pooled connection.
+    s3_max_pool_connections: int = 32
+    s3_connect_timeout_seconds: float = 5.0
+    s3_read_timeout_seconds: float = 30.0
+    s3_max_attempts: int = 3
+    # Local read-through copies of S3 artifacts, revalidated by ETag; unset to disable.
+    s3_cache_path: str | None = "./data/s3_cache"
+
+
+class ArtifactCacheSettings(BaseModel):
+    enabled: bool = True
+    max_entries: int = 128
+    max_bytes: int = 256 * 1024 * 1024
+
+
+class QueryCacheSettings(BaseModel):
+    enabled: bool = True
+    # "memory" for a per-process LRU, "sqlite" for a file shared by the workers on a host.
+    backend: str = "memory"
+    max_entries: int = 10_000
+    path: str = "./data/query_cache.db"
 
 
 class DatabaseSettings(BaseModel):
     url: str = "sqlite:///./data/metadata.db"
+    # Async driver URL for request handlers; derived from ``url`` when unset.
+    async_url: str | None = None
 
 
 class AuthSettings(BaseModel):
@@ -22,8 +54,37 @@ class AuthSettings(BaseModel):
 
 class LimitsSettings(BaseModel):
     max_upload_bytes: int = 10 * 1024 * 1024
+    upload_chunk_bytes: int = 64 * 1024
     max_pages: int = 300
     max_text_length: int = 1_000_000
+    max_batch_queries: int = 100
+
+
+class PdfSettings(BaseModel):
+    workers: int = 2
+    pages_per_task: int = 25
+    page_timeout_seconds: float = 10.0
+
+
+class WorkerSettings(BaseModel):
+    # Also process queued jobs in the API process, on ``concurrency`` threads started
+    # with the app; disable when running dedicated vectorless-rag-worker processes.
+    inline: bool = True
+    concurrency: int = 2
+    lease_seconds: float = 60.0
+    heartbeat_seconds: float = 15.0
+    poll_seconds: float = 1.0
+    max_attempts: int = 3
+    backoff_base_seconds: float = 5.0
+    backoff_max_seconds: float = 300.0
+    # Port for vectorless-rag-worker to serve /metrics on; None serves nothing.
+    metrics_port: int | None = None
+
+
+class IdempotencySettings(BaseModel):
+    ttl_seconds: float = 24 * 60 * 60
+    # How long an unfinished request holds its key; a retry after that runs it again.
+    reservation_seconds: float = 5 * 60
 
 
 class ObservabilitySettings(BaseModel):
@@ -32,15 +93,46 @@ class ObservabilitySettings(BaseModel):
     json_logs: bool = True
 
 
+class ProfilingSettings(BaseModel):
+    # Key for "X-Admin-Key"; on-demand request profiling is disabled while unset.
+    admin_key: str | None = None
+    path: str = "./data/profiles"
+    # Fraction of index jobs run under cProfile, from 0 to 1.
+    index_sample_rate: float = 0.0
+    max_profiles: int = 200
+
+
+class LLMSettings(BaseModel):
+    # Root of an OpenAI-compatible API, e.g. "http://localhost:8100/v1". LLM navigation
+    # needs it and ``enable_llm_navigation``.
+    base_url: str | None = None
+    api_key: str | None = None
+    model: str = "navigator"
+    # Completion calls in flight at once per process, shared by all queries.
+    max_concurrency: int = 8
+    # Navigation time per query; past it the query is answered by the baseline retriever.
+    deadline_seconds: float = 5.0
+    decision_cache_entries: int = 10_000
+    # Characters of each candidate's first span shown to the model next to its title.
+    preview_chars: int = 200
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_prefix="VRS_", env_nested_delimiter="__")
 
     env: str = "dev"
     storage: StorageSettings = Field(default_factory=StorageSettings)
+    artifact_cache: ArtifactCacheSettings = Field(default_factory=ArtifactCacheSettings)
+    query_cache: QueryCacheSettings = Field(default_factory=QueryCacheSettings)
     database: DatabaseSettings = Field(default_factory=DatabaseSettings)
     auth: AuthSettings = Field(default_factory=AuthSettings)
     limits: LimitsSettings = Field(default_factory=LimitsSettings)
+    pdf: PdfSettings = Field(default_factory=PdfSettings)
+    worker: WorkerSettings = Field(default_factory=WorkerSettings)
+    idempotency: IdempotencySettings = Field(default_factory=IdempotencySettings)
     observability: ObservabilitySettings = Field(default_factory=ObservabilitySettings)
+    profiling: ProfilingSettings = Field(default_factory=ProfilingSettings)
+    llm: LLMSettings = Field(default_factory=LLMSettings)
     enable_llm_navigation: bool = False
     request_timeout_seconds: int = 30
 
@@ -2,22 +2,56 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from collections.abc import Iterable
+from pathlib import Path
+from typing import IO, TYPE_CHECKING
 from uuid import UUID
 
-from vectorless_rag_service.core.models import IndexArtifact, JobRecord, QueryRequest, QueryResponse
+from vectorless_rag_service.core.models import (
+    BlobRef,
+    IndexArtifact,
+    JobRecord,
+    QueryRequest,
+    QueryResponse,
+)
+
+if TYPE_CHECKING:
+    from vectorless_rag_service.indexing.parser import PageContent
 
 
 class VectorlessRetriever(ABC):
+    # True when retrieval waits on the network; async callers then run it in a thread.
+    blocking = False
+    # Names how answers are produced, so cached responses from another setup are not reused.
+    cache_tag = "default"
+
     @abstractmethod
     def retrieve(self, artifact: IndexArtifact, request: QueryRequest) -> QueryResponse:
         raise NotImplementedError
 
+    def retrieve_many(
+        self, artifact: IndexArtifact, requests: list[QueryRequest]
+    ) -> list[QueryResponse]:
+        return [self.retrieve(artifact, request) for request in requests]
+
 
 class IndexBuilder(ABC):
     @abstractmethod
     def build(self, document_id: UUID, text: str) -> IndexArtifact:
         raise NotImplementedError
 
+    def build_pages(
+        self,
+        document_id: UUID,
+        pages: Iterable[PageContent],
+        previous: IndexArtifact | None = None,
+    ) -> IndexArtifact:
+        """Build from already paginated text.
+
+        ``previous`` is the document's last artifact, which builders that support
+        incremental rebuilds may reuse; the default implementation ignores it.
+        """
+        return self.build(document_id, "\n\n".join(page.text for page in pages))
+
 
 class ArtifactStore(ABC):
     @abstractmethod
@@ -32,10 +66,49 @@ class ArtifactStore(ABC):
     def exists(self, document_id: UUID) -> bool:
         raise NotImplementedError
 
+    def version(self, document_id: UUID) -> str | None:
+        """Cheap token that changes whenever the stored artifact changes, if supported."""
+        return None
+
+    def get_versioned(
+        self, document_id: UUID, known_version: str | None = None
+    ) -> tuple[IndexArtifact | None, str | None]:
+        """The artifact with the version it was read at.
+
+        The artifact is ``None`` when it still has ``known_version``. Stores that can
+        validate and read in one request should override this; the default reads the
+        version, then the artifact, so a version never pairs with older content.
+        """
+        version = self.version(document_id)
+        if version is not None and version == known_version:
+            return None, version
+        return self.get(document_id), version
+
+
+class BlobStore(ABC):
+    """Opaque byte storage keyed by caller-chosen keys."""
+
+    @abstractmethod
+    def put_file(self, key: str, path: Path) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    def open(self, key: str) -> IO[bytes]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
 
 class LLMClient(ABC):
     @abstractmethod
-    def complete_json(self, prompt: str) -> dict[str, object]:
+    def complete_json(self, prompt: str, timeout: float | None = None) -> dict[str, object]:
+        """Send ``prompt`` and return the model's reply, which must be a JSON object.
+
+        Raises ``LLMTimeout`` when no reply arrives within ``timeout`` seconds and
+        ``LLMError`` for any other failure.
+        """
         raise NotImplementedError
 
 
@@ -47,15 +120,32 @@ class DocumentSource(ABC):
 
 class MetadataStore(ABC):
     @abstractmethod
-    def create_document(self, filename: str | None) -> UUID:
+    def create_document(self, filename: str | None, content_sha256: str | None = None) -> UUID:
+        """Create a document, or return the existing one with the same content hash."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_document_by_hash(self, content_sha256: str) -> UUID | None:
         raise NotImplementedError
 
     @abstractmethod
-    def get_document_text(self, document_id: UUID) -> str:
+    def get_text_blob(self, document_id: UUID) -> BlobRef:
         raise NotImplementedError
 
     @abstractmethod
-    def save_document_text(self, document_id: UUID, text: str) -> None:
+    def save_document_blobs(self, document_id: UUID, text: BlobRef, raw: BlobRef | None) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def update_document(
+        self,
+        document_id: UUID,
+        filename: str | None,
+        content_sha256: str,
+        text: BlobRef,
+        raw: BlobRef | None,
+    ) -> None:
+        """Replace a document's content; the next index build picks up the new text."""
         raise NotImplementedError
 
     @abstractmethod
@@ -66,6 +156,11 @@ class MetadataStore(ABC):
     def update_job(self, job_id: UUID, status: str, progress: float, error: str | None) -> None:
         raise NotImplementedError
 
+    @abstractmethod
+    def latest_job(self, document_id: UUID, text_sha256: str | None = None) -> JobRecord | None:
+        """Most recent job for the document, optionally only jobs for the given text."""
+        raise NotImplementedError
+
     @abstractmethod
     def get_job(self, job_id: UUID) -> JobRecord:
         raise NotImplementedError
@@ -73,3 +168,85 @@ class MetadataStore(ABC):
     @abstractmethod
     def list_jobs(self) -> Iterable[JobRecord]:
         raise NotImplementedError
+
+
+class AsyncArtifactStore(ABC):
+    @abstractmethod
+    async def put(self, document_id: UUID, artifact: IndexArtifact) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get(self, document_id: UUID) -> IndexArtifact:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def exists(self, document_id: UUID) -> bool:
+        raise NotImplementedError
+
+    async def version(self, document_id: UUID) -> str | None:
+        return None
+
+    async def get_versioned(
+        self, document_id: UUID, known_version: str | None = None
+    ) -> tuple[IndexArtifact | None, str | None]:
+        version = await self.version(document_id)
+        if version is not None and version == known_version:
+            return None, version
+        return await self.get(document_id), version
+
+
+class AsyncMetadataStore(ABC):
+    @abstractmethod
+    async def create_document(
+        self, filename: str | None, content_sha256: str | None = None
+    ) -> UUID:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def find_document_by_hash(self, content_sha256: str) -> UUID | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_text_blob(self, document_id: UUID) -> BlobRef:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def save_document_blobs(
+        self, document_id: UUID, text: BlobRef, raw: BlobRef | None
+    ) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def update_document(
+        self,
+        document_id: UUID,
+        filename: str | None,
+        content_sha256: str,
+        text: BlobRef,
+        raw: BlobRef | None,
+    ) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def create_job(self, document_id: UUID) -> UUID:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def update_job(
+        self, job_id: UUID, status: str, progress: float, error: str | None
+    ) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def latest_job(
+        self, document_id: UUID, text_sha256: str | None = None
+    ) -> JobRecord | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_job(self, job_id: UUID) -> JobRecord:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def list_jobs(self) -> list[JobRecord]:
+        raise NotImplementedError
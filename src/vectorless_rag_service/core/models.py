@@ -25,6 +25,14 @@ class DocumentRecord(BaseModel):
     created_at: datetime
 
 
+class BlobRef(BaseModel):
+    """Pointer to a content-addressed blob; ``size`` is the uncompressed byte count."""
+
+    key: str
+    sha256: str
+    size: int
+
+
 class JobRecord(BaseModel):
     job_id: UUID
     document_id: UUID
@@ -42,6 +50,9 @@ class IndexNode(BaseModel):
     page_end: int
     text_span_ids: list[str]
     children: list[str]
+    # Extractive summary and keywords computed at index time; empty in older artifacts.
+    summary: str = ""
+    keywords: list[str] = []
 
 
 class TextSpan(BaseModel):
@@ -50,10 +61,33 @@ class TextSpan(BaseModel):
     text: str
 
 
+class TermStatistics(BaseModel):
+    avg_length: float
+    idf: dict[str, float]
+    node_lengths: dict[str, int]
+    term_freqs: dict[str, dict[str, int]]
+
+
+class SpanPostings(BaseModel):
+    """Inverted index over span text, addressed by span and node list positions."""
+
+    avg_span_length: float
+    span_lengths: list[int]
+    span_sections: list[int]
+    span_pages: list[int]
+    idf: dict[str, float]
+    upper_bounds: dict[str, float]
+    postings: dict[str, tuple[list[int], list[int]]]
+
+
 class IndexArtifact(BaseModel):
     document_id: UUID
     nodes: list[IndexNode]
     spans: list[TextSpan]
+    term_stats: TermStatistics | None = None
+    postings: SpanPostings | None = None
+    # Content hash of each page's text, in page order; used for incremental rebuilds.
+    page_hashes: list[str] | None = None
 
 
 class Citation(BaseModel):
@@ -68,6 +102,8 @@ class Citation(BaseModel):
 class QueryTrace(BaseModel):
     visited_nodes: list[str]
     decisions: list[str]
+    # Answered by a fallback after the preferred retriever failed; never cached.
+    degraded: bool = False
 
 
 class QueryRequest(BaseModel):
@@ -84,6 +120,14 @@ class QueryResponse(BaseModel):
     trace: QueryTrace
 
 
+class BatchQueryRequest(BaseModel):
+    queries: list[QueryRequest]
+
+
+class BatchQueryResponse(BaseModel):
+    results: list[QueryResponse]
+
+
 class ErrorResponse(BaseModel):
     error_code: str
     message: str
@@ -0,0 +1,41 @@
+"""Gunicorn settings for serving the API from several pre-forked worker processes.
+
+Run with::
+
+    gunicorn -c python:vectorless_rag_service.gunicorn_conf vectorless_rag_service.main:app
+
+Each worker is a uvicorn event loop with its own stores, PDF parse pool and inline
+index workers. Metrics are shared through ``PROMETHEUS_MULTIPROC_DIR``, so ``/metrics``
+on any worker reports the totals of all of them. Command-line flags override the
+defaults below (``--workers``, ``--bind``); ``WEB_CONCURRENCY`` sets the worker count.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+# prometheus_client picks its value storage when first imported, so the directory has
+# to be in the environment before the workers load the app. Do not import
+# prometheus_client at module level here: the workers are forked from this process.
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "./data/prometheus_multiproc")
+
+bind = "0.0.0.0:8000"
+workers = int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1))
+worker_class = "uvicorn_worker.UvicornWorker"
+graceful_timeout = 30
+
+
+def on_starting(server) -> None:
+    # Samples left by a previous run would be added to this run's counters.
+    path = Path(os.environ["PROMETHEUS_MULTIPROC_DIR"])
+    path.mkdir(parents=True, exist_ok=True)
+    for stale in path.glob("*.db"):
+        stale.unlink()
+
+
+def child_exit(server, worker) -> None:
+    # Drop the exited worker's "live" gauge values; its counters stay in the totals.
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -1,18 +1,42 @@
 from __future__ import annotations
 
+import hashlib
+from collections.abc import Iterable
+from dataclasses import dataclass
+from itertools import islice
 from uuid import UUID
 
 from vectorless_rag_service.core.interfaces import IndexBuilder
 from vectorless_rag_service.core.models import IndexArtifact, IndexNode, TextSpan
-from vectorless_rag_service.indexing.parser import PageContent, iter_sections, parse_text
+from vectorless_rag_service.indexing.parser import (
+    PageContent,
+    PageSection,
+    parse_text,
+    split_sections,
+)
+from vectorless_rag_service.indexing.summaries import combine_summaries, summarize_text
+from vectorless_rag_service.indexing.terms import (
+    build_span_postings,
+    build_term_statistics,
+    patch_span_postings,
+)
+from vectorless_rag_service.observability.metrics import INDEX_PAGES
+from vectorless_rag_service.observability.stages import StageTimings
+
+
+def page_spans(page: PageContent, paragraphs: list[str]) -> list[TextSpan]:
+    return [
+        TextSpan(
+            span_id=f"p{page.page_number}-s{idx}", page=page.page_number, text=paragraph.strip()
+        )
+        for idx, paragraph in enumerate(paragraphs, start=1)
+    ]
 
 
 def build_spans(pages: list[PageContent]) -> list[TextSpan]:
     spans: list[TextSpan] = []
     for page in pages:
-        for idx, paragraph in enumerate(page.text.split("\n\n"), start=1):
-            span_id = f"p{page.page_number}-s{idx}"
-            spans.append(TextSpan(span_id=span_id, page=page.page_number, text=paragraph.strip()))
+        spans.extend(page_spans(page, page.text.split("\n\n")))
     return spans
 
 
@@ -21,66 +45,237 @@ class PageIndexBuilder(IndexBuilder):
         raise NotImplementedError
 
 
+def page_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@dataclass
+class PageUnit:
+    """The nodes (page node first, then its sections) and spans built from one page."""
+
+    nodes: list[IndexNode]
+    spans: list[TextSpan]
+
+
+def build_page(page: PageContent, root_id: str, timings: StageTimings | None = None) -> PageUnit:
+    timings = timings if timings is not None else StageTimings()
+    with timings.measure("span_build"):
+        paragraphs = page.text.split("\n\n")
+        spans = page_spans(page, paragraphs)
+    with timings.measure("section_detect"):
+        sections = split_sections(paragraphs)
+    with timings.measure("tree_build"):
+        unit = _page_unit(page, root_id, spans, sections)
+    with timings.measure("summarize"):
+        summarize_page(unit)
+    return unit
+
+
+def _page_unit(
+    page: PageContent, root_id: str, spans: list[TextSpan], sections: list[PageSection]
+) -> PageUnit:
+    page_node_id = f"page-{page.page_number}"
+    page_span_ids = [span.span_id for span in spans]
+    page_node = IndexNode(
+        node_id=page_node_id,
+        parent_id=root_id,
+        title=f"Page {page.page_number}",
+        level=1,
+        page_start=page.page_number,
+        page_end=page.page_number,
+        text_span_ids=page_span_ids,
+        children=[],
+    )
+    nodes = [page_node]
+    for section_idx, section in enumerate(sections, start=1):
+        section_span_ids = [spans[idx].span_id for idx in section.paragraphs]
+        section_node_id = f"page-{page.page_number}-sec-{section_idx}"
+        nodes.append(
+            IndexNode(
+                node_id=section_node_id,
+                parent_id=page_node_id,
+                title=section.title,
+                level=2,
+                page_start=page.page_number,
+                page_end=page.page_number,
+                text_span_ids=section_span_ids or page_span_ids,
+                children=[],
+            )
+        )
+        page_node.children.append(section_node_id)
+    return PageUnit(nodes=nodes, spans=spans)
+
+
+def summarize_page(unit: PageUnit) -> None:
+    """Summarize each section from its spans, then the page node from its sections."""
+    texts = {span.span_id: span.text for span in unit.spans}
+    page_node, sections = unit.nodes[0], unit.nodes[1:]
+    for node in sections:
+        node.summary, node.keywords = summarize_text(
+            node.title, (texts[span_id] for span_id in node.text_span_ids)
+        )
+    if sections:
+        page_node.summary, page_node.keywords = combine_summaries(sections)
+    else:
+        page_node.summary, page_node.keywords = summarize_text("", texts.values())
+
+
+def renumber_page(unit: PageUnit, page_number: int) -> PageUnit:
+    """Copy a page built at another position, rewriting its ids to ``page_number``."""
+    span_ids = {
+        span.span_id: f"p{page_number}-s{idx}" for idx, span in enumerate(unit.spans, start=1)
+    }
+    page_node_id = f"page-{page_number}"
+    node_ids = {unit.nodes[0].node_id: page_node_id}
+    node_ids.update(
+        (node.node_id, f"{page_node_id}-sec-{idx}") for idx, node in enumerate(unit.nodes[1:], 1)
+    )
+    nodes = [
+        node.model_copy(
+            update={
+                "node_id": node_ids[node.node_id],
+                "parent_id": node.parent_id if node.level == 1 else page_node_id,
+                "title": f"Page {page_number}" if node.level == 1 else node.title,
+                "page_start": page_number,
+                "page_end": page_number,
+                "text_span_ids": [span_ids[span_id] for span_id in node.text_span_ids],
+                "children": [node_ids[child_id] for child_id in node.children],
+            }
+        )
+        for node in unit.nodes
+    ]
+    spans = [
+        span.model_copy(update={"span_id": span_ids[span.span_id], "page": page_number})
+        for span in unit.spans
+    ]
+    return PageUnit(nodes=nodes, spans=spans)
+
+
+def previous_pages(artifact: IndexArtifact) -> dict[int, tuple[PageUnit, int]]:
+    """Split an artifact back into per-page units, with each page's first span index."""
+    units: dict[int, tuple[PageUnit, int]] = {}
+    for node in artifact.nodes:
+        if node.level == 1:
+            units[node.page_start] = (PageUnit(nodes=[], spans=[]), -1)
+        if node.level >= 1:
+            units[node.page_start][0].nodes.append(node)
+    for span_idx, span in enumerate(artifact.spans):
+        unit, first = units[span.page]
+        unit.spans.append(span)
+        if first == -1:
+            units[span.page] = (unit, span_idx)
+    return units
+
+
 class BaselineIndexBuilder(IndexBuilder):
+    """Builds the Document -> Page -> Section tree with BM25 statistics.
+
+    Every node carries an extractive summary and keywords, built bottom-up: sections
+    from their spans, pages from their sections and the document from its pages. The
+    node-level BM25 statistics cover them, so scoring a node never reads span text.
+
+    Every artifact records a content hash per page. Given the previous artifact for
+    the same document, unchanged pages are reused (renumbered if they moved) rather
+    than rebuilt, and the span postings are patched for the changed pages only.
+    """
+
     def __init__(self, max_pages: int = 300) -> None:
         self.max_pages = max_pages
 
     def build(self, document_id: UUID, text: str) -> IndexArtifact:
-        pages = parse_text(text, self.max_pages)
-        spans = build_spans(pages)
-        nodes: list[IndexNode] = []
+        return self.build_pages(document_id, parse_text(text, self.max_pages))
+
+    def build_pages(
+        self,
+        document_id: UUID,
+        pages: Iterable[PageContent],
+        previous: IndexArtifact | None = None,
+    ) -> IndexArtifact:
+        if previous is not None and (
+            previous.page_hashes is None
+            or previous.postings is None
+            or previous.document_id != document_id
+        ):
+            previous = None
+        old_units = previous_pages(previous) if previous is not None else {}
+        old_by_hash: dict[str, list[int]] = {}
+        if previous is not None and previous.page_hashes is not None:
+            for page_number, digest in enumerate(previous.page_hashes, start=1):
+                old_by_hash.setdefault(digest, []).append(page_number)
+
         root_id = f"doc-{document_id}"
-        nodes.append(
-            IndexNode(
-                node_id=root_id,
-                parent_id=None,
-                title="Document",
-                level=0,
-                page_start=1,
-                page_end=len(pages),
-                text_span_ids=[span.span_id for span in spans],
-                children=[],
-            )
+        root = IndexNode(
+            node_id=root_id,
+            parent_id=None,
+            title="Document",
+            level=0,
+            page_start=1,
+            page_end=0,
+            text_span_ids=[],
+            children=[],
         )
+        nodes: list[IndexNode] = [root]
+        spans: list[TextSpan] = []
+        page_hashes: list[str] = []
+        # Previous span index -> new span index, for spans carried over unchanged.
+        span_remap = [-1] * (len(previous.spans) if previous is not None else 0)
+        added_spans: list[int] = []
+        reused = 0
+        # Pages are produced lazily, so reading them is timed as its own stage.
+        timings = StageTimings()
+        page_iter = islice(pages, self.max_pages)
 
-        for page in pages:
-            page_node_id = f"page-{page.page_number}"
-            page_span_ids = [span.span_id for span in spans if span.page == page.page_number]
-            nodes.append(
-                IndexNode(
-                    node_id=page_node_id,
-                    parent_id=root_id,
-                    title=f"Page {page.page_number}",
-                    level=1,
-                    page_start=page.page_number,
-                    page_end=page.page_number,
-                    text_span_ids=page_span_ids,
-                    children=[],
-                )
+        while True:
+            with timings.measure("text_load"):
+                page = next(page_iter, None)
+            if page is None:
+                break
+            digest = page_hash(page.text)
+            candidates = old_by_hash.get(digest)
+            if candidates:
+                old_number = candidates.pop(0)
+                unit, first_span = old_units[old_number]
+                for offset in range(len(unit.spans)):
+                    span_remap[first_span + offset] = len(spans) + offset
+                if old_number != page.page_number:
+                    with timings.measure("tree_build"):
+                        unit = renumber_page(unit, page.page_number)
+                if not unit.nodes[0].keywords:
+                    # Built before summaries were stored: summarize copies of its nodes.
+                    with timings.measure("summarize"):
+                        unit = PageUnit([node.model_copy() for node in unit.nodes], unit.spans)
+                        summarize_page(unit)
+                reused += 1
+            else:
+                unit = build_page(page, root_id, timings)
+                added_spans.extend(range(len(spans), len(spans) + len(unit.spans)))
+            root.page_end = page.page_number
+            root.children.append(unit.nodes[0].node_id)
+            nodes.extend(unit.nodes)
+            spans.extend(unit.spans)
+            page_hashes.append(digest)
+
+        root.text_span_ids = [span.span_id for span in spans]
+        with timings.measure("summarize"):
+            root.summary, root.keywords = combine_summaries(
+                node for node in nodes if node.level == 1
             )
-            nodes[0].children.append(page_node_id)
-
-            section_idx = 1
-            for title, section_text in iter_sections(page.text):
-                section_span_ids = [
-                    span.span_id
-                    for span in spans
-                    if span.page == page.page_number and span.text in section_text
-                ]
-                section_node_id = f"page-{page.page_number}-sec-{section_idx}"
-                nodes.append(
-                    IndexNode(
-                        node_id=section_node_id,
-                        parent_id=page_node_id,
-                        title=title,
-                        level=2,
-                        page_start=page.page_number,
-                        page_end=page.page_number,
-                        text_span_ids=section_span_ids or page_span_ids,
-                        children=[],
-                    )
+        with timings.measure("postings"):
+            if previous is not None and previous.postings is not None:
+                INDEX_PAGES.labels("reused").inc(reused)
+                postings = patch_span_postings(
+                    previous.postings, span_remap, added_spans, spans, nodes
                 )
-                nodes[-2].children.append(section_node_id)
-                section_idx += 1
-
-        return IndexArtifact(document_id=document_id, nodes=nodes, spans=spans)
+            else:
+                postings = build_span_postings(spans, nodes)
+            term_stats = build_term_statistics(nodes)
+        INDEX_PAGES.labels("built").inc(len(page_hashes) - reused)
+        timings.record(pages=len(page_hashes))
+        return IndexArtifact(
+            document_id=document_id,
+            nodes=nodes,
+            spans=spans,
+            term_stats=term_stats,
+            postings=postings,
+            page_hashes=page_hashes,
+        )
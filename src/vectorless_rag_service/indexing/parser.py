@@ -1,10 +1,15 @@
 from __future__ import annotations
 
 import re
-from collections.abc import Iterable
+import signal
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass
+from itertools import islice
+from typing import TYPE_CHECKING
 
-from PyPDF2 import PdfReader
+if TYPE_CHECKING:
+    from PyPDF2 import PdfReader
 
 
 @dataclass
@@ -13,8 +18,15 @@ class PageContent:
     text: str
 
 
+def _pdf_reader(path: str) -> PdfReader:
+    # Imported on first use: text-only deployments never load PyPDF2.
+    from PyPDF2 import PdfReader
+
+    return PdfReader(path)
+
+
 def parse_pdf(path: str, max_pages: int) -> list[PageContent]:
-    reader = PdfReader(path)
+    reader = _pdf_reader(path)
     pages: list[PageContent] = []
     for idx, page in enumerate(reader.pages[:max_pages], start=1):
         text = page.extract_text() or ""
@@ -22,22 +34,71 @@ def parse_pdf(path: str, max_pages: int) -> list[PageContent]:
     return pages
 
 
-def parse_text(text: str, max_pages: int) -> list[PageContent]:
-    paragraphs = text.split("\n\n")
-    pages: list[PageContent] = []
+class PageTimeout(Exception):
+    pass
+
+
+@contextmanager
+def _time_limit(seconds: float) -> Iterator[None]:
+    # SIGALRM only fires in the main thread, which is where process-pool workers run tasks.
+    if seconds <= 0 or not hasattr(signal, "setitimer"):
+        yield
+        return
+
+    def on_alarm(signum: int, frame: object) -> None:
+        raise PageTimeout
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def count_pdf_pages(path: str, timeout: float = 0.0) -> int:
+    """Page count of a PDF; raises ``PageTimeout`` after ``timeout`` seconds, if set."""
+    with _time_limit(timeout):
+        return len(_pdf_reader(path).pages)
+
+
+def extract_pdf_pages(path: str, start: int, end: int, page_timeout: float) -> list[str | None]:
+    """Extract text for pages ``start`` (inclusive) to ``end`` (exclusive).
+
+    A page whose extraction exceeds ``page_timeout`` seconds is returned as ``None``.
+    """
+    reader = _pdf_reader(path)
+    texts: list[str | None] = []
+    for page in reader.pages[start:end]:
+        try:
+            with _time_limit(page_timeout):
+                texts.append(page.extract_text() or "")
+        except PageTimeout:
+            texts.append(None)
+    return texts
+
+
+def iter_text_pages(text: str) -> Iterator[PageContent]:
+    """Split plain text into pages of roughly 2000 characters on paragraph breaks."""
     current: list[str] = []
+    # Length of "\n\n".join(current), tracked incrementally.
+    current_length = 0
     page_number = 1
-    for para in paragraphs:
+    for para in text.split("\n\n"):
+        current_length += len(para) + (2 if current else 0)
         current.append(para)
-        if len("\n\n".join(current)) > 2000:
-            pages.append(PageContent(page_number=page_number, text="\n\n".join(current)))
+        if current_length > 2000:
+            yield PageContent(page_number=page_number, text="\n\n".join(current))
             current = []
+            current_length = 0
             page_number += 1
-            if page_number > max_pages:
-                break
-    if current and page_number <= max_pages:
-        pages.append(PageContent(page_number=page_number, text="\n\n".join(current)))
-    return pages
+    if current:
+        yield PageContent(page_number=page_number, text="\n\n".join(current))
+
+
+def parse_text(text: str, max_pages: int) -> list[PageContent]:
+    return list(islice(iter_text_pages(text), max_pages))
 
 
 HEADING_PATTERN = re.compile(r"^(\d+(?:\.\d+)*)\s+(.+)$")
@@ -60,3 +121,65 @@ def iter_sections(text: str) -> Iterable[tuple[str, str]]:
             buffer.append(stripped)
     if buffer:
         yield current_title, "\n".join(buffer)
+
+
+@dataclass
+class PageSection:
+    title: str
+    text: str
+    paragraphs: list[int]
+
+
+def split_sections(paragraphs: list[str]) -> list[PageSection]:
+    """Single-pass equivalent of ``iter_sections`` over a page split into paragraphs.
+
+    Each section also lists the paragraphs whose stripped text lies inside the
+    section text, in page order. Blank paragraphs belong to every section.
+    """
+    sections: list[PageSection] = []
+    blank: list[int] = []
+    title = "Introduction"
+    buffer: list[str] = []
+    members: list[int] = []
+    # Paragraphs whose text differs from their stripped lines; checked once the section closes.
+    unverified: list[tuple[int, str]] = []
+
+    def close_section() -> None:
+        text = "\n".join(buffer)
+        members.extend(idx for idx, para in unverified if para in text)
+        sections.append(PageSection(title=title, text=text, paragraphs=sorted(members)))
+
+    for para_idx, paragraph in enumerate(paragraphs):
+        stripped_para = paragraph.strip()
+        if not stripped_para:
+            blank.append(para_idx)
+            continue
+        body: list[str] = []
+        has_heading = False
+        for line in paragraph.splitlines():
+            stripped = line.strip()
+            if not stripped:
+                continue
+            match = HEADING_PATTERN.match(stripped)
+            if match:
+                has_heading = True
+                if buffer:
+                    close_section()
+                    buffer, members, unverified = [], [], []
+                title = match.group(2)
+            else:
+                buffer.append(stripped)
+                body.append(stripped)
+        if has_heading or not body:
+            continue
+        if stripped_para == "\n".join(body):
+            members.append(para_idx)
+        else:
+            unverified.append((para_idx, stripped_para))
+    if buffer:
+        close_section()
+
+    if blank:
+        for section in sections:
+            section.paragraphs = sorted(section.paragraphs + blank)
+    return sections
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import signal
+from collections.abc import Callable
+from multiprocessing.connection import Connection
+from multiprocessing.context import SpawnContext
+from typing import Any
+
+from vectorless_rag_service.indexing.parser import (
+    PageContent,
+    PageTimeout,
+    count_pdf_pages,
+    extract_pdf_pages,
+)
+from vectorless_rag_service.observability.logging import get_logger
+from vectorless_rag_service.observability.metrics import ERROR_COUNT
+
+logger = get_logger()
+
+# Extra time allowed per page range on top of the per-page budget (reader setup, IPC).
+RANGE_TIMEOUT_SLACK_SECONDS = 5.0
+
+
+class PdfParseTimeout(Exception):
+    pass
+
+
+class PdfWorkerExited(RuntimeError):
+    """A parse worker process died before returning its result."""
+
+
+def _serve(conn: Connection) -> None:
+    """Worker process loop: run one ``(fn, args)`` task at a time and send back the outcome."""
+    # Ctrl-C is meant for the parent, which stops its workers itself.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Startup (interpreter and imports) must not count against the first task's budget.
+    conn.send(True)
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        fn, args = task
+        try:
+            outcome = (True, fn(*args))
+        except Exception as exc:
+            outcome = (False, exc)
+        conn.send(outcome)
+
+
+class _Worker:
+    """One spawned parse process, fed one task at a time over a pipe."""
+
+    def __init__(self, context: SpawnContext) -> None:
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_serve, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+
+    async def ready(self) -> None:
+        await self._receive(None)
+
+    async def run(self, fn: Callable[..., Any], args: tuple, timeout: float) -> tuple[bool, Any]:
+        """Send a task and wait up to ``timeout`` seconds for its outcome."""
+        self.conn.send((fn, args))
+        return await self._receive(timeout)
+
+    async def _receive(self, timeout: float | None) -> Any:
+        loop = asyncio.get_running_loop()
+        readable = loop.create_future()
+        fd = self.conn.fileno()
+
+        def on_readable() -> None:
+            loop.remove_reader(fd)
+            if not readable.done():
+                readable.set_result(None)
+
+        loop.add_reader(fd, on_readable)
+        try:
+            await asyncio.wait_for(readable, timeout)
+        finally:
+            loop.remove_reader(fd)
+        try:
+            return self.conn.recv()
+        except EOFError as exc:
+            raise PdfWorkerExited(f"PDF parse worker {self.process.pid} exited") from exc
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.conn.close()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class PdfParsePool:
+    """Parse PDFs in worker processes, splitting large documents into page ranges.
+
+    Workers are started on first use. Ranges are parsed in parallel and reassembled in
+    page order. Inside a worker, each page gets ``page_timeout_seconds`` (enforced with
+    SIGALRM) before it is skipped. A range's budget starts when a worker picks it up,
+    not when it is queued. A worker still busy after ``pages * page_timeout_seconds +
+    timeout_slack_seconds`` (a page that ignored the alarm) is killed and replaced.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        pages_per_task: int,
+        page_timeout_seconds: float,
+        timeout_slack_seconds: float = RANGE_TIMEOUT_SLACK_SECONDS,
+    ) -> None:
+        self.workers = workers
+        self.pages_per_task = pages_per_task
+        self.page_timeout_seconds = page_timeout_seconds
+        self.timeout_slack_seconds = timeout_slack_seconds
+        self._context = multiprocessing.get_context("spawn")
+        self._live: set[_Worker] = set()
+        # Free workers; ``None`` is a free slot whose process has not been started.
+        self._idle: asyncio.Queue[_Worker | None] | None = None
+
+    def _idle_workers(self) -> asyncio.Queue[_Worker | None]:
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+            for _ in range(self.workers):
+                self._idle.put_nowait(None)
+        return self._idle
+
+    async def run(self, fn: Callable[..., Any], *args: Any, budget_seconds: float) -> Any:
+        """Run ``fn(*args)`` in a worker process.
+
+        Waiting for a free worker does not count against ``budget_seconds``. A worker
+        that overruns the budget (plus the slack) is killed and ``PdfParseTimeout``
+        is raised.
+        """
+        idle = self._idle_workers()
+        worker = await idle.get()
+        try:
+            if worker is None:
+                worker = _Worker(self._context)
+                self._live.add(worker)
+                await worker.ready()
+            ok, value = await worker.run(fn, args, budget_seconds + self.timeout_slack_seconds)
+        except BaseException as exc:
+            # Timed out, cancelled or crashed: the process may still be working on the
+            # task, so it cannot take another one.
+            if worker is not None:
+                self._discard(worker, exc)
+            idle.put_nowait(None)
+            if isinstance(exc, TimeoutError):
+                raise PdfParseTimeout("PDF parsing exceeded its time budget") from exc
+            raise
+        idle.put_nowait(worker)
+        if ok:
+            return value
+        if isinstance(value, PageTimeout):
+            raise PdfParseTimeout("PDF parsing exceeded its time budget") from value
+        raise value
+
+    def _discard(self, worker: _Worker, reason: BaseException) -> None:
+        self._live.discard(worker)
+        if isinstance(reason, TimeoutError):
+            ERROR_COUNT.labels("pdf_worker_killed").inc()
+            logger.warning("pdf_worker_killed", pid=worker.process.pid)
+        worker.kill()
+
+    async def parse(self, path: str, max_pages: int) -> list[PageContent]:
+        page_count = await self.run(
+            count_pdf_pages,
+            path,
+            self.page_timeout_seconds,
+            budget_seconds=self.page_timeout_seconds,
+        )
+        page_count = min(page_count, max_pages)
+        ranges = [
+            (start, min(start + self.pages_per_task, page_count))
+            for start in range(0, page_count, self.pages_per_task)
+        ]
+        results = await asyncio.gather(
+            *(
+                self.run(
+                    extract_pdf_pages,
+                    path,
+                    start,
+                    end,
+                    self.page_timeout_seconds,
+                    budget_seconds=(end - start) * self.page_timeout_seconds,
+                )
+                for start, end in ranges
+            )
+        )
+
+        pages: list[PageContent] = []
+        for text in (text for texts in results for text in texts):
+            page_number = len(pages) + 1
+            if text is None:
+                ERROR_COUNT.labels("pdf_page_timeout").inc()
+                logger.warning("pdf_page_timeout", page=page_number)
+            pages.append(PageContent(page_number=page_number, text=text or ""))
+        return pages
+
+    def shutdown(self) -> None:
+        for worker in self._live:
+            if worker.process.is_alive():
+                worker.stop()
+                worker.process.join(timeout=1.0)
+            if worker.process.is_alive():
+                worker.kill()
+        self._live.clear()
+        self._idle = None
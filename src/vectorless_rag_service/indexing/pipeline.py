@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from vectorless_rag_service.core.interfaces import ArtifactStore, IndexBuilder, MetadataStore
+from vectorless_rag_service.core.models import IndexArtifact
+from vectorless_rag_service.observability.logging import get_logger
+from vectorless_rag_service.observability.stages import artifact_pages, stage
+from vectorless_rag_service.storage.document_text import DocumentTextStore
+from vectorless_rag_service.storage.metadata_store import IndexArtifactStore
+
+logger = get_logger()
+
+
+class IndexPipeline:
+    """Build and store the index artifact for one document."""
+
+    def __init__(
+        self,
+        metadata_store: MetadataStore,
+        artifact_store: ArtifactStore,
+        index_builder: IndexBuilder,
+        index_record_store: IndexArtifactStore,
+        text_store: DocumentTextStore,
+    ) -> None:
+        self.metadata_store = metadata_store
+        self.artifact_store = artifact_store
+        self.index_builder = index_builder
+        self.index_record_store = index_record_store
+        self.text_store = text_store
+
+    def run(self, document_id: UUID) -> str:
+        text_blob = self.metadata_store.get_text_blob(document_id)
+        pages = self.text_store.iter_pages(text_blob)
+        previous = self._previous_artifact(document_id)
+        with stage("index_build") as labels:
+            artifact = self.index_builder.build_pages(document_id, pages, previous=previous)
+            labels.pages = artifact_pages(artifact)
+        uri = self.artifact_store.put(document_id, artifact)
+        self.index_record_store.record(document_id, uri)
+        return uri
+
+    def _previous_artifact(self, document_id: UUID) -> IndexArtifact | None:
+        try:
+            if self.artifact_store.exists(document_id):
+                return self.artifact_store.get(document_id)
+        except Exception:
+            # A missing or unreadable artifact only costs a full rebuild.
+            logger.warning("previous_artifact_unavailable", document_id=str(document_id))
+        return None
@@ -0,0 +1,103 @@
+"""Extractive node summaries and keywords, computed bottom-up at index time.
+
+A node with no children is summarized from its own spans. Its keywords are its most
+frequent content terms, and its summary is the sentences that cover the most
+keyword weight, kept in document order. A parent is summarized from its children's
+summaries and keywords alone. That means a reused page keeps its summary, and
+rebuilding the page and document nodes never re-reads span text.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from itertools import chain
+
+from vectorless_rag_service.core.models import IndexNode
+from vectorless_rag_service.indexing.terms import tokenize
+
+SUMMARY_SENTENCES = 2
+SUMMARY_CHARS = 240
+MAX_KEYWORDS = 8
+
+SENTENCE_BREAK = re.compile(r"(?<=[.!?;])\s+")
+# Like ``terms.TOKEN_PATTERN``, but skipping one-character tokens.
+CONTENT_TOKEN = re.compile(r"[^\W_]{2,}")
+STOPWORDS = frozenset(
+    """
+    a about above after again all also an and any are as at be been before being below
+    between both but by can could did do does doing down during each either for from
+    further had has have having here how if in into is it its itself may might more most
+    must no nor not of off on once only or other our out over own same shall should so
+    some such than that the their them then there these they this those through to too
+    under until up upon very was we were what when where which while who whom why will
+    with within without would you your
+    """.split()
+)
+
+
+def content_terms(text: str) -> list[str]:
+    """Tokens worth keeping as keywords: no stopwords, numbers or one-letter tokens."""
+    return [
+        token
+        for token in CONTENT_TOKEN.findall(text.lower())
+        if token not in STOPWORDS and not token.isdigit()
+    ]
+
+
+def split_sentences(text: str) -> list[str]:
+    return [sentence for sentence in SENTENCE_BREAK.split(text.strip()) if sentence]
+
+
+def clip(text: str, limit: int = SUMMARY_CHARS) -> str:
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(" ", 1)[0]
+
+
+def extract(
+    sentences: list[str], terms: list[list[str]], weights: Mapping[str, int], skip: set[str]
+) -> str:
+    """The ``SUMMARY_SENTENCES`` highest-weighted sentences, in their original order.
+
+    ``terms`` holds each sentence's content terms. Repeated sentences, and sentences
+    that add no terms beyond ``skip`` (a bare heading), are left out.
+    """
+    scored: list[tuple[int, int]] = []
+    seen: set[str] = set()
+    for idx, (sentence, sentence_terms) in enumerate(zip(sentences, terms, strict=True)):
+        unique = set(sentence_terms)
+        if unique <= skip or sentence in seen:
+            continue
+        seen.add(sentence)
+        scored.append((sum(weights.get(term, 0) for term in unique), idx))
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    chosen = sorted(idx for _, idx in scored[:SUMMARY_SENTENCES])
+    return clip(" ".join(" ".join(sentences[idx].split()) for idx in chosen))
+
+
+def summarize_text(title: str, texts: Iterable[str]) -> tuple[str, list[str]]:
+    """Summary and keywords for a node with no children, from the text of its spans."""
+    sentences = [sentence for text in texts for sentence in split_sentences(text)]
+    terms = [content_terms(sentence) for sentence in sentences]
+    counts = Counter(chain.from_iterable(terms))
+    keywords = [term for term, _ in counts.most_common(MAX_KEYWORDS)]
+    return extract(sentences, terms, counts, set(tokenize(title))), keywords
+
+
+def combine_summaries(children: Iterable[IndexNode]) -> tuple[str, list[str]]:
+    """Summary and keywords for a parent, from its children's summaries and keywords.
+
+    Each child's keywords vote for themselves, weighted by their rank in that child,
+    so terms that lead many children lead the parent.
+    """
+    votes: Counter[str] = Counter()
+    sentences: list[str] = []
+    for child in children:
+        for rank, term in enumerate(child.keywords):
+            votes[term] += MAX_KEYWORDS - rank
+        sentences.extend(split_sentences(child.summary))
+    keywords = [term for term, _ in votes.most_common(MAX_KEYWORDS)]
+    terms = [content_terms(sentence) for sentence in sentences]
+    return extract(sentences, terms, votes, set()), keywords
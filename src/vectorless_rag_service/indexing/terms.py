@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from collections.abc import Iterable
+
+from vectorless_rag_service.core.models import IndexNode, SpanPostings, TermStatistics, TextSpan
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def bm25_term_score(idf: float, tf: int, length: int, avg_length: float) -> float:
+    length_ratio = length / avg_length if avg_length else 0.0
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * length_ratio)
+    return idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+
+def inverse_document_frequency(doc_count: int, doc_freq: int) -> float:
+    return math.log(1 + (doc_count - doc_freq + 0.5) / (doc_freq + 0.5))
+
+
+def build_term_statistics(nodes: Iterable[IndexNode]) -> TermStatistics:
+    """Precompute BM25 statistics over node titles, summaries and keywords, per node."""
+    term_freqs: dict[str, dict[str, int]] = {}
+    node_lengths: dict[str, int] = {}
+    doc_freqs: Counter[str] = Counter()
+    for node in nodes:
+        counts = Counter(tokenize(node.title))
+        counts.update(tokenize(node.summary))
+        counts.update(node.keywords)
+        term_freqs[node.node_id] = dict(counts)
+        node_lengths[node.node_id] = sum(counts.values())
+        doc_freqs.update(counts.keys())
+
+    doc_count = len(node_lengths)
+    avg_length = sum(node_lengths.values()) / doc_count if doc_count else 0.0
+    idf = {term: inverse_document_frequency(doc_count, df) for term, df in doc_freqs.items()}
+    return TermStatistics(
+        avg_length=avg_length, idf=idf, node_lengths=node_lengths, term_freqs=term_freqs
+    )
+
+
+def bm25_score(query_counts: Counter[str], node_id: str, stats: TermStatistics) -> float:
+    tfs = stats.term_freqs.get(node_id)
+    if not tfs:
+        return 0.0
+    length = stats.node_lengths[node_id]
+    score = 0.0
+    for term, query_tf in query_counts.items():
+        tf = tfs.get(term)
+        if tf:
+            score += query_tf * bm25_term_score(stats.idf[term], tf, length, stats.avg_length)
+    return score
+
+
+def span_nodes(spans: list[TextSpan], nodes: list[IndexNode]) -> tuple[list[int], list[int]]:
+    """Map each span to the first section node listing it (else its page), and its page."""
+    span_index = {span.span_id: idx for idx, span in enumerate(spans)}
+    span_sections = [-1] * len(spans)
+    span_pages = [-1] * len(spans)
+    for node_idx, node in enumerate(nodes):
+        if node.level == 0:
+            continue
+        target = span_pages if node.level == 1 else span_sections
+        for span_id in node.text_span_ids:
+            idx = span_index[span_id]
+            if target[idx] == -1:
+                target[idx] = node_idx
+    span_sections = [
+        section if section != -1 else page
+        for section, page in zip(span_sections, span_pages, strict=True)
+    ]
+    return span_sections, span_pages
+
+
+def term_upper_bound(
+    idf: float, span_ids: list[int], tfs: list[int], span_lengths: list[int], avg_length: float
+) -> float:
+    return max(
+        bm25_term_score(idf, tf, span_lengths[idx], avg_length)
+        for idx, tf in zip(span_ids, tfs, strict=True)
+    )
+
+
+def build_span_postings(spans: list[TextSpan], nodes: list[IndexNode]) -> SpanPostings:
+    """Build an inverted index over span text.
+
+    Each span is rolled up to the first section node that lists it, or to its page
+    node when no section does, so retrieval can map matching spans back to the tree
+    without scanning the nodes.
+    """
+    span_sections, span_pages = span_nodes(spans, nodes)
+    span_lengths: list[int] = []
+    postings: dict[str, tuple[list[int], list[int]]] = {}
+    for idx, span in enumerate(spans):
+        counts = Counter(tokenize(span.text))
+        span_lengths.append(sum(counts.values()))
+        for term, tf in counts.items():
+            span_ids, tfs = postings.setdefault(term, ([], []))
+            span_ids.append(idx)
+            tfs.append(tf)
+
+    avg_length = sum(span_lengths) / len(span_lengths) if span_lengths else 0.0
+    idf: dict[str, float] = {}
+    upper_bounds: dict[str, float] = {}
+    for term, (span_ids, tfs) in postings.items():
+        idf[term] = inverse_document_frequency(len(spans), len(span_ids))
+        upper_bounds[term] = term_upper_bound(idf[term], span_ids, tfs, span_lengths, avg_length)
+    # Built here from well-typed data; skip re-validating every posting list.
+    return SpanPostings.model_construct(
+        avg_span_length=avg_length,
+        span_lengths=span_lengths,
+        span_sections=span_sections,
+        span_pages=span_pages,
+        idf=idf,
+        upper_bounds=upper_bounds,
+        postings=postings,
+    )
+
+
+def patch_span_postings(
+    previous: SpanPostings,
+    span_remap: list[int],
+    added_spans: list[int],
+    spans: list[TextSpan],
+    nodes: list[IndexNode],
+) -> SpanPostings:
+    """Derive the postings for an edited document from the previous postings.
+
+    ``span_remap`` maps each previous span index to its new index (``-1`` if the span
+    was dropped) and ``added_spans`` lists the new spans that must be tokenized. Only
+    the added spans are tokenized, and exact upper bounds are only recomputed for
+    terms whose posting lists changed. Every other term keeps its previous bound,
+    rescaled for the new IDF and average span length. That keeps it a valid bound
+    for MaxScore, though it may be slightly looser than a full rebuild would give.
+    """
+    span_count = len(spans)
+    span_lengths = [0] * span_count
+    for old_idx, new_idx in enumerate(span_remap):
+        if new_idx >= 0:
+            span_lengths[new_idx] = previous.span_lengths[old_idx]
+    added: dict[str, list[tuple[int, int]]] = {}
+    for idx in added_spans:
+        counts = Counter(tokenize(spans[idx].text))
+        span_lengths[idx] = sum(counts.values())
+        for term, tf in counts.items():
+            added.setdefault(term, []).append((idx, tf))
+    kept = [new_idx for new_idx in span_remap if new_idx >= 0]
+    in_order = all(a < b for a, b in zip(kept, kept[1:], strict=False))
+
+    postings: dict[str, tuple[list[int], list[int]]] = {}
+    changed: set[str] = set(added)
+    for term, (old_ids, old_tfs) in previous.postings.items():
+        span_ids = [span_remap[idx] for idx in old_ids]
+        if term not in added and in_order and -1 not in span_ids:
+            # Same spans in the same order: only the indexes moved.
+            postings[term] = (span_ids, old_tfs)
+            continue
+        changed.add(term)
+        pairs = [
+            (new_idx, tf) for new_idx, tf in zip(span_ids, old_tfs, strict=True) if new_idx >= 0
+        ]
+        pairs.extend(added.get(term, ()))
+        if pairs:
+            pairs.sort()
+            postings[term] = ([idx for idx, _ in pairs], [tf for _, tf in pairs])
+    for term in added.keys() - previous.postings.keys():
+        pairs = sorted(added[term])
+        postings[term] = ([idx for idx, _ in pairs], [tf for _, tf in pairs])
+
+    avg_length = sum(span_lengths) / span_count if span_count else 0.0
+    # A longer average span length can only raise scores; a shorter one only lowers them.
+    growth = max(1.0, avg_length / previous.avg_span_length) if previous.avg_span_length else 1.0
+    idf: dict[str, float] = {}
+    upper_bounds: dict[str, float] = {}
+    for term, (span_ids, tfs) in postings.items():
+        idf[term] = inverse_document_frequency(span_count, len(span_ids))
+        if term in changed:
+            upper_bounds[term] = term_upper_bound(
+                idf[term], span_ids, tfs, span_lengths, avg_length
+            )
+        else:
+            scale = idf[term] / previous.idf[term] * growth
+            upper_bounds[term] = previous.upper_bounds[term] * scale
+    span_sections, span_pages = span_nodes(spans, nodes)
+    return SpanPostings.model_construct(
+        avg_span_length=avg_length,
+        span_lengths=span_lengths,
+        span_sections=span_sections,
+        span_pages=span_pages,
+        idf=idf,
+        upper_bounds=upper_bounds,
+        postings=postings,
+    )
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from vectorless_rag_service.config import settings
+from vectorless_rag_service.indexing.pipeline import IndexPipeline
+from vectorless_rag_service.observability.logging import get_logger
+from vectorless_rag_service.observability.metrics import (
+    ERROR_COUNT,
+    INDEX_DURATION,
+    JOB_QUEUE_DEPTH,
+)
+from vectorless_rag_service.observability.profiling import (
+    ProfileStore,
+    build_profile_store,
+    capture,
+)
+from vectorless_rag_service.observability.stages import trace_exemplar, tracer
+from vectorless_rag_service.storage.job_queue import LeasedJob, SqlJobQueue
+
+logger = get_logger()
+
+
+class IndexWorker:
+    def __init__(
+        self,
+        queue: SqlJobQueue,
+        pipeline: IndexPipeline,
+        worker_id: str,
+        heartbeat_seconds: float,
+        poll_seconds: float,
+        profiles: ProfileStore | None = None,
+        profile_sample_rate: float = 0.0,
+    ) -> None:
+        self.queue = queue
+        self.pipeline = pipeline
+        self.worker_id = worker_id
+        self.heartbeat_seconds = heartbeat_seconds
+        self.poll_seconds = poll_seconds
+        self.profiles = profiles
+        self.profile_sample_rate = profile_sample_rate
+        self._wakeup = threading.Event()
+
+    def run_once(self) -> bool:
+        """Lease and process one job; returns False when the queue had nothing ready."""
+        job = self.queue.lease(self.worker_id)
+        if job is None:
+            return False
+        self._process(job)
+        JOB_QUEUE_DEPTH.set(self.queue.depth())
+        return True
+
+    def run(self, stop: threading.Event) -> None:
+        """Process jobs until ``stop`` is set, reclaiming expired leases as it goes.
+
+        When the queue is empty it polls every ``poll_seconds``, or sooner after
+        ``wake``. Setting ``stop`` should be followed by ``wake`` to end the wait.
+        """
+        while not stop.is_set():
+            try:
+                self.queue.reclaim_expired()
+                if not self.run_once():
+                    self._idle()
+            except Exception:
+                ERROR_COUNT.labels("worker").inc()
+                logger.exception("worker_loop_failed", worker_id=self.worker_id)
+                self._idle()
+
+    def wake(self) -> None:
+        """Cut the current idle wait short, e.g. right after a job is enqueued."""
+        self._wakeup.set()
+
+    def _idle(self) -> None:
+        self._wakeup.wait(self.poll_seconds)
+        self._wakeup.clear()
+
+    def _process(self, job: LeasedJob) -> None:
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job, done), daemon=True)
+        heartbeat.start()
+        start = time.perf_counter()
+        context = {"document_id": str(job.document_id), "job_id": str(job.job_id)}
+        error: Exception | None = None
+        with tracer.start_as_current_span("index_job", attributes=context):
+            try:
+                with self._maybe_profile(job):
+                    self.pipeline.run(job.document_id)
+            except Exception as exc:
+                error = exc
+            finally:
+                done.set()
+                heartbeat.join()
+            exemplar = trace_exemplar()
+
+        if error is not None:
+            ERROR_COUNT.labels("indexing").inc()
+            retry = self.queue.fail(job, self.worker_id, str(error))
+            logger.error("index_failed", exc_info=error, retry=retry, **context)
+        elif self.queue.complete(job.job_id, self.worker_id):
+            INDEX_DURATION.observe(time.perf_counter() - start, exemplar)
+            logger.info("index_complete", **context)
+        else:
+            logger.warning("index_lease_lost", **context)
+
+    @contextmanager
+    def _maybe_profile(self, job: LeasedJob) -> Iterator[None]:
+        if self.profiles is None or random.random() >= self.profile_sample_rate:
+            yield
+            return
+        with capture(self.profiles, job.job_id) as profiling:
+            yield
+        if profiling:
+            path = str(self.profiles.path(job.job_id))
+            logger.info("index_profiled", job_id=str(job.job_id), path=path)
+
+    def _heartbeat(self, job: LeasedJob, done: threading.Event) -> None:
+        while not done.wait(self.heartbeat_seconds):
+            if not self.queue.heartbeat(job.job_id, self.worker_id):
+                return
+
+
+class WorkerPool:
+    """Index workers, one thread each, that share a stop event."""
+
+    def __init__(self, workers: list[IndexWorker]) -> None:
+        self.workers = workers
+        self.stop_event = threading.Event()
+        self._threads = [
+            threading.Thread(target=worker.run, args=(self.stop_event,), name=f"index-worker-{idx}")
+            for idx, worker in enumerate(workers)
+        ]
+
+    def start(self) -> None:
+        for thread in self._threads:
+            thread.start()
+
+    def wake(self) -> None:
+        for worker in self.workers:
+            worker.wake()
+
+    def stop(self) -> None:
+        """Signal the workers to stop; a job in progress is finished first."""
+        self.stop_event.set()
+        self.wake()
+
+    def join(self) -> None:
+        for thread in self._threads:
+            thread.join()
+
+
+def build_worker(queue: SqlJobQueue, pipeline: IndexPipeline, worker_id: str) -> IndexWorker:
+    return IndexWorker(
+        queue,
+        pipeline,
+        worker_id=worker_id,
+        heartbeat_seconds=settings.worker.heartbeat_seconds,
+        poll_seconds=settings.worker.poll_seconds,
+        profiles=build_profile_store(),
+        profile_sample_rate=settings.profiling.index_sample_rate,
+    )
+
+
+def build_worker_pool(
+    queue: SqlJobQueue, pipeline: IndexPipeline, prefix: str, concurrency: int
+) -> WorkerPool:
+    return WorkerPool(
+        [
+            build_worker(queue, pipeline, f"{prefix}-{idx}-{uuid.uuid4().hex[:6]}")
+            for idx in range(concurrency)
+        ]
+    )
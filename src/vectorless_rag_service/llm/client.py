@@ -1,8 +1,76 @@
 from __future__ import annotations
 
+import json
+
+import httpx
+
+from vectorless_rag_service.config import settings
 from vectorless_rag_service.core.interfaces import LLMClient
 
 
+class LLMError(Exception):
+    pass
+
+
+class LLMTimeout(LLMError):
+    pass
+
+
 class DisabledLLMClient(LLMClient):
-    def complete_json(self, prompt: str) -> dict[str, object]:
+    def complete_json(self, prompt: str, timeout: float | None = None) -> dict[str, object]:
         raise RuntimeError("LLM navigation is disabled")
+
+
+class HttpLLMClient(LLMClient):
+    """Client for an OpenAI-compatible ``/chat/completions`` endpoint in JSON mode.
+
+    Connections are pooled and kept alive, up to ``max_connections``.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        model: str,
+        api_key: str | None = None,
+        max_connections: int = 8,
+        http: httpx.Client | None = None,
+    ) -> None:
+        self.model = model
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        limits = httpx.Limits(
+            max_connections=max_connections, max_keepalive_connections=max_connections
+        )
+        self.http = http or httpx.Client(base_url=base_url, headers=headers, limits=limits)
+
+    def complete_json(self, prompt: str, timeout: float | None = None) -> dict[str, object]:
+        body = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "response_format": {"type": "json_object"},
+            "temperature": 0,
+        }
+        try:
+            response = self.http.post("chat/completions", json=body, timeout=timeout)
+            response.raise_for_status()
+            reply = json.loads(response.json()["choices"][0]["message"]["content"])
+        except httpx.TimeoutException as exc:
+            raise LLMTimeout(str(exc)) from exc
+        except (httpx.HTTPError, ValueError, KeyError, IndexError, TypeError) as exc:
+            raise LLMError(f"Invalid LLM response: {exc}") from exc
+        if not isinstance(reply, dict):
+            raise LLMError("LLM reply is not a JSON object")
+        return reply
+
+    def close(self) -> None:
+        self.http.close()
+
+
+def build_llm_client() -> HttpLLMClient:
+    if not settings.llm.base_url:
+        raise ValueError("LLM navigation needs VRS_LLM__BASE_URL")
+    return HttpLLMClient(
+        settings.llm.base_url,
+        settings.llm.model,
+        settings.llm.api_key,
+        max_connections=settings.llm.max_concurrency,
+    )
@@ -0,0 +1,85 @@
+"""Deterministic stand-in for an OpenAI-compatible LLM, for tests and offline benchmarks.
+
+It answers ``POST /v1/chat/completions`` navigation prompts by picking the candidate
+whose title and preview share the most terms with the question (the first one on a
+tie), after an optional fixed delay. The same prompt always gets the same reply.
+``GET /v1/stats`` reports how many completions it has served.
+
+Run with::
+
+    python -m vectorless_rag_service.llm.fake_server --port 8100 --latency-ms 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import threading
+from typing import Any
+
+from fastapi import FastAPI
+
+from vectorless_rag_service.indexing.terms import tokenize
+
+
+def choose(prompt: str) -> dict[str, object]:
+    """The reply to a navigation prompt, whose last line holds the question and candidates."""
+    payload = json.loads(prompt.rstrip().rsplit("\n", 1)[-1])
+    question = set(tokenize(payload["question"]))
+    best_id, best_overlap = None, -1
+    for candidate in payload["candidates"]:
+        terms = set(tokenize(f"{candidate['title']} {candidate.get('preview', '')}"))
+        overlap = len(question & terms)
+        if overlap > best_overlap:
+            best_id, best_overlap = candidate["node_id"], overlap
+    confidence = best_overlap / len(question) if question else 0.0
+    return {"node_id": best_id, "confidence": round(confidence, 3)}
+
+
+def create_fake_llm_app(latency_seconds: float = 0.0) -> FastAPI:
+    app = FastAPI(title="Fake LLM")
+    calls = 0
+    lock = threading.Lock()
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(body: dict[str, Any]):
+        nonlocal calls
+        with lock:
+            calls += 1
+        if latency_seconds > 0:
+            await asyncio.sleep(latency_seconds)
+        reply = choose(body["messages"][-1]["content"])
+        return {
+            "object": "chat.completion",
+            "model": body.get("model", "fake"),
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": json.dumps(reply)},
+                }
+            ],
+        }
+
+    @app.get("/v1/stats")
+    async def stats():
+        return {"calls": calls}
+
+    return app
+
+
+def main(argv: list[str] | None = None) -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Deterministic fake LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args(argv)
+    app = create_fake_llm_app(args.latency_ms / 1000)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,52 @@
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import anyio
 from fastapi import FastAPI
 
 from vectorless_rag_service.api.routes import router
+from vectorless_rag_service.api.services import build_services
+from vectorless_rag_service.api.uploads import MULTIPART_OVERHEAD_BYTES, UploadSizeLimitMiddleware
 from vectorless_rag_service.config import settings
 from vectorless_rag_service.observability.logging import setup_logging
-from vectorless_rag_service.observability.middleware import CorrelationIdMiddleware
+from vectorless_rag_service.observability.middleware import ObservabilityMiddleware
+from vectorless_rag_service.observability.profiling import ProfilingMiddleware, build_profile_store
 from vectorless_rag_service.observability.tracing import setup_tracing
 from vectorless_rag_service.storage.database import init_db
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    services = build_services()
+    init_db()
+    app.state.services = services
+    workers = services.index_workers
+    if workers is not None:
+        # Polls the queue, so retries, jobs left over from a restart and expired
+        # leases are picked up without waiting for another index request.
+        workers.start()
+    try:
+        yield
+    finally:
+        if workers is not None:
+            workers.stop()
+            await anyio.to_thread.run_sync(workers.join)
+        services.close()
+
+
 def create_app() -> FastAPI:
     setup_logging()
-    init_db()
-    app = FastAPI(title="Vectorless RAG Service", version="0.1.0")
-    app.add_middleware(CorrelationIdMiddleware)
+    app = FastAPI(title="Vectorless RAG Service", version="0.1.0", lifespan=lifespan)
+    # Added first so it sits innermost and profiles only the request's own handling.
+    app.add_middleware(ProfilingMiddleware, store=build_profile_store())
+    app.add_middleware(ObservabilityMiddleware)
+    app.add_middleware(
+        UploadSizeLimitMiddleware,
+        max_body_bytes=settings.limits.max_upload_bytes + MULTIPART_OVERHEAD_BYTES,
+        paths=("/v1/documents",),
+    )
     app.include_router(router)
     setup_tracing(app)
     return app
@@ -1,9 +1,87 @@
 from __future__ import annotations
 
-from prometheus_client import Counter, Gauge, Histogram
+import os
 
-REQUEST_COUNT = Counter("vrs_requests_total", "Total HTTP requests", ["method", "path", "status"])
-REQUEST_LATENCY = Histogram("vrs_request_latency_seconds", "Request latency", ["method", "path"])
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, multiprocess
+
+# HTTP metrics are labelled by route template ("/v1/jobs/{job_id}"), never the raw path.
+REQUEST_COUNT = Counter("vrs_requests_total", "Total HTTP requests", ["method", "route", "status"])
+REQUEST_LATENCY = Histogram("vrs_request_latency_seconds", "Request latency", ["method", "route"])
+BODY_SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+REQUEST_BODY_BYTES = Histogram(
+    "vrs_request_body_bytes", "Request body size", ["method", "route"], buckets=BODY_SIZE_BUCKETS
+)
+RESPONSE_BODY_BYTES = Histogram(
+    "vrs_response_body_bytes", "Response body size", ["method", "route"], buckets=BODY_SIZE_BUCKETS
+)
 ERROR_COUNT = Counter("vrs_errors_total", "Total errors", ["type"])
 INDEX_DURATION = Histogram("vrs_index_duration_seconds", "Indexing duration")
-JOB_QUEUE_DEPTH = Gauge("vrs_job_queue_depth", "Job queue depth")
+# Gauges say how to combine worker processes' values under multiprocess mode (see
+# ``exposition_registry``); "live" modes drop the values of exited workers.
+JOB_QUEUE_DEPTH = Gauge(
+    "vrs_job_queue_depth", "Job queue depth", multiprocess_mode="livemostrecent"
+)
+ARTIFACT_CACHE_HITS = Counter("vrs_artifact_cache_hits_total", "Artifact cache hits")
+ARTIFACT_CACHE_MISSES = Counter("vrs_artifact_cache_misses_total", "Artifact cache misses")
+ARTIFACT_CACHE_EVICTIONS = Counter("vrs_artifact_cache_evictions_total", "Artifact cache evictions")
+ARTIFACT_CACHE_ENTRIES = Gauge(
+    "vrs_artifact_cache_entries", "Artifacts held in the cache", multiprocess_mode="livesum"
+)
+ARTIFACT_CACHE_BYTES = Gauge(
+    "vrs_artifact_cache_bytes", "Approximate size of cached artifacts", multiprocess_mode="livesum"
+)
+DOCUMENT_DEDUP_HITS = Counter(
+    "vrs_document_dedup_hits_total", "Uploads answered with an existing document"
+)
+INDEX_REUSE = Counter("vrs_index_reuse_total", "Index requests answered with an existing job")
+IDEMPOTENT_REPLAYS = Counter(
+    "vrs_idempotent_replays_total", "Requests answered from a stored idempotent response", ["route"]
+)
+INDEX_PAGES = Counter("vrs_index_pages_total", "Pages written by index builds", ["outcome"])
+QUERY_CACHE_HITS = Counter(
+    "vrs_query_cache_hits_total", "Queries answered from the result cache", ["backend"]
+)
+QUERY_CACHE_MISSES = Counter(
+    "vrs_query_cache_misses_total", "Queries not found in the result cache", ["backend"]
+)
+S3_ARTIFACT_FETCHES = Counter(
+    "vrs_s3_artifact_fetches_total",
+    "S3 artifact reads by outcome (downloaded, not_modified, missing)",
+    ["result"],
+)
+LLM_CALLS = Counter(
+    "vrs_llm_calls_total", "LLM completion calls by outcome (ok, timeout, error)", ["outcome"]
+)
+LLM_IN_FLIGHT = Gauge(
+    "vrs_llm_in_flight", "LLM completion calls in progress", multiprocess_mode="livesum"
+)
+LLM_NAVIGATION_DECISIONS = Counter(
+    "vrs_llm_navigation_decisions_total",
+    "Tree navigation choices by source (llm, cache, single)",
+    ["source"],
+)
+LLM_NAVIGATION_FALLBACKS = Counter(
+    "vrs_llm_navigation_fallbacks_total",
+    "Queries answered by the baseline retriever after navigation gave up (deadline, error)",
+    ["reason"],
+)
+STAGE_DURATION = Histogram(
+    "vrs_stage_duration_seconds",
+    "Time spent in one indexing or query pipeline stage",
+    ["stage", "pages", "backend"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 10.0),
+)
+
+
+def exposition_registry() -> CollectorRegistry:
+    """The registry ``/metrics`` serves.
+
+    With ``PROMETHEUS_MULTIPROC_DIR`` set, every worker process writes its samples to
+    files in that directory, and a fresh registry aggregates all of them. Otherwise
+    this is the process's own default registry.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
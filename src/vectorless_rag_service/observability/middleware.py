@@ -3,22 +3,83 @@ from __future__ import annotations
 import time
 import uuid
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from structlog.contextvars import bind_contextvars, clear_contextvars
 
-from vectorless_rag_service.observability.metrics import REQUEST_COUNT, REQUEST_LATENCY
+from vectorless_rag_service.observability.metrics import (
+    REQUEST_BODY_BYTES,
+    REQUEST_COUNT,
+    REQUEST_LATENCY,
+    RESPONSE_BODY_BYTES,
+)
+from vectorless_rag_service.observability.stages import trace_exemplar
 
+METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+# Label for requests that matched no route (404s, scanners), so they share one series.
+UNMATCHED_ROUTE = "unmatched"
 
-class CorrelationIdMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        request_id = request.headers.get("X-Request-Id") or str(uuid.uuid4())
+
+def route_template(scope: Scope) -> str:
+    """The path template of the route that handled the request, set by the router."""
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    return path if isinstance(path, str) else UNMATCHED_ROUTE
+
+
+class ObservabilityMiddleware:
+    """Request id, latency, status and body-size metrics as plain ASGI middleware.
+
+    Unlike ``BaseHTTPMiddleware`` it neither wraps the request in extra tasks nor
+    buffers the response; it only watches the messages passing through. Metrics are
+    labelled by route template, so ids in paths do not create new time series.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+        request_id = request_id or str(uuid.uuid4())
         bind_contextvars(request_id=request_id)
-        start = time.time()
-        response: Response = await call_next(request)
-        duration = time.time() - start
-        REQUEST_LATENCY.labels(request.method, request.url.path).observe(duration)
-        REQUEST_COUNT.labels(request.method, request.url.path, response.status_code).inc()
-        response.headers["X-Request-Id"] = request_id
-        clear_contextvars()
-        return response
+        status = 500
+        request_bytes = 0
+        response_bytes = 0
+
+        async def counting_receive() -> Message:
+            nonlocal request_bytes
+            message = await receive()
+            if message["type"] == "http.request":
+                request_bytes += len(message.get("body", b""))
+            return message
+
+        async def observing_send(message: Message) -> None:
+            nonlocal status, response_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"x-request-id", request_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, counting_receive, observing_send)
+        finally:
+            duration = time.perf_counter() - start
+            method = scope["method"] if scope["method"] in METHODS else "OTHER"
+            route = route_template(scope)
+            REQUEST_LATENCY.labels(method, route).observe(duration, trace_exemplar())
+            REQUEST_COUNT.labels(method, route, str(status)).inc()
+            REQUEST_BODY_BYTES.labels(method, route).observe(request_bytes)
+            RESPONSE_BODY_BYTES.labels(method, route).observe(response_bytes)
+            clear_contextvars()
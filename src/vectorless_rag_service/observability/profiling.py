@@ -0,0 +1,188 @@
+"""On-demand cProfile captures of single requests and sampled index jobs.
+
+A request sent with ``X-Profile: 1`` and the configured admin key in ``X-Admin-Key``
+runs under cProfile. The profile is saved as a ``.pstats`` file under
+``VRS_PROFILING__PATH``, and its id is returned in the ``X-Profile-Id`` response header.
+Index workers profile a random ``VRS_PROFILING__INDEX_SAMPLE_RATE`` fraction of jobs
+the same way, under the job id.
+
+cProfile traces one thread. A profiled request therefore also records any other
+coroutines that share its event loop in the meantime. Work the request hands to I/O
+threads appears only as time spent waiting. Only one profile runs at a time per
+process; a request that asks while another is running is served unprofiled.
+
+A request's profile is saved before the last chunk of its response body is sent, so
+it can be fetched as soon as the response is complete. A profile that fails to save
+is logged and skipped, and its id then answers 404.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from uuid import UUID, uuid4
+
+import anyio
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from vectorless_rag_service.config import settings
+from vectorless_rag_service.core.models import ErrorResponse
+from vectorless_rag_service.observability.logging import get_logger
+
+logger = get_logger()
+
+_ACTIVE = threading.Lock()
+
+
+class ProfileStore:
+    """Saved profiles in one directory, keeping the newest ``max_profiles``."""
+
+    def __init__(self, base_path: str, max_profiles: int) -> None:
+        self.base_path = Path(base_path)
+        self.max_profiles = max_profiles
+
+    def path(self, profile_id: UUID) -> Path:
+        return self.base_path / f"{profile_id}.pstats"
+
+    def save(self, profile_id: UUID, profiler: cProfile.Profile) -> Path:
+        self.base_path.mkdir(parents=True, exist_ok=True)
+        path = self.path(profile_id)
+        tmp_path = path.with_suffix(".tmp")
+        profiler.dump_stats(tmp_path)
+        os.replace(tmp_path, path)
+        self._prune()
+        return path
+
+    def summary(self, profile_id: UUID, limit: int = 50) -> str:
+        """The top ``limit`` functions by cumulative time, as ``pstats`` prints them."""
+        output = io.StringIO()
+        stats = pstats.Stats(str(self.path(profile_id)), stream=output)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+        return output.getvalue()
+
+    def _prune(self) -> None:
+        profiles = sorted(self.base_path.glob("*.pstats"), key=lambda path: path.stat().st_mtime)
+        for stale in profiles[: max(0, len(profiles) - self.max_profiles)]:
+            stale.unlink(missing_ok=True)
+
+
+def build_profile_store() -> ProfileStore:
+    return ProfileStore(settings.profiling.path, settings.profiling.max_profiles)
+
+
+class ProfileSession:
+    """One capture: ``start`` and ``stop`` on the thread being profiled, then ``save``.
+
+    ``save`` may run on another thread. It logs rather than raises if the profile
+    cannot be written, and a second call does nothing.
+    """
+
+    def __init__(self, store: ProfileStore, profile_id: UUID) -> None:
+        self.store = store
+        self.profile_id = profile_id
+        self._profiler: cProfile.Profile | None = None
+
+    def start(self) -> bool:
+        """Begin profiling; False if another profile is running."""
+        if not _ACTIVE.acquire(blocking=False):
+            return False
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler or debugger owns the interpreter's profiling hook.
+            _ACTIVE.release()
+            return False
+        self._profiler = profiler
+        return True
+
+    def stop(self) -> None:
+        if self._profiler is not None:
+            self._profiler.disable()
+
+    def save(self) -> None:
+        profiler, self._profiler = self._profiler, None
+        if profiler is None:
+            return
+        try:
+            self.store.save(self.profile_id, profiler)
+        except Exception:
+            logger.exception("profile_save_failed", profile_id=str(self.profile_id))
+        finally:
+            _ACTIVE.release()
+
+
+@contextmanager
+def capture(store: ProfileStore, profile_id: UUID) -> Iterator[bool]:
+    """Profile the enclosed block on this thread; yields False if another profile is running."""
+    session = ProfileSession(store, profile_id)
+    try:
+        yield session.start()
+    finally:
+        session.stop()
+        session.save()
+
+
+def admin_key_matches(key: str | None) -> bool:
+    admin_key = settings.profiling.admin_key
+    return admin_key is not None and key is not None and hmac.compare_digest(key, admin_key)
+
+
+class ProfilingMiddleware:
+    """Profile requests that carry ``X-Profile: 1`` and a valid ``X-Admin-Key``."""
+
+    def __init__(self, app: ASGIApp, store: ProfileStore) -> None:
+        self.app = app
+        self.store = store
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        if headers.get(b"x-profile") != b"1":
+            await self.app(scope, receive, send)
+            return
+        admin_key = headers.get(b"x-admin-key")
+        if not admin_key_matches(admin_key.decode("latin-1") if admin_key else None):
+            detail = ErrorResponse(error_code="forbidden", message="Profiling needs an admin key")
+            response = JSONResponse({"detail": detail.model_dump()}, status_code=403)
+            await response(scope, receive, send)
+            return
+
+        profile_id = uuid4()
+        session = ProfileSession(self.store, profile_id)
+        profiling = session.start()
+        status = b"captured" if profiling else b"busy"
+
+        async def finish() -> None:
+            if not profiling:
+                return
+            session.stop()
+            await anyio.to_thread.run_sync(session.save)
+
+        async def send_with_profile_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                extra = [(b"x-profile-status", status)]
+                if profiling:
+                    extra.append((b"x-profile-id", str(profile_id).encode("latin-1")))
+                message = {**message, "headers": [*message.get("headers", []), *extra]}
+            elif message["type"] == "http.response.body" and not message.get("more_body"):
+                # The id went out with the headers; the file must exist before the
+                # client sees the response complete.
+                await finish()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            # Covers an app that failed before sending its last body chunk.
+            await finish()
@@ -0,0 +1,96 @@
+"""Per-stage timing for the indexing and query pipelines.
+
+``stage()`` runs one step in an OpenTelemetry child span and records its duration in
+``vrs_stage_duration_seconds``, labelled by stage, page-count bucket and storage
+backend. Observations made inside a sampled span carry its trace id as an exemplar,
+so a slow bucket in Prometheus links to a trace that landed in it.
+
+Steps that interleave inside one loop, such as per-page section detection, are summed
+with ``StageTimings`` and recorded once, with the totals set on the enclosing span.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from opentelemetry import trace
+
+from vectorless_rag_service.core.models import IndexArtifact
+from vectorless_rag_service.observability.metrics import STAGE_DURATION
+
+PAGE_BUCKETS = (10, 50, 100, 300)
+
+tracer = trace.get_tracer("vectorless_rag_service")
+
+
+def page_bucket(pages: int | None) -> str:
+    if pages is None:
+        return "unknown"
+    for bound in PAGE_BUCKETS:
+        if pages <= bound:
+            return f"<={bound}"
+    return f">{PAGE_BUCKETS[-1]}"
+
+
+def artifact_pages(artifact: IndexArtifact) -> int:
+    return artifact.nodes[0].page_end if artifact.nodes else 0
+
+
+def trace_exemplar() -> dict[str, str] | None:
+    """Exemplar labels linking an observation to the current sampled trace, if any."""
+    context = trace.get_current_span().get_span_context()
+    if not context.is_valid or not context.trace_flags.sampled:
+        return None
+    return {"trace_id": trace.format_trace_id(context.trace_id)}
+
+
+def record_stage(
+    name: str, seconds: float, pages: int | None = None, backend: str = "none"
+) -> None:
+    STAGE_DURATION.labels(name, page_bucket(pages), backend).observe(seconds, trace_exemplar())
+
+
+@dataclass
+class StageLabels:
+    """Labels of a running stage; ``pages`` may be filled in once it is known."""
+
+    pages: int | None = None
+    backend: str = "none"
+
+
+@contextmanager
+def stage(name: str, pages: int | None = None, backend: str = "none") -> Iterator[StageLabels]:
+    """Time a step in a child span; failed steps are left to the span's error status."""
+    labels = StageLabels(pages, backend)
+    with tracer.start_as_current_span(name) as span:
+        start = time.perf_counter()
+        yield labels
+        elapsed = time.perf_counter() - start
+        span.set_attribute("vrs.backend", labels.backend)
+        if labels.pages is not None:
+            span.set_attribute("vrs.pages", labels.pages)
+        record_stage(name, elapsed, labels.pages, labels.backend)
+
+
+class StageTimings:
+    """Accumulated durations of stages that alternate within one loop."""
+
+    def __init__(self) -> None:
+        self.seconds: dict[str, float] = {}
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - start
+
+    def record(self, pages: int | None = None, backend: str = "none") -> None:
+        span = trace.get_current_span()
+        for name, seconds in self.seconds.items():
+            record_stage(name, seconds, pages, backend)
+            span.set_attribute(f"vrs.stage.{name}_ms", seconds * 1000)
@@ -1,9 +1,6 @@
 from __future__ import annotations
 
 from opentelemetry import trace
-from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
-from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
-from opentelemetry.instrumentation.requests import RequestsInstrumentor
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
@@ -11,13 +8,27 @@ from opentelemetry.sdk.trace.export import BatchSpanProcessor
 from vectorless_rag_service.config import settings
 
 
-def setup_tracing(app) -> None:
+def setup_tracer_provider() -> None:
     resource = Resource.create({"service.name": settings.observability.service_name})
     provider = TracerProvider(resource=resource)
     if settings.observability.otlp_endpoint:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
         exporter = OTLPSpanExporter(endpoint=settings.observability.otlp_endpoint)
         processor = BatchSpanProcessor(exporter)
         provider.add_span_processor(processor)
     trace.set_tracer_provider(provider)
+
+
+def setup_tracing(app) -> None:
+    setup_tracer_provider()
+    if not settings.observability.otlp_endpoint:
+        # Without an exporter the HTTP server and client spans would be discarded, and
+        # the instrumentors are among the slowest imports at startup. Stage spans still
+        # carry trace ids for exemplars.
+        return
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    from opentelemetry.instrumentation.requests import RequestsInstrumentor
+
     FastAPIInstrumentor.instrument_app(app)
     RequestsInstrumentor().instrument()
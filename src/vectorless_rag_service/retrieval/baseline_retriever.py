@@ -2,21 +2,23 @@ from __future__ import annotations
 
 import math
 from collections import Counter
+from collections.abc import Callable
 
-from rapidfuzz import fuzz
+import numpy as np
+from rapidfuzz import fuzz, process
 
 from vectorless_rag_service.core.interfaces import VectorlessRetriever
 from vectorless_rag_service.core.models import (
     Citation,
     IndexArtifact,
+    IndexNode,
     QueryRequest,
     QueryResponse,
     QueryTrace,
+    TextSpan,
 )
-
-
-def tokenize(text: str) -> list[str]:
-    return [token.lower() for token in text.split() if token.isalnum()]
+from vectorless_rag_service.indexing.terms import bm25_score, tokenize
+from vectorless_rag_service.observability.stages import artifact_pages, stage
 
 
 def score_text(query: str, candidate: str) -> float:
@@ -25,6 +27,23 @@ def score_text(query: str, candidate: str) -> float:
     return fuzz.partial_ratio(query.lower(), candidate.lower()) / 100.0
 
 
+def title_score_matrix(questions: list[str], titles: list[str]) -> np.ndarray:
+    """Fuzzy-match every question against every title, scaled like ``score_text``."""
+    # float64, so the scores equal ``score_text``'s exactly. rapidfuzz wants the scalar
+    # type, though its stubs declare a ``np.dtype``.
+    scores = process.cdist(  # type: ignore[call-overload]
+        [question.lower() for question in questions],
+        [title.lower() for title in titles],
+        scorer=fuzz.partial_ratio,
+        dtype=np.float64,
+    )
+    return scores / 100.0
+
+
+def _row_lookup(scores: np.ndarray, node_index: dict[str, int]) -> Callable[[str], float]:
+    return lambda node_id: float(scores[node_index[node_id]])
+
+
 def bm25_like(query: str, candidate: str) -> float:
     query_tokens = tokenize(query)
     candidate_tokens = tokenize(candidate)
@@ -39,37 +58,18 @@ def bm25_like(query: str, candidate: str) -> float:
     return score / len(candidate_tokens)
 
 
-class BaselineTreeRetriever(VectorlessRetriever):
-    def retrieve(self, artifact: IndexArtifact, request: QueryRequest) -> QueryResponse:
-        nodes_by_id = {node.node_id: node for node in artifact.nodes}
-        spans_by_id = {span.span_id: span for span in artifact.spans}
-        trace = QueryTrace(visited_nodes=[], decisions=[])
-
-        def score_node(node_id: str) -> float:
-            node = nodes_by_id[node_id]
-            return score_text(request.question, node.title) + bm25_like(
-                request.question, node.title
-            )
-
-        current_ids = [artifact.nodes[0].node_id]
-        best_nodes: list[tuple[str, float]] = []
-
-        while current_ids:
-            scored = [(node_id, score_node(node_id)) for node_id in current_ids]
-            scored.sort(key=lambda item: item[1], reverse=True)
-            best_id, best_score = scored[0]
-            trace.visited_nodes.append(best_id)
-            trace.decisions.append(f"selected {best_id} score={best_score:.3f}")
-            best_nodes.append((best_id, best_score))
-            children = nodes_by_id[best_id].children
-            if not children:
-                break
-            current_ids = children
-
-        best_nodes.sort(key=lambda item: item[1], reverse=True)
-        top_nodes = best_nodes[: request.top_k]
-        citations: list[Citation] = []
-        for node_id, score in top_nodes:
+def build_response(
+    artifact: IndexArtifact,
+    request: QueryRequest,
+    nodes_by_id: dict[str, IndexNode],
+    spans_by_id: dict[str, TextSpan],
+    ranked_nodes: list[tuple[str, float]],
+    trace: QueryTrace,
+) -> QueryResponse:
+    """Cite the first ``top_k`` of ``ranked_nodes`` and answer with their excerpts."""
+    citations: list[Citation] = []
+    with stage("citations", pages=artifact_pages(artifact)):
+        for node_id, score in ranked_nodes[: request.top_k]:
             node = nodes_by_id[node_id]
             span_texts = [spans_by_id[span_id].text for span_id in node.text_span_ids[:2]]
             excerpt = "\n".join(text for text in span_texts if text)
@@ -84,8 +84,96 @@ class BaselineTreeRetriever(VectorlessRetriever):
                 )
             )
 
-        answer = "\n".join(citation.excerpt for citation in citations if citation.excerpt)[:2000]
-        if not answer:
-            answer = "No relevant content found in the document."
+    answer = "\n".join(citation.excerpt for citation in citations if citation.excerpt)[:2000]
+    if not answer:
+        answer = "No relevant content found in the document."
+
+    return QueryResponse(answer=answer, citations=citations, trace=trace)
+
+
+class BaselineTreeRetriever(VectorlessRetriever):
+    def retrieve(self, artifact: IndexArtifact, request: QueryRequest) -> QueryResponse:
+        return self.retrieve_many(artifact, [request])[0]
 
-        return QueryResponse(answer=answer, citations=citations, trace=trace)
+    def retrieve_many(
+        self, artifact: IndexArtifact, requests: list[QueryRequest]
+    ) -> list[QueryResponse]:
+        if not requests:
+            return []
+        nodes_by_id = {node.node_id: node for node in artifact.nodes}
+        spans_by_id = {span.span_id: span for span in artifact.spans}
+        if len(requests) == 1:
+            # A single walk scores only the levels it visits; scoring every title up
+            # front costs more than it saves.
+            request = requests[0]
+            score_node = self._node_scorer(
+                artifact,
+                request,
+                nodes_by_id,
+                lambda node_id: score_text(request.question, nodes_by_id[node_id].title),
+            )
+            return [self._walk(artifact, request, nodes_by_id, spans_by_id, score_node)]
+
+        node_index = {node.node_id: idx for idx, node in enumerate(artifact.nodes)}
+        # One matrix pass scores every question against every node title.
+        with stage("title_scores", pages=artifact_pages(artifact)):
+            title_scores = title_score_matrix(
+                [request.question for request in requests],
+                [node.title for node in artifact.nodes],
+            )
+        responses: list[QueryResponse] = []
+        for row, request in enumerate(requests):
+            score_node = self._node_scorer(
+                artifact, request, nodes_by_id, _row_lookup(title_scores[row], node_index)
+            )
+            responses.append(self._walk(artifact, request, nodes_by_id, spans_by_id, score_node))
+        return responses
+
+    def _node_scorer(
+        self,
+        artifact: IndexArtifact,
+        request: QueryRequest,
+        nodes_by_id: dict[str, IndexNode],
+        title_score: Callable[[str], float],
+    ) -> Callable[[str], float]:
+        stats = artifact.term_stats
+        query_counts = Counter(tokenize(request.question))
+
+        def score_node(node_id: str) -> float:
+            if stats is None:
+                # Artifacts built before term statistics were stored.
+                lexical = bm25_like(request.question, nodes_by_id[node_id].title)
+            else:
+                lexical = bm25_score(query_counts, node_id, stats)
+            return title_score(node_id) + lexical
+
+        return score_node
+
+    def _walk(
+        self,
+        artifact: IndexArtifact,
+        request: QueryRequest,
+        nodes_by_id: dict[str, IndexNode],
+        spans_by_id: dict[str, TextSpan],
+        score_node: Callable[[str], float],
+    ) -> QueryResponse:
+        trace = QueryTrace(visited_nodes=[], decisions=[])
+        current_ids = [artifact.nodes[0].node_id]
+        best_nodes: list[tuple[str, float]] = []
+        pages = artifact_pages(artifact)
+
+        with stage("tree_walk", pages=pages):
+            while current_ids:
+                scored = [(node_id, score_node(node_id)) for node_id in current_ids]
+                scored.sort(key=lambda item: item[1], reverse=True)
+                best_id, best_score = scored[0]
+                trace.visited_nodes.append(best_id)
+                trace.decisions.append(f"selected {best_id} score={best_score:.3f}")
+                best_nodes.append((best_id, best_score))
+                children = nodes_by_id[best_id].children
+                if not children:
+                    break
+                current_ids = children
+
+        best_nodes.sort(key=lambda item: item[1], reverse=True)
+        return build_response(artifact, request, nodes_by_id, spans_by_id, best_nodes, trace)
@@ -0,0 +1,301 @@
+"""Tree navigation where an LLM picks the child node to descend into at each level.
+
+All siblings at a level go to the model in one prompt, described by their titles and
+index-time summaries. The choice is cached per document, question and candidate set,
+so repeated questions cost no calls. A candidate is identified by its id, its title and
+a hash of the preview the model sees, so re-indexed content misses the cache. At most
+``max_concurrency`` calls are in flight per retriever, across all queries. A query
+that runs past its deadline, or gets an unusable reply, is answered by the baseline
+retriever instead.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from vectorless_rag_service.config import settings
+from vectorless_rag_service.core.interfaces import LLMClient, VectorlessRetriever
+from vectorless_rag_service.core.models import (
+    IndexArtifact,
+    IndexNode,
+    QueryRequest,
+    QueryResponse,
+    QueryTrace,
+    TextSpan,
+)
+from vectorless_rag_service.llm.client import LLMError, LLMTimeout, build_llm_client
+from vectorless_rag_service.observability.logging import get_logger
+from vectorless_rag_service.observability.metrics import (
+    LLM_CALLS,
+    LLM_IN_FLIGHT,
+    LLM_NAVIGATION_DECISIONS,
+    LLM_NAVIGATION_FALLBACKS,
+)
+from vectorless_rag_service.observability.stages import artifact_pages, stage
+from vectorless_rag_service.retrieval.baseline_retriever import (
+    BaselineTreeRetriever,
+    build_response,
+)
+from vectorless_rag_service.storage.query_cache import normalize_question
+
+logger = get_logger()
+
+NAVIGATION_PROMPT = """\
+You are navigating a document's table of contents to find the part that answers a question.
+Pick the one candidate most likely to contain the answer.
+Reply with a JSON object: {"node_id": "<the candidate's node_id>", "confidence": <0 to 1>}.
+The question and the candidates follow as JSON on the last line.
+"""
+
+# Document id, normalized question, and (node_id, title, preview hash) per candidate.
+DecisionKey = tuple[str, str, tuple[tuple[str, str, str], ...]]
+
+
+class NavigationDeadline(Exception):
+    pass
+
+
+def navigation_prompt(question: str, candidates: list[IndexNode], previews: dict[str, str]) -> str:
+    payload = {
+        "question": question,
+        "candidates": [
+            {"node_id": node.node_id, "title": node.title, "preview": previews[node.node_id]}
+            for node in candidates
+        ],
+    }
+    return NAVIGATION_PROMPT + json.dumps(payload)
+
+
+class DecisionCache:
+    """Thread-safe LRU of navigation choices.
+
+    Concurrent queries that need the same missing choice make one call: the first
+    claims the key and the others wait for its result.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[DecisionKey, tuple[str, float]] = OrderedDict()
+        self._pending: dict[DecisionKey, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def claim(self, key: DecisionKey, deadline: float) -> tuple[str, float] | None:
+        """The cached choice, or None when the caller must make it and then ``put`` or
+        ``release`` the key."""
+        if self.max_entries <= 0:
+            return None
+        while True:
+            with self._lock:
+                decision = self._entries.get(key)
+                if decision is not None:
+                    self._entries.move_to_end(key)
+                    return decision
+                pending = self._pending.get(key)
+                if pending is None:
+                    self._pending[key] = threading.Event()
+                    return None
+            # Wait for the claiming query; if it fails, the next waiter claims the key.
+            if not pending.wait(deadline - time.monotonic()):
+                raise NavigationDeadline("Deadline passed waiting for a shared decision")
+
+    def put(self, key: DecisionKey, decision: tuple[str, float]) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = decision
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        self.release(key)
+
+    def release(self, key: DecisionKey) -> None:
+        with self._lock:
+            pending = self._pending.pop(key, None)
+        if pending is not None:
+            pending.set()
+
+
+class LLMNavigationRetriever(VectorlessRetriever):
+    blocking = True
+
+    def __init__(
+        self,
+        client: LLMClient,
+        fallback: BaselineTreeRetriever,
+        max_concurrency: int,
+        deadline_seconds: float,
+        cache_entries: int,
+        preview_chars: int,
+    ) -> None:
+        self.client = client
+        self.fallback = fallback
+        self.deadline_seconds = deadline_seconds
+        self.preview_chars = preview_chars
+        self.cache = DecisionCache(cache_entries)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="llm-navigation"
+        )
+
+    def retrieve(self, artifact: IndexArtifact, request: QueryRequest) -> QueryResponse:
+        return self.retrieve_many(artifact, [request])[0]
+
+    def retrieve_many(
+        self, artifact: IndexArtifact, requests: list[QueryRequest]
+    ) -> list[QueryResponse]:
+        # Deadlines start now, so time spent queued behind other queries counts.
+        deadline = time.monotonic() + self.deadline_seconds
+        if len(requests) == 1:
+            return [self._navigate(artifact, requests[0], deadline)]
+        futures = [
+            self._executor.submit(self._navigate, artifact, request, deadline)
+            for request in requests
+        ]
+        return [future.result() for future in futures]
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        close = getattr(self.client, "close", None)
+        if close is not None:
+            close()
+
+    def _navigate(
+        self, artifact: IndexArtifact, request: QueryRequest, deadline: float
+    ) -> QueryResponse:
+        nodes_by_id = {node.node_id: node for node in artifact.nodes}
+        spans_by_id = {span.span_id: span for span in artifact.spans}
+        trace = QueryTrace(visited_nodes=[], decisions=[])
+        root = artifact.nodes[0]
+        path = [(root.node_id, 1.0)]
+        trace.visited_nodes.append(root.node_id)
+        candidates = root.children
+        try:
+            while candidates:
+                if len(candidates) == 1:
+                    LLM_NAVIGATION_DECISIONS.labels("single").inc()
+                    node_id, confidence, source = candidates[0], 1.0, "single"
+                else:
+                    siblings = [nodes_by_id[node_id] for node_id in candidates]
+                    node_id, confidence, source = self._choose(
+                        artifact, request.question, siblings, spans_by_id, deadline
+                    )
+                trace.visited_nodes.append(node_id)
+                trace.decisions.append(f"{source} selected {node_id} confidence={confidence:.3f}")
+                path.append((node_id, confidence))
+                candidates = nodes_by_id[node_id].children
+        except (NavigationDeadline, LLMError) as exc:
+            reason = "deadline" if isinstance(exc, NavigationDeadline) else "error"
+            LLM_NAVIGATION_FALLBACKS.labels(reason).inc()
+            logger.warning(
+                "llm_navigation_fallback",
+                document_id=str(artifact.document_id),
+                reason=reason,
+                error=str(exc),
+            )
+            response = self.fallback.retrieve(artifact, request)
+            response.trace.degraded = True
+            return response
+        # The deepest choice is the most specific, so it is cited first.
+        return build_response(artifact, request, nodes_by_id, spans_by_id, path[::-1], trace)
+
+    def _choose(
+        self,
+        artifact: IndexArtifact,
+        question: str,
+        siblings: list[IndexNode],
+        spans_by_id: dict[str, TextSpan],
+        deadline: float,
+    ) -> tuple[str, float, str]:
+        previews = {node.node_id: self._preview(node, spans_by_id) for node in siblings}
+        # Page ids and titles ("page-N", "Page N") survive a re-index unchanged, so the
+        # key also covers what the model is shown about each candidate.
+        key = (
+            str(artifact.document_id),
+            normalize_question(question),
+            tuple(
+                (
+                    node.node_id,
+                    node.title,
+                    hashlib.sha256(previews[node.node_id].encode("utf-8")).hexdigest(),
+                )
+                for node in siblings
+            ),
+        )
+        cached = self.cache.claim(key, deadline)
+        if cached is not None:
+            LLM_NAVIGATION_DECISIONS.labels("cache").inc()
+            return cached[0], cached[1], "cache"
+        try:
+            node_id, confidence = self._ask(artifact, question, siblings, previews, deadline)
+        except BaseException:
+            self.cache.release(key)
+            raise
+        LLM_NAVIGATION_DECISIONS.labels("llm").inc()
+        self.cache.put(key, (node_id, confidence))
+        return node_id, confidence, "llm"
+
+    def _ask(
+        self,
+        artifact: IndexArtifact,
+        question: str,
+        siblings: list[IndexNode],
+        previews: dict[str, str],
+        deadline: float,
+    ) -> tuple[str, float]:
+        reply = self._complete(
+            navigation_prompt(question, siblings, previews), deadline, artifact_pages(artifact)
+        )
+        node_id = reply.get("node_id")
+        if node_id not in {node.node_id for node in siblings}:
+            raise LLMError(f"LLM chose an unknown node: {node_id!r}")
+        confidence = reply.get("confidence", 0.0)
+        if not isinstance(confidence, int | float):
+            raise LLMError(f"Invalid confidence: {confidence!r}")
+        return str(node_id), min(max(float(confidence), 0.0), 1.0)
+
+    def _preview(self, node: IndexNode, spans_by_id: dict[str, TextSpan]) -> str:
+        # The index-time summary, or the node's first span in older artifacts.
+        if node.summary:
+            return node.summary[: self.preview_chars]
+        if node.text_span_ids:
+            return spans_by_id[node.text_span_ids[0]].text[: self.preview_chars]
+        return ""
+
+    def _complete(self, prompt: str, deadline: float, pages: int | None) -> dict[str, object]:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not self._slots.acquire(timeout=remaining):
+            raise NavigationDeadline("No LLM call slot before the deadline")
+        try:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise NavigationDeadline("Deadline passed while waiting for a slot")
+            with LLM_IN_FLIGHT.track_inprogress(), stage("llm_choose", pages=pages):
+                reply = self.client.complete_json(prompt, timeout=remaining)
+        except LLMTimeout as exc:
+            LLM_CALLS.labels("timeout").inc()
+            raise NavigationDeadline(str(exc)) from exc
+        except LLMError:
+            LLM_CALLS.labels("error").inc()
+            raise
+        finally:
+            self._slots.release()
+        LLM_CALLS.labels("ok").inc()
+        return reply
+
+
+def build_llm_navigator(fallback: BaselineTreeRetriever) -> LLMNavigationRetriever | None:
+    if not settings.enable_llm_navigation:
+        return None
+    return LLMNavigationRetriever(
+        build_llm_client(),
+        fallback,
+        max_concurrency=settings.llm.max_concurrency,
+        deadline_seconds=settings.llm.deadline_seconds,
+        cache_entries=settings.llm.decision_cache_entries,
+        preview_chars=settings.llm.preview_chars,
+    )
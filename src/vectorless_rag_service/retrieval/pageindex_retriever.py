@@ -3,12 +3,40 @@ from __future__ import annotations
 from vectorless_rag_service.core.interfaces import VectorlessRetriever
 from vectorless_rag_service.core.models import IndexArtifact, QueryRequest, QueryResponse
 from vectorless_rag_service.retrieval.baseline_retriever import BaselineTreeRetriever
+from vectorless_rag_service.retrieval.llm_navigator import LLMNavigationRetriever
+from vectorless_rag_service.retrieval.postings_retriever import PostingsRetriever
+
+CONTENT_MODE = "content"
 
 
 class PageIndexRetriever(VectorlessRetriever):
-    def __init__(self) -> None:
+    def __init__(self, navigator: LLMNavigationRetriever | None = None) -> None:
         self.fallback = BaselineTreeRetriever()
+        self.content = PostingsRetriever(fallback=self.fallback)
+        # Tree-mode queries go to the LLM navigator when one is configured.
+        self.navigator = navigator
+        self.tree: VectorlessRetriever = navigator or self.fallback
+        self.blocking = navigator is not None
+        self.cache_tag = "llm-navigation" if navigator is not None else "baseline"
 
     def retrieve(self, artifact: IndexArtifact, request: QueryRequest) -> QueryResponse:
         # Placeholder for integration with an official PageIndex library.
-        return self.fallback.retrieve(artifact, request)
+        if request.mode == CONTENT_MODE:
+            return self.content.retrieve(artifact, request)
+        return self.tree.retrieve(artifact, request)
+
+    def retrieve_many(
+        self, artifact: IndexArtifact, requests: list[QueryRequest]
+    ) -> list[QueryResponse]:
+        results: list[QueryResponse | None] = [None] * len(requests)
+        tree_positions = []
+        for position, request in enumerate(requests):
+            if request.mode == CONTENT_MODE:
+                results[position] = self.content.retrieve(artifact, request)
+            else:
+                tree_positions.append(position)
+        tree_requests = [requests[position] for position in tree_positions]
+        tree_results = self.tree.retrieve_many(artifact, tree_requests)
+        for position, response in zip(tree_positions, tree_results, strict=True):
+            results[position] = response
+        return [result for result in results if result is not None]
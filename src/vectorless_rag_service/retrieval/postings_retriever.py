@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_left
+from collections import Counter
+
+from vectorless_rag_service.core.interfaces import VectorlessRetriever
+from vectorless_rag_service.core.models import (
+    Citation,
+    IndexArtifact,
+    QueryRequest,
+    QueryResponse,
+    QueryTrace,
+    SpanPostings,
+)
+from vectorless_rag_service.indexing.terms import bm25_term_score, tokenize
+from vectorless_rag_service.observability.stages import artifact_pages, stage
+
+# Spans fetched per requested citation before rolling them up into nodes.
+SPANS_PER_RESULT = 4
+
+
+def top_k_spans(
+    postings: SpanPostings, query_counts: Counter[str], k: int
+) -> list[tuple[float, int]]:
+    """Return the ``k`` best (score, span index) pairs using MaxScore early termination.
+
+    Query terms are ordered by their score upper bound. Terms whose combined upper
+    bound cannot lift a span above the current top-k threshold become
+    "non-essential": they are only probed for spans already found through an
+    essential term, and never drive candidate generation.
+    """
+    terms = sorted(
+        (term for term in query_counts if term in postings.postings),
+        key=lambda term: postings.upper_bounds[term] * query_counts[term],
+    )
+    if not terms or k <= 0:
+        return []
+
+    span_ids = [postings.postings[term][0] for term in terms]
+    tfs = [postings.postings[term][1] for term in terms]
+    weights = [postings.idf[term] * query_counts[term] for term in terms]
+    bounds = [postings.upper_bounds[term] * query_counts[term] for term in terms]
+    prefix_bounds: list[float] = []
+    total = 0.0
+    for bound in bounds:
+        total += bound
+        prefix_bounds.append(total)
+
+    def term_score(term_idx: int, pos: int) -> float:
+        span_idx = span_ids[term_idx][pos]
+        return bm25_term_score(
+            weights[term_idx],
+            tfs[term_idx][pos],
+            postings.span_lengths[span_idx],
+            postings.avg_span_length,
+        )
+
+    positions = [0] * len(terms)
+    heap: list[tuple[float, int]] = []
+    threshold = 0.0
+    first_essential = 0
+    while first_essential < len(terms):
+        candidate = min(
+            (
+                span_ids[idx][positions[idx]]
+                for idx in range(first_essential, len(terms))
+                if positions[idx] < len(span_ids[idx])
+            ),
+            default=None,
+        )
+        if candidate is None:
+            break
+
+        score = 0.0
+        for idx in range(first_essential, len(terms)):
+            pos = positions[idx]
+            if pos < len(span_ids[idx]) and span_ids[idx][pos] == candidate:
+                score += term_score(idx, pos)
+                positions[idx] = pos + 1
+        for idx in range(first_essential - 1, -1, -1):
+            if score + prefix_bounds[idx] <= threshold:
+                break
+            pos = bisect_left(span_ids[idx], candidate, positions[idx])
+            positions[idx] = pos
+            if pos < len(span_ids[idx]) and span_ids[idx][pos] == candidate:
+                score += term_score(idx, pos)
+
+        if len(heap) < k:
+            heapq.heappush(heap, (score, -candidate))
+        elif score > heap[0][0]:
+            heapq.heapreplace(heap, (score, -candidate))
+        if len(heap) == k:
+            threshold = heap[0][0]
+            while first_essential < len(terms) and prefix_bounds[first_essential] <= threshold:
+                first_essential += 1
+
+    return [(score, -neg_idx) for score, neg_idx in sorted(heap, reverse=True)]
+
+
+class PostingsRetriever(VectorlessRetriever):
+    """Content-aware retrieval over the span postings list.
+
+    The best-matching spans are rolled up to their section (or page) nodes, so the
+    work per query depends on the postings of the query terms rather than on the
+    number of nodes in the document.
+    """
+
+    def __init__(self, fallback: VectorlessRetriever) -> None:
+        self.fallback = fallback
+
+    def retrieve(self, artifact: IndexArtifact, request: QueryRequest) -> QueryResponse:
+        postings = artifact.postings
+        if postings is None:
+            return self.fallback.retrieve(artifact, request)
+
+        trace = QueryTrace(visited_nodes=[], decisions=[])
+        pages = artifact_pages(artifact)
+        with stage("postings_scan", pages=pages):
+            query_counts = Counter(tokenize(request.question))
+            top_spans = top_k_spans(postings, query_counts, request.top_k * SPANS_PER_RESULT)
+
+            node_scores: dict[int, float] = {}
+            node_spans: dict[int, list[int]] = {}
+            for score, span_idx in top_spans:
+                section_idx = postings.span_sections[span_idx]
+                page_idx = postings.span_pages[span_idx]
+                node_scores[section_idx] = node_scores.get(section_idx, 0.0) + score
+                node_spans.setdefault(section_idx, []).append(span_idx)
+                trace.visited_nodes.extend(
+                    node_id
+                    for node_id in (
+                        artifact.nodes[page_idx].node_id,
+                        artifact.nodes[section_idx].node_id,
+                    )
+                    if node_id not in trace.visited_nodes
+                )
+                trace.decisions.append(
+                    f"matched {artifact.spans[span_idx].span_id} score={score:.3f} "
+                    f"-> {artifact.nodes[section_idx].node_id}"
+                )
+
+        ranked = sorted(node_scores.items(), key=lambda item: item[1], reverse=True)
+        citations: list[Citation] = []
+        with stage("citations", pages=pages):
+            for node_idx, score in ranked[: request.top_k]:
+                node = artifact.nodes[node_idx]
+                span_texts = [
+                    artifact.spans[span_idx].text for span_idx in node_spans[node_idx][:2]
+                ]
+                citations.append(
+                    Citation(
+                        node_id=node.node_id,
+                        page=artifact.spans[node_spans[node_idx][0]].page,
+                        section=node.title,
+                        title=node.title,
+                        excerpt="\n".join(text for text in span_texts if text),
+                        score=score,
+                    )
+                )
+
+        answer = "\n".join(citation.excerpt for citation in citations if citation.excerpt)[:2000]
+        if not answer:
+            answer = "No relevant content found in the document."
+        return QueryResponse(answer=answer, citations=citations, trace=trace)
@@ -1,70 +1,345 @@
 from __future__ import annotations
 
-import json
+import os
 from pathlib import Path
+from typing import Any
 from uuid import UUID
 
-import boto3
+import anyio
 
 from vectorless_rag_service.config import settings
-from vectorless_rag_service.core.interfaces import ArtifactStore
+from vectorless_rag_service.core.interfaces import ArtifactStore, AsyncArtifactStore
 from vectorless_rag_service.core.models import IndexArtifact
+from vectorless_rag_service.observability.metrics import S3_ARTIFACT_FETCHES
+from vectorless_rag_service.observability.stages import artifact_pages, stage
+from vectorless_rag_service.storage.binary_codec import (
+    MappedArtifact,
+    RangedArtifact,
+    decode_artifact,
+    encode_artifact,
+)
+from vectorless_rag_service.storage.cache import ArtifactDiskCache, CachedArtifactStore
+from vectorless_rag_service.storage.compression import (
+    ZSTD_MAGIC,
+    Codec,
+    build_codec,
+    compress,
+    decompress,
+    detect_codec,
+)
+from vectorless_rag_service.storage.s3 import build_s3_client, is_missing_object
+
+ARTIFACT_FORMATS = {"json": "json", "binary": "vrsa"}
+
+
+def serialize_artifact(
+    artifact: IndexArtifact, artifact_format: str, codec: Codec | None = None
+) -> bytes:
+    with stage("serialize", pages=artifact_pages(artifact)):
+        if artifact_format == "binary":
+            data = encode_artifact(artifact)
+        else:
+            data = artifact.model_dump_json().encode("utf-8")
+        return compress(data, codec)
+
+
+def deserialize_artifact(data: bytes, artifact_format: str) -> IndexArtifact:
+    with stage("validate") as labels:
+        data = decompress(data)
+        if artifact_format == "binary":
+            artifact = decode_artifact(data)
+        else:
+            artifact = IndexArtifact.model_validate_json(data)
+        labels.pages = artifact_pages(artifact)
+    return artifact
+
+
+def read_artifact_file(path: Path, artifact_format: str) -> IndexArtifact:
+    if artifact_format == "binary":
+        with path.open("rb") as handle:
+            compressed = detect_codec(handle.read(len(ZSTD_MAGIC))) is not None
+        if not compressed:
+            with stage("validate") as labels, MappedArtifact.open(path) as mapped:
+                artifact = mapped.to_artifact()
+                labels.pages = artifact_pages(artifact)
+            return artifact
+    return deserialize_artifact(path.read_bytes(), artifact_format)
+
+
+def _check_format(artifact_format: str) -> None:
+    if artifact_format not in ARTIFACT_FORMATS:
+        raise ValueError(f"Unknown artifact format: {artifact_format}")
+
+
+def _read_order(artifact_format: str) -> list[str]:
+    # Prefer the configured format, but keep reading artifacts written in the other one.
+    return [artifact_format] + [f for f in ARTIFACT_FORMATS if f != artifact_format]
 
 
 class LocalArtifactStore(ArtifactStore):
-    def __init__(self, base_path: str) -> None:
+    def __init__(
+        self,
+        base_path: str,
+        artifact_format: str = "json",
+        compression: str = "none",
+        compression_level: int | None = None,
+    ) -> None:
+        _check_format(artifact_format)
         self.base_path = Path(base_path)
         self.base_path.mkdir(parents=True, exist_ok=True)
+        self.artifact_format = artifact_format
+        self.codec = build_codec(compression, compression_level)
+
+    def _path(self, document_id: UUID, artifact_format: str | None = None) -> Path:
+        extension = ARTIFACT_FORMATS[artifact_format or self.artifact_format]
+        return self.base_path / f"{document_id}.{extension}"
 
-    def _path(self, document_id: UUID) -> Path:
-        return self.base_path / f"{document_id}.json"
+    def _existing_path(self, document_id: UUID) -> tuple[Path, str] | None:
+        for artifact_format in _read_order(self.artifact_format):
+            path = self._path(document_id, artifact_format)
+            if path.exists():
+                return path, artifact_format
+        return None
 
     def put(self, document_id: UUID, artifact: IndexArtifact) -> str:
         path = self._path(document_id)
-        path.write_text(artifact.model_dump_json(indent=2))
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with stage("artifact_put", pages=artifact_pages(artifact), backend="local"):
+            tmp_path.write_bytes(serialize_artifact(artifact, self.artifact_format, self.codec))
+            # Atomic replace keeps existing memory maps of the previous version valid.
+            os.replace(tmp_path, path)
+        for artifact_format in ARTIFACT_FORMATS:
+            if artifact_format != self.artifact_format:
+                self._path(document_id, artifact_format).unlink(missing_ok=True)
         return str(path)
 
     def get(self, document_id: UUID) -> IndexArtifact:
-        path = self._path(document_id)
-        data = json.loads(path.read_text())
-        return IndexArtifact.model_validate(data)
+        with stage("artifact_get", backend="local") as labels:
+            found = self._existing_path(document_id)
+            if found is None:
+                raise FileNotFoundError(f"No artifact for document {document_id}")
+            artifact = read_artifact_file(*found)
+            labels.pages = artifact_pages(artifact)
+        return artifact
+
+    def open_mapped(self, document_id: UUID) -> MappedArtifact:
+        """Memory-map an uncompressed binary artifact for lazy node and span access."""
+        return MappedArtifact.open(self._path(document_id, "binary"))
 
     def exists(self, document_id: UUID) -> bool:
-        return self._path(document_id).exists()
+        return self._existing_path(document_id) is not None
+
+    def version(self, document_id: UUID) -> str | None:
+        found = self._existing_path(document_id)
+        if found is None:
+            return None
+        stat = found[0].stat()
+        return f"{found[1]}:{stat.st_mtime_ns}:{stat.st_size}"
 
 
 class S3ArtifactStore(ArtifactStore):
-    def __init__(self, bucket: str, endpoint: str | None) -> None:
+    """Artifacts stored as S3 objects, with an optional local read-through cache.
+
+    ``get`` is a single ``GetObject``. With a disk cache it is conditional on the
+    cached copy's ETag, so an unchanged artifact costs one round trip that returns
+    no body, and a missing one is reported by the same request. ``get_versioned``
+    can make it conditional on a version the caller already holds instead, and
+    reports the ETag it validated. Binary artifacts
+    can also be opened with ``open_ranged`` to fetch individual nodes and spans
+    with ranged reads instead of downloading the whole object.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint: str | None,
+        artifact_format: str = "json",
+        cache_path: str | None = None,
+        client: Any | None = None,
+        compression: str = "none",
+        compression_level: int | None = None,
+    ) -> None:
+        _check_format(artifact_format)
         self.bucket = bucket
-        self.client = boto3.client("s3", endpoint_url=endpoint)
+        self.client = client if client is not None else build_s3_client(endpoint)
+        self.artifact_format = artifact_format
+        self.codec = build_codec(compression, compression_level)
+        self.disk_cache = ArtifactDiskCache(cache_path) if cache_path else None
 
-    def _key(self, document_id: UUID) -> str:
-        return f"artifacts/{document_id}.json"
+    def _key(self, document_id: UUID, artifact_format: str | None = None) -> str:
+        extension = ARTIFACT_FORMATS[artifact_format or self.artifact_format]
+        return f"artifacts/{document_id}.{extension}"
 
     def put(self, document_id: UUID, artifact: IndexArtifact) -> str:
-        payload = artifact.model_dump_json(indent=2)
         key = self._key(document_id)
-        self.client.put_object(Bucket=self.bucket, Key=key, Body=payload.encode("utf-8"))
+        with stage("artifact_put", pages=artifact_pages(artifact), backend="s3"):
+            payload = serialize_artifact(artifact, self.artifact_format, self.codec)
+            self.client.put_object(Bucket=self.bucket, Key=key, Body=payload)
         return f"s3://{self.bucket}/{key}"
 
     def get(self, document_id: UUID) -> IndexArtifact:
-        key = self._key(document_id)
-        response = self.client.get_object(Bucket=self.bucket, Key=key)
-        data = json.loads(response["Body"].read().decode("utf-8"))
-        return IndexArtifact.model_validate(data)
+        artifact, _ = self.get_versioned(document_id)
+        if artifact is None:
+            # Only returned for a known version, and none was passed.
+            raise FileNotFoundError(f"No artifact for document {document_id}")
+        return artifact
 
-    def exists(self, document_id: UUID) -> bool:
-        key = self._key(document_id)
+    def get_versioned(
+        self, document_id: UUID, known_version: str | None = None
+    ) -> tuple[IndexArtifact | None, str | None]:
+        """One ``GetObject`` per format tried, conditional on ``known_version`` if given,
+        else on the disk cache's ETag. The ETag it validated is the version."""
+        with stage("artifact_get", backend="s3") as labels:
+            for artifact_format in _read_order(self.artifact_format):
+                key = self._key(document_id, artifact_format)
+                fetched = self._fetch(key, artifact_format, known_version)
+                if fetched is not None:
+                    if fetched[0] is not None:
+                        labels.pages = artifact_pages(fetched[0])
+                    return fetched
+            raise FileNotFoundError(f"No artifact for document {document_id}")
+
+    def _fetch(
+        self, key: str, artifact_format: str, known_version: str | None = None
+    ) -> tuple[IndexArtifact | None, str] | None:
+        cached = self.disk_cache.lookup(key) if self.disk_cache is not None else None
+        etag = known_version or (cached[0] if cached is not None else None)
+        conditions = {"IfNoneMatch": etag} if etag is not None else {}
         try:
-            self.client.head_object(Bucket=self.bucket, Key=key)
-            return True
-        except Exception:
-            return False
+            response = self.client.get_object(Bucket=self.bucket, Key=key, **conditions)
+        except self.client.exceptions.NoSuchKey:
+            S3_ARTIFACT_FETCHES.labels("missing").inc()
+            if self.disk_cache is not None:
+                self.disk_cache.evict(key)
+            return None
+        except self.client.exceptions.ClientError as exc:
+            if etag is None or exc.response["Error"]["Code"] not in ("304", "NotModified"):
+                raise
+            S3_ARTIFACT_FETCHES.labels("not_modified").inc()
+            if etag == known_version:
+                return None, etag
+            if cached is None or self.disk_cache is None:
+                raise
+            try:
+                return read_artifact_file(cached[1], artifact_format), etag
+            except FileNotFoundError:
+                # Replaced by another process after the lookup; fetch it unconditionally.
+                self.disk_cache.evict(key)
+                return self._fetch(key, artifact_format)
+        S3_ARTIFACT_FETCHES.labels("downloaded").inc()
+        if self.disk_cache is None:
+            return deserialize_artifact(response["Body"].read(), artifact_format), response["ETag"]
+        path = self.disk_cache.store(key, response["ETag"], response["Body"])
+        return read_artifact_file(path, artifact_format), response["ETag"]
+
+    def open_ranged(self, document_id: UUID) -> RangedArtifact:
+        """Open an uncompressed binary artifact for lazy access over ranged GETs.
+
+        Every range is requested with ``If-Match`` on the ETag seen when opening, so
+        an artifact rewritten mid-read fails with a ``PreconditionFailed`` error
+        instead of mixing bytes from two versions.
+        """
+        key = self._key(document_id, "binary")
+        try:
+            head = self.client.head_object(Bucket=self.bucket, Key=key)
+        except self.client.exceptions.ClientError as exc:
+            if not is_missing_object(self.client, exc):
+                raise
+            raise FileNotFoundError(f"No binary artifact for document {document_id}") from exc
+        etag = head["ETag"]
+
+        def read_range(offset: int, length: int) -> bytes:
+            response = self.client.get_object(
+                Bucket=self.bucket,
+                Key=key,
+                Range=f"bytes={offset}-{offset + length - 1}",
+                IfMatch=etag,
+            )
+            return response["Body"].read()
+
+        return RangedArtifact(read_range, head["ContentLength"])
+
+    def exists(self, document_id: UUID) -> bool:
+        return self.version(document_id) is not None
+
+    def version(self, document_id: UUID) -> str | None:
+        for artifact_format in _read_order(self.artifact_format):
+            key = self._key(document_id, artifact_format)
+            try:
+                return self.client.head_object(Bucket=self.bucket, Key=key)["ETag"]
+            except self.client.exceptions.ClientError as exc:
+                if not is_missing_object(self.client, exc):
+                    raise
+        return None
+
+
+class ThreadedArtifactStore(AsyncArtifactStore):
+    """Async facade that runs a blocking ``ArtifactStore`` on worker threads.
+
+    Disk and boto3 calls, plus artifact decoding, happen off the event loop. The
+    capacity limiter bounds how many of them run at once so a slow backend cannot
+    exhaust the shared thread pool.
+    """
+
+    def __init__(self, inner: ArtifactStore, max_threads: int = 16) -> None:
+        self.inner = inner
+        self.limiter = anyio.CapacityLimiter(max_threads)
+
+    async def put(self, document_id: UUID, artifact: IndexArtifact) -> str:
+        return await anyio.to_thread.run_sync(
+            self.inner.put, document_id, artifact, limiter=self.limiter
+        )
+
+    async def get(self, document_id: UUID) -> IndexArtifact:
+        return await anyio.to_thread.run_sync(self.inner.get, document_id, limiter=self.limiter)
+
+    async def exists(self, document_id: UUID) -> bool:
+        return await anyio.to_thread.run_sync(self.inner.exists, document_id, limiter=self.limiter)
+
+    async def version(self, document_id: UUID) -> str | None:
+        return await anyio.to_thread.run_sync(self.inner.version, document_id, limiter=self.limiter)
+
+    async def get_versioned(
+        self, document_id: UUID, known_version: str | None = None
+    ) -> tuple[IndexArtifact | None, str | None]:
+        return await anyio.to_thread.run_sync(
+            self.inner.get_versioned, document_id, known_version, limiter=self.limiter
+        )
+
+
+def default_compression(artifact_format: str) -> str:
+    # A compressed binary artifact has to be decompressed whole, which rules out
+    # memory-mapping it and reading single nodes with ranged GETs.
+    return "none" if artifact_format == "binary" else "gzip"
 
 
 def build_artifact_store() -> ArtifactStore:
+    store: ArtifactStore
+    compression = settings.storage.artifact_compression or default_compression(
+        settings.storage.artifact_format
+    )
     if settings.storage.provider == "s3":
         if settings.storage.s3_bucket is None:
             raise ValueError("S3 bucket must be set")
-        return S3ArtifactStore(settings.storage.s3_bucket, settings.storage.s3_endpoint)
-    return LocalArtifactStore(settings.storage.local_path)
+        store = S3ArtifactStore(
+            settings.storage.s3_bucket,
+            settings.storage.s3_endpoint,
+            artifact_format=settings.storage.artifact_format,
+            cache_path=settings.storage.s3_cache_path,
+            compression=compression,
+            compression_level=settings.storage.artifact_compression_level,
+        )
+    else:
+        store = LocalArtifactStore(
+            settings.storage.local_path,
+            artifact_format=settings.storage.artifact_format,
+            compression=compression,
+            compression_level=settings.storage.artifact_compression_level,
+        )
+    if settings.artifact_cache.enabled:
+        store = CachedArtifactStore(
+            store,
+            max_entries=settings.artifact_cache.max_entries,
+            max_bytes=settings.artifact_cache.max_bytes,
+        )
+    return store
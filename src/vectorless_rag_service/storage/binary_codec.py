@@ -0,0 +1,599 @@
+"""Versioned binary encoding for index artifacts.
+
+Layout (little-endian)::
+
+    header          magic, version, counts and section offsets (``HEADER``)
+    sections        term and postings counts and offsets (``SECTIONS``)
+    meta            JSON object with the document id and artifact-level extra fields
+    node table      one fixed-size ``NODE_ROW`` per node
+    span table      one fixed-size ``SPAN_ROW`` per span
+    refs            uint32 array holding node span indexes and child node indexes
+    terms           one ``TERM_ROW`` per term, sorted by the term's UTF-8 bytes
+    span postings   ``POSTING`` (span index, tf) rows, grouped by term
+    node postings   ``POSTING`` (node index, tf) rows, grouped by term
+    span stats      one ``SPAN_STAT`` (length, section, page) per span
+    node stats      one ``NODE_STAT`` (flags, length) per node
+    heap            UTF-8 string heap referenced by (offset, length) pairs
+
+Fixed-size rows make it possible to read a single node or span straight out of a
+memory-mapped file, or with a few ranged reads of a remote object, without decoding
+the rest of the artifact. The span postings and the node term statistics share the
+term dictionary. A term's postings are found by binary search over the term rows,
+so opening an artifact reads only the header and the small metadata object.
+
+Version 1 artifacts kept the postings and term statistics in the metadata JSON.
+They are still read.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from vectorless_rag_service.core.models import (
+    IndexArtifact,
+    IndexNode,
+    SpanPostings,
+    TermStatistics,
+    TextSpan,
+)
+
+MAGIC = b"VRSA"
+FORMAT_VERSION = 2
+READABLE_VERSIONS = {1, FORMAT_VERSION}
+
+HEADER = struct.Struct("<4sHHIIQQQQQQQQ")
+SECTIONS = struct.Struct("<3I5Q")
+NODE_ROW = struct.Struct("<15I")
+SPAN_ROW = struct.Struct("<7I")
+REF = struct.Struct("<I")
+# Term (offset, length), flags, span postings (start, count), node postings
+# (start, count), span idf, span upper bound, node idf.
+TERM_ROW = struct.Struct("<7I3d")
+POSTING = struct.Struct("<2I")
+SPAN_STAT = struct.Struct("<I2i")
+NODE_STAT = struct.Struct("<2I")
+
+# TERM_ROW flags: the term has span postings, a node-level idf.
+IN_POSTINGS = 1
+IN_NODE_IDF = 2
+# NODE_STAT flags: the node has an entry in ``node_lengths``, in ``term_freqs``.
+HAS_LENGTH = 1
+HAS_TERM_FREQS = 2
+
+NO_STRING = 0xFFFFFFFF
+NODE_FIELDS = {
+    "node_id",
+    "parent_id",
+    "title",
+    "level",
+    "page_start",
+    "page_end",
+    "text_span_ids",
+    "children",
+}
+SPAN_FIELDS = {"span_id", "page", "text"}
+ARTIFACT_FIELDS = {"document_id", "nodes", "spans", "term_stats", "postings"}
+
+
+class ArtifactFormatError(ValueError):
+    pass
+
+
+def is_binary_artifact(data: bytes) -> bool:
+    return data[: len(MAGIC)] == MAGIC
+
+
+class _Heap:
+    def __init__(self) -> None:
+        self.buffer = bytearray()
+        self.offsets: dict[str, tuple[int, int]] = {}
+
+    def add(self, value: str | None) -> tuple[int, int]:
+        if value is None:
+            return NO_STRING, 0
+        ref = self.offsets.get(value)
+        if ref is None:
+            encoded = value.encode("utf-8")
+            ref = (len(self.buffer), len(encoded))
+            self.buffer.extend(encoded)
+            self.offsets[value] = ref
+        return ref
+
+    def add_extra(self, model: Any, core_fields: set[str]) -> tuple[int, int]:
+        extra = model.model_dump(mode="json", exclude=core_fields)
+        if not extra:
+            return NO_STRING, 0
+        return self.add(json.dumps(extra, separators=(",", ":")))
+
+
+def _pack(values: list[int]) -> bytes:
+    return struct.pack(f"<{len(values)}I", *values)
+
+
+def _node_ref(node_index: dict[str, int], node_id: str) -> int:
+    try:
+        return node_index[node_id]
+    except KeyError:
+        raise ArtifactFormatError(f"term statistics reference unknown node {node_id}") from None
+
+
+def _encode_terms(
+    artifact: IndexArtifact, node_index: dict[str, int], heap: _Heap
+) -> tuple[list[bytes], tuple[int, int, int]]:
+    """Encode the span postings and node term statistics as a shared term dictionary.
+
+    Returns the terms, span postings, node postings, span stats and node stats
+    sections, and the term, span posting and node posting counts.
+    """
+    postings = artifact.postings
+    stats = artifact.term_stats
+    span_postings = postings.postings if postings is not None else {}
+    node_postings: dict[str, list[int]] = {}
+    node_stats = [[0, 0] for _ in artifact.nodes]
+    if stats is not None:
+        for node_id, freqs in stats.term_freqs.items():
+            node_idx = _node_ref(node_index, node_id)
+            node_stats[node_idx][0] |= HAS_TERM_FREQS
+            for term, tf in freqs.items():
+                node_postings.setdefault(term, []).extend((node_idx, tf))
+        for node_id, length in stats.node_lengths.items():
+            node_idx = _node_ref(node_index, node_id)
+            node_stats[node_idx][0] |= HAS_LENGTH
+            node_stats[node_idx][1] = length
+    node_idf = stats.idf if stats is not None else {}
+
+    # Code point order is UTF-8 byte order, so readers can compare decoded terms.
+    terms = sorted(span_postings.keys() | node_postings.keys() | node_idf.keys())
+    term_rows = bytearray()
+    span_values: list[int] = []
+    node_values: list[int] = []
+    for term in terms:
+        flags = 0
+        span_start, node_start = len(span_values) // 2, len(node_values) // 2
+        span_idf = upper_bound = 0.0
+        if postings is not None and term in postings.postings:
+            flags |= IN_POSTINGS
+            span_ids, tfs = postings.postings[term]
+            for span_idx, tf in zip(span_ids, tfs, strict=True):
+                span_values += (span_idx, tf)
+            try:
+                span_idf, upper_bound = postings.idf[term], postings.upper_bounds[term]
+            except KeyError as exc:
+                raise ArtifactFormatError(f"postings have no statistics for term {exc}") from exc
+        node_values += node_postings.get(term, ())
+        if term in node_idf:
+            flags |= IN_NODE_IDF
+        term_rows += TERM_ROW.pack(
+            *heap.add(term),
+            flags,
+            span_start,
+            len(span_values) // 2 - span_start,
+            node_start,
+            len(node_values) // 2 - node_start,
+            span_idf,
+            upper_bound,
+            node_idf.get(term, 0.0),
+        )
+
+    span_stats = bytearray()
+    if postings is not None:
+        columns = (postings.span_lengths, postings.span_sections, postings.span_pages)
+        if any(len(column) != len(artifact.spans) for column in columns):
+            raise ArtifactFormatError("postings span statistics do not match the spans")
+        for row in zip(*columns, strict=True):
+            span_stats += SPAN_STAT.pack(*row)
+    node_stat_bytes = b"".join(NODE_STAT.pack(*row) for row in node_stats)
+    sections = [bytes(term_rows), _pack(span_values), _pack(node_values)]
+    sections += [bytes(span_stats), node_stat_bytes]
+    return sections, (len(terms), len(span_values) // 2, len(node_values) // 2)
+
+
+def encode_artifact(artifact: IndexArtifact) -> bytes:
+    span_index = {span.span_id: idx for idx, span in enumerate(artifact.spans)}
+    node_index = {node.node_id: idx for idx, node in enumerate(artifact.nodes)}
+    heap = _Heap()
+    refs: list[int] = []
+
+    node_rows = bytearray()
+    for node in artifact.nodes:
+        try:
+            span_refs = [span_index[span_id] for span_id in node.text_span_ids]
+            child_refs = [node_index[child_id] for child_id in node.children]
+        except KeyError as exc:
+            raise ArtifactFormatError(f"node {node.node_id} references unknown id {exc}") from exc
+        spans_start = len(refs)
+        refs.extend(span_refs)
+        children_start = len(refs)
+        refs.extend(child_refs)
+        node_rows += NODE_ROW.pack(
+            *heap.add(node.node_id),
+            *heap.add(node.parent_id),
+            *heap.add(node.title),
+            node.level,
+            node.page_start,
+            node.page_end,
+            spans_start,
+            len(span_refs),
+            children_start,
+            len(child_refs),
+            *heap.add_extra(node, NODE_FIELDS),
+        )
+
+    span_rows = bytearray()
+    for span in artifact.spans:
+        span_rows += SPAN_ROW.pack(
+            *heap.add(span.span_id),
+            span.page,
+            *heap.add(span.text),
+            *heap.add_extra(span, SPAN_FIELDS),
+        )
+
+    term_sections, term_counts = _encode_terms(artifact, node_index, heap)
+    meta = json.dumps(
+        {
+            "document_id": str(artifact.document_id),
+            "extra": artifact.model_dump(mode="json", exclude=ARTIFACT_FIELDS),
+            # Scalars only; the per-term and per-span data live in their own sections.
+            "postings": None
+            if artifact.postings is None
+            else {"avg_span_length": artifact.postings.avg_span_length},
+            "term_stats": None
+            if artifact.term_stats is None
+            else {"avg_length": artifact.term_stats.avg_length},
+        },
+        separators=(",", ":"),
+    ).encode("utf-8")
+    ref_bytes = _pack(refs)
+
+    meta_offset = HEADER.size + SECTIONS.size
+    node_offset = meta_offset + len(meta)
+    span_offset = node_offset + len(node_rows)
+    refs_offset = span_offset + len(span_rows)
+    section_offsets = []
+    offset = refs_offset + len(ref_bytes)
+    for section in term_sections:
+        section_offsets.append(offset)
+        offset += len(section)
+    heap_offset = offset
+    header = HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        0,
+        len(artifact.nodes),
+        len(artifact.spans),
+        meta_offset,
+        len(meta),
+        node_offset,
+        span_offset,
+        refs_offset,
+        len(refs),
+        heap_offset,
+        len(heap.buffer),
+    )
+    sections = SECTIONS.pack(*term_counts, *section_offsets)
+    return b"".join(
+        [header, sections, meta, node_rows, span_rows, ref_bytes, *term_sections, heap.buffer]
+    )
+
+
+class MappedArtifact:
+    """Lazy reader over an encoded artifact held in memory or memory-mapped from disk.
+
+    Nodes, spans and the postings of a term are decoded on access. Nothing is
+    materialized up front except the header and the artifact-level metadata.
+    """
+
+    def __init__(self, buffer: bytes | mmap.mmap, mapping: mmap.mmap | None = None) -> None:
+        self._buffer = buffer
+        self._mapping = mapping
+        self._load_header(len(buffer))
+
+    def _read(self, offset: int, length: int) -> bytes:
+        return bytes(self._buffer[offset : offset + length])
+
+    def _load_header(self, size: int) -> None:
+        header = self._read(0, HEADER.size) if size >= HEADER.size else b""
+        if len(header) < HEADER.size or not is_binary_artifact(header):
+            raise ArtifactFormatError("not a binary index artifact")
+        (
+            _,
+            version,
+            _,
+            self.node_count,
+            self.span_count,
+            meta_offset,
+            meta_length,
+            self._node_offset,
+            self._span_offset,
+            self._refs_offset,
+            _,
+            self._heap_offset,
+            _,
+        ) = HEADER.unpack(header)
+        if version not in READABLE_VERSIONS:
+            raise ArtifactFormatError(f"unsupported artifact format version {version}")
+        meta = json.loads(self._read(meta_offset, meta_length))
+        self.document_id = UUID(meta["document_id"])
+        self.extra: dict[str, Any] = meta["extra"]
+        self._node_ids: dict[str, int] | None = None
+        self._span_ids: dict[str, int] | None = None
+        if version == 1:
+            self.term_count = 0
+            self._legacy_postings: dict[str, Any] | None = self.extra.pop("postings", None)
+            self._legacy_term_stats: dict[str, Any] | None = self.extra.pop("term_stats", None)
+            self._postings_meta: dict[str, float] | None = None
+            self._term_stats_meta: dict[str, float] | None = None
+            return
+        (
+            self.term_count,
+            self._span_posting_count,
+            self._node_posting_count,
+            self._terms_offset,
+            self._span_postings_offset,
+            self._node_postings_offset,
+            self._span_stats_offset,
+            self._node_stats_offset,
+        ) = SECTIONS.unpack(self._read(HEADER.size, SECTIONS.size))
+        self._legacy_postings = self._legacy_term_stats = None
+        self._postings_meta = meta["postings"]
+        self._term_stats_meta = meta["term_stats"]
+
+    @classmethod
+    def open(cls, path: str | Path) -> MappedArtifact:
+        with open(path, "rb") as handle:
+            mapping = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(mapping, mapping)
+        except Exception:
+            mapping.close()
+            raise
+
+    def close(self) -> None:
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
+
+    def __enter__(self) -> MappedArtifact:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _string(self, offset: int, length: int) -> str:
+        return self._read(self._heap_offset + offset, length).decode("utf-8")
+
+    def _optional_string(self, offset: int, length: int) -> str | None:
+        return None if offset == NO_STRING else self._string(offset, length)
+
+    def _extra(self, offset: int, length: int) -> dict[str, Any]:
+        return {} if offset == NO_STRING else json.loads(self._string(offset, length))
+
+    def _refs(self, start: int, count: int) -> tuple[int, ...]:
+        data = self._read(self._refs_offset + start * REF.size, count * REF.size)
+        return struct.unpack(f"<{count}I", data)
+
+    def _node_row(self, index: int) -> tuple[int, ...]:
+        if not 0 <= index < self.node_count:
+            raise IndexError(index)
+        return NODE_ROW.unpack(self._read(self._node_offset + index * NODE_ROW.size, NODE_ROW.size))
+
+    def _span_row(self, index: int) -> tuple[int, ...]:
+        if not 0 <= index < self.span_count:
+            raise IndexError(index)
+        return SPAN_ROW.unpack(self._read(self._span_offset + index * SPAN_ROW.size, SPAN_ROW.size))
+
+    def node_id_at(self, index: int) -> str:
+        row = self._node_row(index)
+        return self._string(row[0], row[1])
+
+    def span_id_at(self, index: int) -> str:
+        row = self._span_row(index)
+        return self._string(row[0], row[1])
+
+    def node_at(self, index: int) -> IndexNode:
+        row = self._node_row(index)
+        return IndexNode(
+            node_id=self._string(row[0], row[1]),
+            parent_id=self._optional_string(row[2], row[3]),
+            title=self._string(row[4], row[5]),
+            level=row[6],
+            page_start=row[7],
+            page_end=row[8],
+            text_span_ids=[self.span_id_at(ref) for ref in self._refs(row[9], row[10])],
+            children=[self.node_id_at(ref) for ref in self._refs(row[11], row[12])],
+            **self._extra(row[13], row[14]),
+        )
+
+    def span_at(self, index: int) -> TextSpan:
+        row = self._span_row(index)
+        return TextSpan(
+            span_id=self._string(row[0], row[1]),
+            page=row[2],
+            text=self._string(row[3], row[4]),
+            **self._extra(row[5], row[6]),
+        )
+
+    def _term_row(self, index: int) -> tuple[Any, ...]:
+        return TERM_ROW.unpack(
+            self._read(self._terms_offset + index * TERM_ROW.size, TERM_ROW.size)
+        )
+
+    def _term_rows(self) -> list[tuple[Any, ...]]:
+        data = self._read(self._terms_offset, self.term_count * TERM_ROW.size)
+        return list(TERM_ROW.iter_unpack(data))
+
+    def _find_term(self, term: str) -> tuple[Any, ...] | None:
+        low, high = 0, self.term_count
+        while low < high:
+            mid = (low + high) // 2
+            row = self._term_row(mid)
+            found = self._string(row[0], row[1])
+            if found == term:
+                return row
+            if found < term:
+                low = mid + 1
+            else:
+                high = mid
+        return None
+
+    def _postings(self, offset: int, start: int, count: int) -> tuple[int, ...]:
+        data = self._read(offset + start * POSTING.size, count * POSTING.size)
+        return struct.unpack(f"<{2 * count}I", data)
+
+    def term_postings(self, term: str) -> tuple[list[int], list[int]] | None:
+        """Span indexes and frequencies of ``term``, read without loading other terms."""
+        if self._legacy_postings is not None:
+            entry = self._legacy_postings["postings"].get(term)
+            return None if entry is None else (list(entry[0]), list(entry[1]))
+        row = self._find_term(term) if self._postings_meta is not None else None
+        if row is None or not row[2] & IN_POSTINGS:
+            return None
+        values = self._postings(self._span_postings_offset, row[3], row[4])
+        return list(values[0::2]), list(values[1::2])
+
+    def span_postings(self) -> SpanPostings | None:
+        if self._legacy_postings is not None:
+            return SpanPostings.model_validate(self._legacy_postings)
+        if self._postings_meta is None:
+            return None
+        values = self._postings(self._span_postings_offset, 0, self._span_posting_count)
+        span_ids, tfs = values[0::2], values[1::2]
+        postings: dict[str, tuple[list[int], list[int]]] = {}
+        idf: dict[str, float] = {}
+        upper_bounds: dict[str, float] = {}
+        for row in self._term_rows():
+            if not row[2] & IN_POSTINGS:
+                continue
+            term = self._string(row[0], row[1])
+            start, end = row[3], row[3] + row[4]
+            postings[term] = (list(span_ids[start:end]), list(tfs[start:end]))
+            idf[term], upper_bounds[term] = row[7], row[8]
+        data = self._read(self._span_stats_offset, self.span_count * SPAN_STAT.size)
+        stats = list(SPAN_STAT.iter_unpack(data))
+        # Decoded from well-typed sections; skip re-validating every posting list.
+        return SpanPostings.model_construct(
+            avg_span_length=self._postings_meta["avg_span_length"],
+            span_lengths=[row[0] for row in stats],
+            span_sections=[row[1] for row in stats],
+            span_pages=[row[2] for row in stats],
+            idf=idf,
+            upper_bounds=upper_bounds,
+            postings=postings,
+        )
+
+    def term_statistics(self) -> TermStatistics | None:
+        if self._legacy_term_stats is not None:
+            return TermStatistics.model_validate(self._legacy_term_stats)
+        if self._term_stats_meta is None:
+            return None
+        node_ids = [self.node_id_at(idx) for idx in range(self.node_count)]
+        data = self._read(self._node_stats_offset, self.node_count * NODE_STAT.size)
+        term_freqs: dict[str, dict[str, int]] = {}
+        node_lengths: dict[str, int] = {}
+        for node_id, (flags, length) in zip(node_ids, NODE_STAT.iter_unpack(data), strict=True):
+            if flags & HAS_TERM_FREQS:
+                term_freqs[node_id] = {}
+            if flags & HAS_LENGTH:
+                node_lengths[node_id] = length
+        values = self._postings(self._node_postings_offset, 0, self._node_posting_count)
+        idf: dict[str, float] = {}
+        for row in self._term_rows():
+            if not row[6] and not row[2] & IN_NODE_IDF:
+                continue
+            term = self._string(row[0], row[1])
+            for pos in range(row[5], row[5] + row[6]):
+                term_freqs[node_ids[values[2 * pos]]][term] = values[2 * pos + 1]
+            if row[2] & IN_NODE_IDF:
+                idf[term] = row[9]
+        return TermStatistics.model_construct(
+            avg_length=self._term_stats_meta["avg_length"],
+            idf=idf,
+            node_lengths=node_lengths,
+            term_freqs=term_freqs,
+        )
+
+    def get_node(self, node_id: str) -> IndexNode:
+        if self._node_ids is None:
+            self._node_ids = {self.node_id_at(idx): idx for idx in range(self.node_count)}
+        return self.node_at(self._node_ids[node_id])
+
+    def get_span(self, span_id: str) -> TextSpan:
+        if self._span_ids is None:
+            self._span_ids = {self.span_id_at(idx): idx for idx in range(self.span_count)}
+        return self.span_at(self._span_ids[span_id])
+
+    def iter_nodes(self) -> Iterator[IndexNode]:
+        for idx in range(self.node_count):
+            yield self.node_at(idx)
+
+    def iter_spans(self) -> Iterator[TextSpan]:
+        for idx in range(self.span_count):
+            yield self.span_at(idx)
+
+    def to_artifact(self) -> IndexArtifact:
+        return IndexArtifact(
+            document_id=self.document_id,
+            nodes=list(self.iter_nodes()),
+            spans=list(self.iter_spans()),
+            term_stats=self.term_statistics(),
+            postings=self.span_postings(),
+            **self.extra,
+        )
+
+
+class RangedArtifact(MappedArtifact):
+    """Lazy reader that fetches byte ranges of a remote artifact on demand.
+
+    ``read_range(offset, length)`` is called for the header and metadata, then for
+    the rows and strings of the nodes and spans actually accessed. Small reads go
+    through an LRU of fixed-size blocks so neighbouring rows share one request.
+    """
+
+    def __init__(
+        self,
+        read_range: Callable[[int, int], bytes],
+        size: int,
+        block_size: int = 64 * 1024,
+        max_blocks: int = 64,
+    ) -> None:
+        self._read_range = read_range
+        self._size = size
+        self.block_size = block_size
+        self.max_blocks = max_blocks
+        self._blocks: OrderedDict[int, bytes] = OrderedDict()
+        self._mapping = None
+        self._load_header(size)
+
+    def _read(self, offset: int, length: int) -> bytes:
+        if length <= 0:
+            return b""
+        if length > self.block_size:
+            return self._read_range(offset, length)
+        first = offset // self.block_size
+        last = (offset + length - 1) // self.block_size
+        missing = [block for block in range(first, last + 1) if block not in self._blocks]
+        if missing:
+            start = missing[0] * self.block_size
+            end = min((missing[-1] + 1) * self.block_size, self._size)
+            data = self._read_range(start, end - start)
+            for block in missing:
+                begin = (block - missing[0]) * self.block_size
+                self._blocks[block] = data[begin : begin + self.block_size]
+        chunk = b"".join(self._blocks[block] for block in range(first, last + 1))
+        for block in range(first, last + 1):
+            self._blocks.move_to_end(block)
+        while len(self._blocks) > self.max_blocks:
+            self._blocks.popitem(last=False)
+        start = offset - first * self.block_size
+        return chunk[start : start + length]
+
+
+def decode_artifact(data: bytes) -> IndexArtifact:
+    return MappedArtifact(data).to_artifact()
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import os
+import shutil
+from pathlib import Path
+from typing import IO
+
+from vectorless_rag_service.config import settings
+from vectorless_rag_service.core.interfaces import BlobStore
+from vectorless_rag_service.storage.s3 import build_s3_client, is_missing_object
+
+
+class LocalBlobStore(BlobStore):
+    def __init__(self, base_path: str) -> None:
+        self.base_path = Path(base_path)
+        self.base_path.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.base_path / key
+
+    def put_file(self, key: str, path: Path) -> str:
+        target = self._path(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_suffix(target.suffix + ".tmp")
+        shutil.copyfile(path, tmp_path)
+        os.replace(tmp_path, target)
+        return str(target)
+
+    def open(self, key: str) -> IO[bytes]:
+        return self._path(key).open("rb")
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).exists()
+
+
+class S3BlobStore(BlobStore):
+    def __init__(self, bucket: str, endpoint: str | None, prefix: str = "blobs/") -> None:
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = build_s3_client(endpoint)
+
+    def put_file(self, key: str, path: Path) -> str:
+        # upload_file streams from disk and switches to multipart uploads for large blobs.
+        self.client.upload_file(str(path), self.bucket, self.prefix + key)
+        return f"s3://{self.bucket}/{self.prefix}{key}"
+
+    def open(self, key: str) -> IO[bytes]:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self.prefix + key)
+        except self.client.exceptions.NoSuchKey as exc:
+            raise FileNotFoundError(f"No blob {key}") from exc
+        return response["Body"]
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.prefix + key)
+        except self.client.exceptions.ClientError as exc:
+            if not is_missing_object(self.client, exc):
+                raise
+            return False
+        return True
+
+
+def build_blob_store() -> BlobStore:
+    if settings.storage.provider == "s3":
+        if settings.storage.s3_bucket is None:
+            raise ValueError("S3 bucket must be set")
+        return S3BlobStore(settings.storage.s3_bucket, settings.storage.s3_endpoint)
+    return LocalBlobStore(settings.storage.blob_path)
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO
+from uuid import UUID
+
+from vectorless_rag_service.core.interfaces import ArtifactStore
+from vectorless_rag_service.core.models import IndexArtifact
+from vectorless_rag_service.observability.metrics import (
+    ARTIFACT_CACHE_BYTES,
+    ARTIFACT_CACHE_ENTRIES,
+    ARTIFACT_CACHE_EVICTIONS,
+    ARTIFACT_CACHE_HITS,
+    ARTIFACT_CACHE_MISSES,
+)
+
+# Rough per-object overhead of the parsed pydantic models, used for size accounting.
+_NODE_OVERHEAD_BYTES = 512
+_SPAN_OVERHEAD_BYTES = 256
+_COPY_CHUNK_BYTES = 1024 * 1024
+
+
+@dataclass
+class _Entry:
+    artifact: IndexArtifact
+    size: int
+    version: str | None
+
+
+def estimate_artifact_bytes(artifact: IndexArtifact) -> int:
+    size = 0
+    for node in artifact.nodes:
+        size += _NODE_OVERHEAD_BYTES + len(node.node_id) + len(node.title)
+        size += sum(len(span_id) for span_id in node.text_span_ids)
+        size += sum(len(child_id) for child_id in node.children)
+    for span in artifact.spans:
+        size += _SPAN_OVERHEAD_BYTES + len(span.span_id) + len(span.text)
+    return size
+
+
+class CachedArtifactStore(ArtifactStore):
+    """LRU cache of parsed artifacts in front of another ``ArtifactStore``.
+
+    The cache is bounded both by entry count and by the approximate in-memory size
+    of the cached artifacts. Writing an artifact through the cache invalidates the
+    cached copy for that document. When the inner store reports artifact versions,
+    every read revalidates the cached entry through the inner ``get_versioned`` (one
+    conditional request for S3), which catches artifacts rewritten by other
+    processes such as indexing workers.
+    """
+
+    def __init__(self, inner: ArtifactStore, max_entries: int, max_bytes: int) -> None:
+        self.inner = inner
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[UUID, _Entry] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def put(self, document_id: UUID, artifact: IndexArtifact) -> str:
+        uri = self.inner.put(document_id, artifact)
+        self.invalidate(document_id)
+        return uri
+
+    def get(self, document_id: UUID) -> IndexArtifact:
+        artifact, _ = self.get_versioned(document_id)
+        if artifact is None:
+            raise FileNotFoundError(f"No artifact for document {document_id}")
+        return artifact
+
+    def get_versioned(
+        self, document_id: UUID, known_version: str | None = None
+    ) -> tuple[IndexArtifact | None, str | None]:
+        """Revalidate a cached copy with the inner store's ``get_versioned``.
+
+        Only a changed artifact is read and parsed again.
+        """
+        with self._lock:
+            entry = self._entries.get(document_id)
+        if entry is not None and entry.version is None:
+            # The inner store has no versions, so there is nothing to revalidate.
+            artifact, version = None, None
+        else:
+            artifact, version = self.inner.get_versioned(
+                document_id, entry.version if entry is not None else None
+            )
+        if artifact is None and entry is not None:
+            ARTIFACT_CACHE_HITS.inc()
+            with self._lock:
+                if document_id in self._entries:
+                    self._entries.move_to_end(document_id)
+            artifact = entry.artifact
+        elif artifact is not None:
+            ARTIFACT_CACHE_MISSES.inc()
+            self._store(document_id, artifact, version)
+        if known_version is not None and version == known_version:
+            return None, version
+        return artifact, version
+
+    def exists(self, document_id: UUID) -> bool:
+        with self._lock:
+            if document_id in self._entries:
+                return True
+        return self.inner.exists(document_id)
+
+    def version(self, document_id: UUID) -> str | None:
+        return self.inner.version(document_id)
+
+    def invalidate(self, document_id: UUID) -> None:
+        with self._lock:
+            entry = self._entries.pop(document_id, None)
+            if entry is not None:
+                self._bytes -= entry.size
+            self._update_gauges()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._update_gauges()
+
+    def _store(self, document_id: UUID, artifact: IndexArtifact, version: str | None) -> None:
+        size = estimate_artifact_bytes(artifact)
+        if size > self.max_bytes or self.max_entries <= 0:
+            return
+        with self._lock:
+            previous = self._entries.pop(document_id, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._entries[document_id] = _Entry(artifact, size, version)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                ARTIFACT_CACHE_EVICTIONS.inc()
+            self._update_gauges()
+
+    def _update_gauges(self) -> None:
+        ARTIFACT_CACHE_ENTRIES.set(len(self._entries))
+        ARTIFACT_CACHE_BYTES.set(self._bytes)
+
+
+class ArtifactDiskCache:
+    """Local copies of remote objects, each stored under the ETag it was fetched with.
+
+    A small pointer file per key names the ETag of the newest copy. Data files are
+    written before the pointer is switched to them, and a file's content always
+    matches the ETag in its name, so a reader never pairs one version's ETag with
+    another version's bytes, even with several processes sharing the directory.
+    """
+
+    def __init__(self, base_path: str) -> None:
+        self.base_path = Path(base_path)
+        self.base_path.mkdir(parents=True, exist_ok=True)
+
+    def _pointer(self, key: str) -> Path:
+        return self.base_path / f"{key}.etag"
+
+    def _data(self, key: str, etag: str) -> Path:
+        digest = hashlib.sha256(etag.encode("utf-8")).hexdigest()[:16]
+        return self.base_path / f"{key}.{digest}"
+
+    def lookup(self, key: str) -> tuple[str, Path] | None:
+        try:
+            etag = self._pointer(key).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        path = self._data(key, etag)
+        return (etag, path) if path.exists() else None
+
+    def store(self, key: str, etag: str, body: IO[bytes]) -> Path:
+        previous = self.lookup(key)
+        path = self._data(key, etag)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        def copy_body(handle: IO[bytes]) -> None:
+            while chunk := body.read(_COPY_CHUNK_BYTES):
+                handle.write(chunk)
+
+        _write_atomic(path, copy_body)
+        _write_atomic(self._pointer(key), lambda handle: handle.write(etag.encode("utf-8")))
+        if previous is not None and previous[1] != path:
+            previous[1].unlink(missing_ok=True)
+        return path
+
+    def evict(self, key: str) -> None:
+        previous = self.lookup(key)
+        self._pointer(key).unlink(missing_ok=True)
+        if previous is not None:
+            previous[1].unlink(missing_ok=True)
+
+
+def _write_atomic(path: Path, write: Callable[[IO[bytes]], object]) -> None:
+    with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as tmp:
+        try:
+            write(tmp)
+        except BaseException:
+            tmp.close()
+            Path(tmp.name).unlink(missing_ok=True)
+            raise
+    os.replace(tmp.name, path)
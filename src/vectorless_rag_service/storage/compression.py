@@ -0,0 +1,94 @@
+"""Compression codecs for stored artifacts.
+
+Compressed payloads are recognised by the codec's own magic bytes, so readers do
+not need to know which codec, if any, wrote an artifact. Uncompressed JSON and
+binary artifacts never start with one of these signatures and load unchanged.
+"""
+
+from __future__ import annotations
+
+import gzip
+from abc import ABC, abstractmethod
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+class Codec(ABC):
+    name: str
+    magic: bytes
+    default_level: int
+
+    def __init__(self, level: int | None = None) -> None:
+        self.level = self.default_level if level is None else level
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        raise NotImplementedError
+
+    @abstractmethod
+    def decompress(self, data: bytes) -> bytes:
+        raise NotImplementedError
+
+
+class GzipCodec(Codec):
+    name = "gzip"
+    magic = GZIP_MAGIC
+    default_level = 6
+
+    def compress(self, data: bytes) -> bytes:
+        return gzip.compress(data, compresslevel=self.level, mtime=0)
+
+    def decompress(self, data: bytes) -> bytes:
+        return gzip.decompress(data)
+
+
+class ZstdCodec(Codec):
+    name = "zstd"
+    magic = ZSTD_MAGIC
+    default_level = 3
+
+    def compress(self, data: bytes) -> bytes:
+        return _zstandard().ZstdCompressor(level=self.level).compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        # Frames written by ZstdCompressor.compress record their size, so this is one pass.
+        return _zstandard().ZstdDecompressor().decompress(data)
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise RuntimeError(
+            "zstd artifact compression requires the optional 'zstandard' package"
+        ) from exc
+    return zstandard
+
+
+CODECS: dict[str, type[Codec]] = {"gzip": GzipCodec, "zstd": ZstdCodec}
+
+
+def build_codec(name: str, level: int | None = None) -> Codec | None:
+    """Return the named codec, or ``None`` for ``"none"``."""
+    if name == "none":
+        return None
+    if name not in CODECS:
+        raise ValueError(f"Unknown artifact compression: {name}")
+    return CODECS[name](level)
+
+
+def detect_codec(data: bytes) -> Codec | None:
+    for codec_type in CODECS.values():
+        if data.startswith(codec_type.magic):
+            return codec_type()
+    return None
+
+
+def compress(data: bytes, codec: Codec | None) -> bytes:
+    return data if codec is None else codec.compress(data)
+
+
+def decompress(data: bytes) -> bytes:
+    codec = detect_codec(data)
+    return data if codec is None else codec.decompress(data)
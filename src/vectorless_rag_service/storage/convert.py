@@ -0,0 +1,64 @@
+"""Convert local index artifacts between formats and compression codecs.
+
+Usage::
+
+    python -m vectorless_rag_service.storage.convert --path ./data/artifacts --to binary
+    python -m vectorless_rag_service.storage.convert --path ./data/artifacts --to json \
+        --compression zstd
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from uuid import UUID
+
+from vectorless_rag_service.storage.artifacts import ARTIFACT_FORMATS, LocalArtifactStore
+from vectorless_rag_service.storage.compression import CODECS
+
+
+def convert_local_artifacts(
+    base_path: str,
+    to_format: str,
+    compression: str | None = None,
+    compression_level: int | None = None,
+) -> list[UUID]:
+    """Rewrite artifacts in ``to_format``.
+
+    Artifacts already in ``to_format`` are only rewritten when ``compression`` is
+    given, to recompress them with that codec.
+    """
+    target = LocalArtifactStore(
+        base_path,
+        artifact_format=to_format,
+        compression=compression or "none",
+        compression_level=compression_level,
+    )
+    source_formats = [f for f in ARTIFACT_FORMATS if f != to_format or compression is not None]
+    paths = [
+        (source_format, path)
+        for source_format in source_formats
+        for path in sorted(Path(base_path).glob(f"*.{ARTIFACT_FORMATS[source_format]}"))
+    ]
+    converted: list[UUID] = []
+    for source_format, path in paths:
+        source = LocalArtifactStore(base_path, artifact_format=source_format)
+        document_id = UUID(path.stem)
+        target.put(document_id, source.get(document_id))
+        converted.append(document_id)
+    return converted
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--path", required=True, help="Local artifact directory")
+    parser.add_argument("--to", choices=sorted(ARTIFACT_FORMATS), default="binary")
+    parser.add_argument("--compression", choices=["none", *sorted(CODECS)], default=None)
+    parser.add_argument("--level", type=int, default=None, help="Compression level")
+    args = parser.parse_args(argv)
+    converted = convert_local_artifacts(args.path, args.to, args.compression, args.level)
+    print(f"converted {len(converted)} artifacts to {args.to}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import io
+import json
+import tempfile
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from vectorless_rag_service.core.interfaces import BlobStore
+from vectorless_rag_service.core.models import BlobRef
+from vectorless_rag_service.indexing.parser import PageContent
+from vectorless_rag_service.storage.blobs import build_blob_store
+
+READ_CHUNK_BYTES = 64 * 1024
+
+
+def blob_key(sha256: str) -> str:
+    return f"{sha256[:2]}/{sha256}.gz"
+
+
+class DocumentTextStore:
+    """Gzip-compressed, content-addressed storage for document text.
+
+    Raw uploads are stored byte for byte. Extracted text is stored as JSON lines,
+    one ``{"page": n, "text": ...}`` object per page, so the index builder can read
+    it back one page at a time. Blob keys are the SHA-256 of the uncompressed
+    content, so identical content is stored once.
+    """
+
+    def __init__(self, blobs: BlobStore, compress_level: int = 6) -> None:
+        self.blobs = blobs
+        self.compress_level = compress_level
+
+    def put_raw_file(self, path: Path) -> BlobRef:
+        def chunks() -> Iterator[bytes]:
+            with path.open("rb") as handle:
+                while chunk := handle.read(READ_CHUNK_BYTES):
+                    yield chunk
+
+        return self._put(chunks())
+
+    def put_raw_bytes(self, data: bytes) -> BlobRef:
+        return self._put([data])
+
+    def put_pages(self, pages: Iterable[PageContent]) -> BlobRef:
+        return self._put(
+            (
+                json.dumps({"page": page.page_number, "text": page.text}, ensure_ascii=False) + "\n"
+            ).encode("utf-8")
+            for page in pages
+        )
+
+    def iter_pages(self, ref: BlobRef) -> Iterator[PageContent]:
+        with self.blobs.open(ref.key) as stream, gzip.GzipFile(fileobj=stream) as unzipped:
+            for line in io.TextIOWrapper(unzipped, encoding="utf-8"):
+                record = json.loads(line)
+                yield PageContent(page_number=record["page"], text=record["text"])
+
+    def _put(self, chunks: Iterable[bytes]) -> BlobRef:
+        digest = hashlib.sha256()
+        size = 0
+        with tempfile.NamedTemporaryFile(delete=False) as tmp:
+            path = Path(tmp.name)
+            try:
+                # mtime=0 keeps the compressed bytes identical for identical content.
+                with gzip.GzipFile(
+                    fileobj=tmp, mode="wb", compresslevel=self.compress_level, mtime=0
+                ) as compressed:
+                    for chunk in chunks:
+                        digest.update(chunk)
+                        size += len(chunk)
+                        compressed.write(chunk)
+            except BaseException:
+                tmp.close()
+                path.unlink(missing_ok=True)
+                raise
+        sha256 = digest.hexdigest()
+        key = blob_key(sha256)
+        try:
+            if not self.blobs.exists(key):
+                self.blobs.put_file(key, path)
+        finally:
+            path.unlink(missing_ok=True)
+        return BlobRef(key=key, sha256=sha256, size=size)
+
+
+def build_document_text_store() -> DocumentTextStore:
+    return DocumentTextStore(build_blob_store())
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from vectorless_rag_service.config import settings
+from vectorless_rag_service.storage.database import AsyncSessionLocal
+from vectorless_rag_service.storage.models import IdempotencyKey
+
+
+@dataclass
+class StoredResponse:
+    status_code: int
+    body: Any
+
+
+class IdempotencyKeyReused(Exception):
+    """The key was first used for a request with a different fingerprint."""
+
+
+class IdempotencyKeyInProgress(Exception):
+    """The request that reserved the key has not finished yet."""
+
+
+class AsyncIdempotencyStore:
+    """Responses of completed requests, keyed by ``(scope, Idempotency-Key)``.
+
+    ``reserve`` inserts the key before the work is done, so of two concurrent
+    requests with the same key only one runs; the other gets
+    ``IdempotencyKeyInProgress``. Each key records the fingerprint of the request
+    that reserved it, and a request with another fingerprint gets
+    ``IdempotencyKeyReused`` instead of someone else's response.
+
+    A retry with the same key inside ``ttl_seconds`` is answered with a primary-key
+    lookup instead of repeating the work. Only successful responses are stored: a
+    failed request releases its key so it can be retried. A reservation that is
+    never completed (the process died) lapses after ``reservation_seconds``.
+    Expired rows are deleted as new keys are reserved.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        ttl_seconds: float = 24 * 60 * 60,
+        reservation_seconds: float = 5 * 60,
+    ) -> None:
+        self.session_factory = session_factory
+        self.ttl_seconds = ttl_seconds
+        self.reservation_seconds = reservation_seconds
+
+    async def get(self, scope: str, key: str) -> StoredResponse | None:
+        async with self.session_factory() as session:
+            record = await session.get(IdempotencyKey, (scope, key))
+            if (
+                record is None
+                or record.expires_at <= datetime.utcnow()
+                or record.status_code is None
+                or record.response is None
+            ):
+                return None
+            return StoredResponse(record.status_code, json.loads(record.response))
+
+    async def reserve(self, scope: str, key: str, fingerprint: str) -> StoredResponse | None:
+        """Claim ``key`` for a request, or return the response already stored for it.
+
+        Returns ``None`` when the caller now holds the key and must ``complete`` or
+        ``release`` it.
+        """
+        now = datetime.utcnow()
+        async with self.session_factory() as session:
+            await session.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= now))
+            session.add(
+                IdempotencyKey(
+                    scope=scope,
+                    key=key,
+                    fingerprint=fingerprint,
+                    created_at=now,
+                    expires_at=now + timedelta(seconds=self.reservation_seconds),
+                )
+            )
+            try:
+                await session.commit()
+                return None
+            except IntegrityError:
+                await session.rollback()
+            record = await session.get(IdempotencyKey, (scope, key))
+            if record is None:
+                # Released between the insert and the lookup; the retry reserves it.
+                return await self.reserve(scope, key, fingerprint)
+            if record.fingerprint != fingerprint:
+                raise IdempotencyKeyReused(key)
+            if record.status_code is None or record.response is None:
+                raise IdempotencyKeyInProgress(key)
+            return StoredResponse(record.status_code, json.loads(record.response))
+
+    async def complete(self, scope: str, key: str, status_code: int, body: Any) -> None:
+        """Store the response of a reserved request for ``ttl_seconds``."""
+        now = datetime.utcnow()
+        async with self.session_factory() as session:
+            await session.execute(
+                update(IdempotencyKey)
+                .where(IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+                .values(
+                    status_code=status_code,
+                    response=json.dumps(body),
+                    expires_at=now + timedelta(seconds=self.ttl_seconds),
+                )
+            )
+            await session.commit()
+
+    async def release(self, scope: str, key: str) -> None:
+        """Give up a reservation without a response, so the request can be retried."""
+        async with self.session_factory() as session:
+            await session.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.scope == scope,
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.response.is_(None),
+                )
+            )
+            await session.commit()
+
+
+def build_idempotency_store() -> AsyncIdempotencyStore:
+    return AsyncIdempotencyStore(
+        ttl_seconds=settings.idempotency.ttl_seconds,
+        reservation_seconds=settings.idempotency.reservation_seconds,
+    )
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+from vectorless_rag_service.config import settings
+from vectorless_rag_service.core.models import JobStatus
+from vectorless_rag_service.storage.database import AsyncSessionLocal, SessionLocal
+from vectorless_rag_service.storage.models import Job
+
+
+@dataclass
+class LeasedJob:
+    job_id: UUID
+    document_id: UUID
+    attempts: int
+    max_attempts: int
+
+
+class SqlJobQueue:
+    """Durable indexing queue on top of the ``jobs`` table.
+
+    Workers lease pending jobs for ``lease_seconds`` and must heartbeat to keep the
+    lease. Postgres uses ``SELECT ... FOR UPDATE SKIP LOCKED`` to hand out jobs;
+    other databases use a compare-and-set update on the job status, which gives the
+    same single-owner guarantee. Expired leases are reclaimed, and failed attempts
+    are retried with exponential backoff until ``max_attempts`` is reached.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker[Session] = SessionLocal,
+        lease_seconds: float = 60.0,
+        max_attempts: int = 3,
+        backoff_base_seconds: float = 5.0,
+        backoff_max_seconds: float = 300.0,
+    ) -> None:
+        self.session_factory = session_factory
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+
+    def enqueue(self, document_id: UUID, text_sha256: str | None = None) -> UUID:
+        with self.session_factory() as session:
+            job = _new_job(document_id, self.max_attempts, text_sha256)
+            session.add(job)
+            session.commit()
+            return UUID(job.id)
+
+    def lease(self, worker_id: str) -> LeasedJob | None:
+        with self.session_factory() as session:
+            if session.get_bind().dialect.name == "postgresql":
+                return self._lease_skip_locked(session, worker_id)
+            return self._lease_compare_and_set(session, worker_id)
+
+    def _pending_query(self, now: datetime):
+        return (
+            select(Job)
+            .where(Job.status == JobStatus.pending.value, Job.available_at <= now)
+            .order_by(Job.available_at, Job.created_at)
+            .limit(1)
+        )
+
+    def _lease_skip_locked(self, session: Session, worker_id: str) -> LeasedJob | None:
+        now = datetime.utcnow()
+        job = session.scalars(self._pending_query(now).with_for_update(skip_locked=True)).first()
+        if job is None:
+            session.rollback()
+            return None
+        self._take(job, worker_id, now)
+        leased = self._leased(job)
+        session.commit()
+        return leased
+
+    def _lease_compare_and_set(self, session: Session, worker_id: str) -> LeasedJob | None:
+        while True:
+            now = datetime.utcnow()
+            job = session.scalars(self._pending_query(now)).first()
+            if job is None:
+                return None
+            result = session.execute(
+                update(Job)
+                .where(Job.id == job.id, Job.status == JobStatus.pending.value)
+                .values(
+                    status=JobStatus.running.value,
+                    attempts=Job.attempts + 1,
+                    lease_owner=worker_id,
+                    lease_expires_at=now + timedelta(seconds=self.lease_seconds),
+                    heartbeat_at=now,
+                    progress=0.0,
+                )
+            )
+            session.commit()
+            if result.rowcount == 1:
+                session.refresh(job)
+                return self._leased(job)
+            # Another worker took the job between the select and the update; try the next.
+            session.expire_all()
+
+    def _take(self, job: Job, worker_id: str, now: datetime) -> None:
+        job.status = JobStatus.running.value
+        job.attempts += 1
+        job.lease_owner = worker_id
+        job.lease_expires_at = now + timedelta(seconds=self.lease_seconds)
+        job.heartbeat_at = now
+        job.progress = 0.0
+
+    def _leased(self, job: Job) -> LeasedJob:
+        return LeasedJob(
+            job_id=UUID(job.id),
+            document_id=UUID(job.document_id),
+            attempts=job.attempts,
+            max_attempts=job.max_attempts,
+        )
+
+    def _owned(self, job_id: UUID, worker_id: str):
+        return update(Job).where(
+            Job.id == str(job_id),
+            Job.lease_owner == worker_id,
+            Job.status == JobStatus.running.value,
+        )
+
+    def heartbeat(self, job_id: UUID, worker_id: str, progress: float | None = None) -> bool:
+        """Extend the lease; returns False if the worker no longer owns the job."""
+        now = datetime.utcnow()
+        values: dict[str, object] = {
+            "heartbeat_at": now,
+            "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+        }
+        if progress is not None:
+            values["progress"] = progress
+        with self.session_factory() as session:
+            result = session.execute(self._owned(job_id, worker_id).values(**values))
+            session.commit()
+            return result.rowcount == 1
+
+    def complete(self, job_id: UUID, worker_id: str) -> bool:
+        with self.session_factory() as session:
+            result = session.execute(
+                self._owned(job_id, worker_id).values(
+                    status=JobStatus.succeeded.value,
+                    progress=1.0,
+                    error=None,
+                    lease_owner=None,
+                    lease_expires_at=None,
+                )
+            )
+            session.commit()
+            return result.rowcount == 1
+
+    def fail(self, job: LeasedJob, worker_id: str, error: str) -> bool:
+        """Record a failed attempt; returns True if the job will be retried."""
+        retry = job.attempts < job.max_attempts
+        values: dict[str, object] = {"error": error, "lease_owner": None, "lease_expires_at": None}
+        if retry:
+            values.update(
+                status=JobStatus.pending.value,
+                available_at=datetime.utcnow() + timedelta(seconds=self.backoff(job.attempts)),
+            )
+        else:
+            values.update(status=JobStatus.failed.value, progress=1.0)
+        with self.session_factory() as session:
+            session.execute(self._owned(job.job_id, worker_id).values(**values))
+            session.commit()
+        return retry
+
+    def backoff(self, attempts: int) -> float:
+        return min(self.backoff_base_seconds * 2 ** (attempts - 1), self.backoff_max_seconds)
+
+    def reclaim_expired(self) -> int:
+        """Return jobs whose lease expired (crashed or stalled worker) to the queue."""
+        now = datetime.utcnow()
+        expired = (Job.status == JobStatus.running.value, Job.lease_expires_at < now)
+        with self.session_factory() as session:
+            exhausted = session.execute(
+                update(Job)
+                .where(*expired, Job.attempts >= Job.max_attempts)
+                .values(
+                    status=JobStatus.failed.value,
+                    progress=1.0,
+                    error="lease expired",
+                    lease_owner=None,
+                    lease_expires_at=None,
+                )
+            )
+            requeued = session.execute(
+                update(Job)
+                .where(*expired, Job.attempts < Job.max_attempts)
+                .values(
+                    status=JobStatus.pending.value,
+                    available_at=now,
+                    error="lease expired",
+                    lease_owner=None,
+                    lease_expires_at=None,
+                )
+            )
+            session.commit()
+            return exhausted.rowcount + requeued.rowcount
+
+    def depth(self) -> int:
+        with self.session_factory() as session:
+            return session.scalar(_depth_query()) or 0
+
+
+class AsyncJobProducer:
+    """Producer side of ``SqlJobQueue`` on the async engine, for request handlers."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        max_attempts: int = 3,
+    ) -> None:
+        self.session_factory = session_factory
+        self.max_attempts = max_attempts
+
+    async def enqueue(self, document_id: UUID, text_sha256: str | None = None) -> UUID:
+        async with self.session_factory() as session:
+            job = _new_job(document_id, self.max_attempts, text_sha256)
+            session.add(job)
+            await session.commit()
+            return UUID(job.id)
+
+    async def depth(self) -> int:
+        async with self.session_factory() as session:
+            return await session.scalar(_depth_query()) or 0
+
+
+def _new_job(document_id: UUID, max_attempts: int, text_sha256: str | None) -> Job:
+    return Job(
+        document_id=str(document_id),
+        status=JobStatus.pending.value,
+        progress=0.0,
+        attempts=0,
+        max_attempts=max_attempts,
+        available_at=datetime.utcnow(),
+        text_sha256=text_sha256,
+    )
+
+
+def _depth_query():
+    active = (JobStatus.pending.value, JobStatus.running.value)
+    return select(func.count()).select_from(Job).where(Job.status.in_(active))
+
+
+def build_job_queue() -> SqlJobQueue:
+    return SqlJobQueue(
+        lease_seconds=settings.worker.lease_seconds,
+        max_attempts=settings.worker.max_attempts,
+        backoff_base_seconds=settings.worker.backoff_base_seconds,
+        backoff_max_seconds=settings.worker.backoff_max_seconds,
+    )
+
+
+def build_job_producer() -> AsyncJobProducer:
+    return AsyncJobProducer(max_attempts=settings.worker.max_attempts)
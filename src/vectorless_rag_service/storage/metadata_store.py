@@ -4,35 +4,121 @@ from collections.abc import Iterable
 from uuid import UUID
 
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from vectorless_rag_service.core.interfaces import MetadataStore
-from vectorless_rag_service.core.models import JobRecord, JobStatus
-from vectorless_rag_service.storage.database import SessionLocal
+from vectorless_rag_service.core.interfaces import AsyncMetadataStore, MetadataStore
+from vectorless_rag_service.core.models import BlobRef, JobRecord, JobStatus
+from vectorless_rag_service.storage.database import AsyncSessionLocal, SessionLocal
 from vectorless_rag_service.storage.models import Document, IndexArtifactRecord, Job
 
 
+class DuplicateContentError(ValueError):
+    """Another document already has the content a document was being updated to."""
+
+
+def _job_record(job: Job) -> JobRecord:
+    return JobRecord(
+        job_id=UUID(job.id),
+        document_id=UUID(job.document_id),
+        status=JobStatus(job.status),
+        progress=job.progress,
+        error=job.error,
+    )
+
+
+def _set_blobs(record: Document, text: BlobRef, raw: BlobRef | None) -> None:
+    record.text_key, record.text_sha256, record.text_bytes = text.key, text.sha256, text.size
+    if raw is None:
+        record.raw_key, record.raw_sha256, record.raw_bytes = None, None, None
+    else:
+        record.raw_key, record.raw_sha256, record.raw_bytes = raw.key, raw.sha256, raw.size
+
+
+def _text_blob(record: Document | None) -> BlobRef:
+    if record is None:
+        raise ValueError("document not found")
+    if record.text_key is None or record.text_sha256 is None or record.text_bytes is None:
+        raise ValueError("document has no stored text")
+    return BlobRef(key=record.text_key, sha256=record.text_sha256, size=record.text_bytes)
+
+
+def _by_content(content_sha256: str | None):
+    return select(Document).where(Document.content_sha256 == content_sha256)
+
+
+def _replace_content(
+    record: Document | None,
+    filename: str | None,
+    content_sha256: str,
+    text: BlobRef,
+    raw: BlobRef | None,
+) -> None:
+    if record is None:
+        raise ValueError("document not found")
+    record.filename = filename
+    record.content_sha256 = content_sha256
+    _set_blobs(record, text, raw)
+
+
+def _latest_job(document_id: UUID, text_sha256: str | None):
+    query = select(Job).where(Job.document_id == str(document_id))
+    if text_sha256 is not None:
+        query = query.where(Job.text_sha256 == text_sha256)
+    return query.order_by(Job.created_at.desc()).limit(1)
+
+
 class SqlMetadataStore(MetadataStore):
-    def create_document(self, filename: str | None) -> UUID:
+    def create_document(self, filename: str | None, content_sha256: str | None = None) -> UUID:
         with SessionLocal() as session:
-            record = Document(filename=filename)
+            record = Document(filename=filename, content_sha256=content_sha256)
             session.add(record)
-            session.commit()
+            try:
+                session.commit()
+            except IntegrityError:
+                # A concurrent upload of the same content won the insert; reuse it.
+                session.rollback()
+                existing = session.scalar(_by_content(content_sha256))
+                if existing is None:
+                    raise
+                return UUID(existing.id)
             return UUID(record.id)
 
-    def save_document_text(self, document_id: UUID, text: str) -> None:
+    def find_document_by_hash(self, content_sha256: str) -> UUID | None:
+        with SessionLocal() as session:
+            record = session.scalar(
+                _by_content(content_sha256).where(Document.text_key.is_not(None))
+            )
+            return None if record is None else UUID(record.id)
+
+    def save_document_blobs(self, document_id: UUID, text: BlobRef, raw: BlobRef | None) -> None:
         with SessionLocal() as session:
             record = session.get(Document, str(document_id))
             if record is None:
                 raise ValueError("document not found")
-            record.text = text
+            _set_blobs(record, text, raw)
             session.commit()
 
-    def get_document_text(self, document_id: UUID) -> str:
+    def update_document(
+        self,
+        document_id: UUID,
+        filename: str | None,
+        content_sha256: str,
+        text: BlobRef,
+        raw: BlobRef | None,
+    ) -> None:
         with SessionLocal() as session:
-            record = session.get(Document, str(document_id))
-            if record is None:
-                raise ValueError("document not found")
-            return record.text
+            _replace_content(
+                session.get(Document, str(document_id)), filename, content_sha256, text, raw
+            )
+            try:
+                session.commit()
+            except IntegrityError as exc:
+                raise DuplicateContentError("content belongs to another document") from exc
+
+    def get_text_blob(self, document_id: UUID) -> BlobRef:
+        with SessionLocal() as session:
+            return _text_blob(session.get(Document, str(document_id)))
 
     def create_job(self, document_id: UUID) -> UUID:
         with SessionLocal() as session:
@@ -51,29 +137,122 @@ class SqlMetadataStore(MetadataStore):
             job.error = error
             session.commit()
 
+    def latest_job(self, document_id: UUID, text_sha256: str | None = None) -> JobRecord | None:
+        with SessionLocal() as session:
+            job = session.scalar(_latest_job(document_id, text_sha256))
+            return None if job is None else _job_record(job)
+
     def get_job(self, job_id: UUID) -> JobRecord:
         with SessionLocal() as session:
             job = session.get(Job, str(job_id))
             if job is None:
                 raise ValueError("job not found")
-            return JobRecord(
-                job_id=UUID(job.id),
-                document_id=UUID(job.document_id),
-                status=JobStatus(job.status),
-                progress=job.progress,
-                error=job.error,
-            )
+            return _job_record(job)
 
     def list_jobs(self) -> Iterable[JobRecord]:
         with SessionLocal() as session:
             for job in session.scalars(select(Job)):
-                yield JobRecord(
-                    job_id=UUID(job.id),
-                    document_id=UUID(job.document_id),
-                    status=JobStatus(job.status),
-                    progress=job.progress,
-                    error=job.error,
-                )
+                yield _job_record(job)
+
+
+class AsyncSqlMetadataStore(AsyncMetadataStore):
+    """``MetadataStore`` on the async engine, for use from request handlers."""
+
+    def __init__(
+        self, session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal
+    ) -> None:
+        self.session_factory = session_factory
+
+    async def create_document(
+        self, filename: str | None, content_sha256: str | None = None
+    ) -> UUID:
+        async with self.session_factory() as session:
+            record = Document(filename=filename, content_sha256=content_sha256)
+            session.add(record)
+            try:
+                await session.commit()
+            except IntegrityError:
+                await session.rollback()
+                existing = await session.scalar(_by_content(content_sha256))
+                if existing is None:
+                    raise
+                return UUID(existing.id)
+            return UUID(record.id)
+
+    async def find_document_by_hash(self, content_sha256: str) -> UUID | None:
+        async with self.session_factory() as session:
+            record = await session.scalar(
+                _by_content(content_sha256).where(Document.text_key.is_not(None))
+            )
+            return None if record is None else UUID(record.id)
+
+    async def save_document_blobs(
+        self, document_id: UUID, text: BlobRef, raw: BlobRef | None
+    ) -> None:
+        async with self.session_factory() as session:
+            record = await session.get(Document, str(document_id))
+            if record is None:
+                raise ValueError("document not found")
+            _set_blobs(record, text, raw)
+            await session.commit()
+
+    async def update_document(
+        self,
+        document_id: UUID,
+        filename: str | None,
+        content_sha256: str,
+        text: BlobRef,
+        raw: BlobRef | None,
+    ) -> None:
+        async with self.session_factory() as session:
+            _replace_content(
+                await session.get(Document, str(document_id)), filename, content_sha256, text, raw
+            )
+            try:
+                await session.commit()
+            except IntegrityError as exc:
+                raise DuplicateContentError("content belongs to another document") from exc
+
+    async def get_text_blob(self, document_id: UUID) -> BlobRef:
+        async with self.session_factory() as session:
+            return _text_blob(await session.get(Document, str(document_id)))
+
+    async def create_job(self, document_id: UUID) -> UUID:
+        async with self.session_factory() as session:
+            job = Job(document_id=str(document_id), status=JobStatus.pending.value, progress=0.0)
+            session.add(job)
+            await session.commit()
+            return UUID(job.id)
+
+    async def update_job(
+        self, job_id: UUID, status: str, progress: float, error: str | None
+    ) -> None:
+        async with self.session_factory() as session:
+            job = await session.get(Job, str(job_id))
+            if job is None:
+                raise ValueError("job not found")
+            job.status = status
+            job.progress = progress
+            job.error = error
+            await session.commit()
+
+    async def latest_job(
+        self, document_id: UUID, text_sha256: str | None = None
+    ) -> JobRecord | None:
+        async with self.session_factory() as session:
+            job = await session.scalar(_latest_job(document_id, text_sha256))
+            return None if job is None else _job_record(job)
+
+    async def get_job(self, job_id: UUID) -> JobRecord:
+        async with self.session_factory() as session:
+            job = await session.get(Job, str(job_id))
+            if job is None:
+                raise ValueError("job not found")
+            return _job_record(job)
+
+    async def list_jobs(self) -> list[JobRecord]:
+        async with self.session_factory() as session:
+            return [_job_record(job) for job in await session.scalars(select(Job))]
 
 
 class IndexArtifactStore:
@@ -0,0 +1,62 @@
+"""Alembic migrations for the metadata database.
+
+``upgrade_database`` is run by ``init_db`` on every start, so the API and the
+standalone worker bring the schema up to date themselves. It handles three cases:
+
+- An empty database gets the current schema from the models and is stamped at head.
+- A database created by ``create_all`` before migrations existed has no
+  ``alembic_version`` table. It is stamped at the baseline and then upgraded.
+  The upgrade steps check what is already there, so columns added by hand are kept.
+- Any other database is upgraded from its recorded revision.
+
+On Postgres the upgrade holds an advisory lock, so API and worker processes that
+start together run it once.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import Connection, Engine, inspect, text
+
+from vectorless_rag_service.storage.document_text import DocumentTextStore
+from vectorless_rag_service.storage.models import Base
+
+SCRIPT_LOCATION = str(Path(__file__).parent)
+# The schema as it was before migrations were introduced.
+BASELINE_REVISION = "0001"
+# Arbitrary, but fixed: every process must ask for the same advisory lock.
+ADVISORY_LOCK_KEY = 0x767273
+
+
+def alembic_config(connection: Connection, text_store: DocumentTextStore | None = None) -> Config:
+    """Alembic configuration that runs migrations on ``connection``."""
+    config = Config()
+    config.set_main_option("script_location", SCRIPT_LOCATION)
+    config.attributes["connection"] = connection
+    config.attributes["text_store"] = text_store
+    return config
+
+
+def upgrade_database(engine: Engine, text_store: DocumentTextStore | None = None) -> None:
+    """Bring the database behind ``engine`` to the latest revision.
+
+    ``text_store`` receives document text moved out of the ``documents`` table. It
+    defaults to the configured store.
+    """
+    with engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.execute(
+                text("SELECT pg_advisory_xact_lock(:key)"), {"key": ADVISORY_LOCK_KEY}
+            )
+        config = alembic_config(connection, text_store)
+        tables = set(inspect(connection).get_table_names())
+        if "alembic_version" not in tables:
+            if "documents" not in tables:
+                Base.metadata.create_all(bind=connection)
+                command.stamp(config, "head")
+                return
+            command.stamp(config, BASELINE_REVISION)
+        command.upgrade(config, "head")
@@ -0,0 +1,8 @@
+"""Run the metadata migrations ahead of a deploy: ``python -m ...storage.migrations``."""
+
+from __future__ import annotations
+
+from vectorless_rag_service.storage.database import init_db
+
+if __name__ == "__main__":
+    init_db()
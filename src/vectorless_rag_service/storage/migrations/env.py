@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from alembic import context
+
+from vectorless_rag_service.storage.database import engine
+from vectorless_rag_service.storage.models import Base
+
+
+def run_migrations(connection) -> None:
+    # Batch mode lets the same operations alter tables on SQLite, which has no ALTER
+    # COLUMN, by copying the table.
+    context.configure(connection=connection, target_metadata=Base.metadata, render_as_batch=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+connection = context.config.attributes.get("connection")
+if connection is not None:
+    run_migrations(connection)
+else:
+    with engine.begin() as own_connection:
+        run_migrations(own_connection)
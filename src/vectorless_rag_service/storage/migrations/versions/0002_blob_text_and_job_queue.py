@@ -0,0 +1,237 @@
+"""Job queue columns, document blobs, deduplication and idempotency keys.
+
+Document text moves out of ``documents.text`` into content-addressed blobs before
+the column is dropped, so existing documents keep their ids and can be re-indexed.
+The downgrade joins the pages back into ``documents.text``.
+Each step checks the live schema first: databases that already had some of these
+columns added by hand, or were created by ``create_all`` after the change, are
+upgraded without errors.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import context, op
+
+from vectorless_rag_service.core.models import BlobRef
+from vectorless_rag_service.indexing.parser import iter_text_pages
+from vectorless_rag_service.storage.document_text import build_document_text_store
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+JOB_QUEUE_INDEX = "ix_jobs_status_available_at"
+IDEMPOTENCY_EXPIRY_INDEX = "ix_idempotency_keys_expires_at"
+# Columns this revision adds, dropped again by the downgrade.
+JOB_COLUMNS = (
+    "attempts",
+    "max_attempts",
+    "available_at",
+    "lease_owner",
+    "lease_expires_at",
+    "heartbeat_at",
+    "text_sha256",
+)
+DOCUMENT_COLUMNS = (
+    "content_sha256",
+    "text_key",
+    "text_sha256",
+    "text_bytes",
+    "raw_key",
+    "raw_sha256",
+    "raw_bytes",
+)
+
+
+def _columns(inspector: sa.Inspector, table: str) -> set[str]:
+    return {column["name"] for column in inspector.get_columns(table)}
+
+
+def _upgrade_jobs(inspector: sa.Inspector) -> None:
+    existing = _columns(inspector, "jobs")
+    # Added nullable, filled in, then tightened: existing rows need values first.
+    required: list[sa.Column] = [
+        sa.Column("attempts", sa.Integer(), nullable=True),
+        sa.Column("max_attempts", sa.Integer(), nullable=True),
+        sa.Column("available_at", sa.DateTime(), nullable=True),
+    ]
+    optional: list[sa.Column] = [
+        sa.Column("lease_owner", sa.String(), nullable=True),
+        sa.Column("lease_expires_at", sa.DateTime(), nullable=True),
+        sa.Column("heartbeat_at", sa.DateTime(), nullable=True),
+        sa.Column("text_sha256", sa.String(64), nullable=True),
+    ]
+    added = [column for column in required + optional if column.name not in existing]
+    if added:
+        with op.batch_alter_table("jobs") as batch:
+            for column in added:
+                batch.add_column(column)
+
+    jobs = sa.table(
+        "jobs",
+        sa.column("attempts"),
+        sa.column("max_attempts"),
+        sa.column("available_at"),
+        sa.column("created_at"),
+    )
+    op.execute(jobs.update().where(jobs.c.attempts.is_(None)).values(attempts=0))
+    op.execute(jobs.update().where(jobs.c.max_attempts.is_(None)).values(max_attempts=3))
+    # Pending jobs left from before the queue become claimable straight away.
+    op.execute(
+        jobs.update().where(jobs.c.available_at.is_(None)).values(available_at=jobs.c.created_at)
+    )
+    names = {column.name for column in added}
+    tightened = [column for column in required if column.name in names]
+    if tightened:
+        with op.batch_alter_table("jobs") as batch:
+            for column in tightened:
+                batch.alter_column(column.name, existing_type=column.type, nullable=False)
+
+    if JOB_QUEUE_INDEX not in {index["name"] for index in inspector.get_indexes("jobs")}:
+        op.create_index(JOB_QUEUE_INDEX, "jobs", ["status", "available_at"])
+
+
+def _upgrade_documents(inspector: sa.Inspector) -> None:
+    existing = _columns(inspector, "documents")
+    columns: list[sa.Column] = [
+        sa.Column("content_sha256", sa.String(64), nullable=True),
+        sa.Column("text_key", sa.String(), nullable=True),
+        sa.Column("text_sha256", sa.String(64), nullable=True),
+        sa.Column("text_bytes", sa.BigInteger(), nullable=True),
+        sa.Column("raw_key", sa.String(), nullable=True),
+        sa.Column("raw_sha256", sa.String(64), nullable=True),
+        sa.Column("raw_bytes", sa.BigInteger(), nullable=True),
+    ]
+    added = [column for column in columns if column.name not in existing]
+    if added:
+        with op.batch_alter_table("documents") as batch:
+            for column in added:
+                batch.add_column(column)
+            if "content_sha256" not in existing:
+                batch.create_unique_constraint("uq_documents_content_sha256", ["content_sha256"])
+
+    if "text" in existing:
+        _move_text_to_blobs()
+        with op.batch_alter_table("documents") as batch:
+            batch.drop_column("text")
+
+
+def _move_text_to_blobs() -> None:
+    """Store each document's text as a page blob, one row at a time.
+
+    ``content_sha256`` stays empty: it hashes the uploaded bytes, which were never
+    kept. Those documents are simply not matched by deduplication.
+    """
+    store = context.config.attributes.get("text_store") or build_document_text_store()
+    bind = op.get_bind()
+    documents = sa.table(
+        "documents",
+        sa.column("id", sa.String()),
+        sa.column("text", sa.Text()),
+        sa.column("text_key", sa.String()),
+        sa.column("text_sha256", sa.String()),
+        sa.column("text_bytes", sa.BigInteger()),
+    )
+    pending = bind.scalars(sa.select(documents.c.id).where(documents.c.text_key.is_(None))).all()
+    for document_id in pending:
+        text = bind.scalar(sa.select(documents.c.text).where(documents.c.id == document_id))
+        ref = store.put_pages(iter_text_pages(text or ""))
+        bind.execute(
+            documents.update()
+            .where(documents.c.id == document_id)
+            .values(text_key=ref.key, text_sha256=ref.sha256, text_bytes=ref.size)
+        )
+
+
+def _create_idempotency_keys(inspector: sa.Inspector) -> None:
+    if "idempotency_keys" in inspector.get_table_names():
+        return
+    op.create_table(
+        "idempotency_keys",
+        sa.Column("scope", sa.String(), primary_key=True),
+        sa.Column("key", sa.String(), primary_key=True),
+        sa.Column("status_code", sa.Integer(), nullable=False),
+        sa.Column("response", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index(IDEMPOTENCY_EXPIRY_INDEX, "idempotency_keys", ["expires_at"])
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    _upgrade_jobs(inspector)
+    _upgrade_documents(inspector)
+    _create_idempotency_keys(inspector)
+
+
+def _restore_text_from_blobs() -> None:
+    """Join each document's page blob back into ``documents.text``.
+
+    Pages were split on paragraph breaks, so joining them with one rebuilds the
+    text. Documents whose text was never extracted get an empty string.
+    """
+    store = context.config.attributes.get("text_store") or build_document_text_store()
+    bind = op.get_bind()
+    documents = sa.table(
+        "documents",
+        sa.column("id", sa.String()),
+        sa.column("text", sa.Text()),
+        sa.column("text_key", sa.String()),
+        sa.column("text_sha256", sa.String()),
+        sa.column("text_bytes", sa.BigInteger()),
+    )
+    rows = bind.execute(
+        sa.select(
+            documents.c.id, documents.c.text_key, documents.c.text_sha256, documents.c.text_bytes
+        ).where(documents.c.text.is_(None))
+    ).all()
+    for document_id, key, sha256, size in rows:
+        text = ""
+        if key is not None:
+            ref = BlobRef(key=key, sha256=sha256, size=size)
+            text = "\n\n".join(page.text for page in store.iter_pages(ref))
+        bind.execute(documents.update().where(documents.c.id == document_id).values(text=text))
+
+
+def _downgrade_documents(inspector: sa.Inspector) -> None:
+    existing = _columns(inspector, "documents")
+    if "text" not in existing:
+        with op.batch_alter_table("documents") as batch:
+            batch.add_column(sa.Column("text", sa.Text(), nullable=True))
+    _restore_text_from_blobs()
+    constraints = {
+        constraint["name"] for constraint in inspector.get_unique_constraints("documents")
+    }
+    with op.batch_alter_table("documents") as batch:
+        batch.alter_column("text", existing_type=sa.Text(), nullable=False)
+        if "uq_documents_content_sha256" in constraints:
+            batch.drop_constraint("uq_documents_content_sha256", type_="unique")
+        for name in DOCUMENT_COLUMNS:
+            if name in existing:
+                batch.drop_column(name)
+
+
+def _downgrade_jobs(inspector: sa.Inspector) -> None:
+    existing = _columns(inspector, "jobs")
+    if JOB_QUEUE_INDEX in {index["name"] for index in inspector.get_indexes("jobs")}:
+        op.drop_index(JOB_QUEUE_INDEX, table_name="jobs")
+    dropped = [name for name in JOB_COLUMNS if name in existing]
+    if dropped:
+        with op.batch_alter_table("jobs") as batch:
+            for name in dropped:
+                batch.drop_column(name)
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "idempotency_keys" in inspector.get_table_names():
+        op.drop_table("idempotency_keys")
+    _downgrade_jobs(inspector)
+    _downgrade_documents(inspector)
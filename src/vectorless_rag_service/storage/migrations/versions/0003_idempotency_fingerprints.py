@@ -0,0 +1,48 @@
+"""Idempotency key fingerprints and reservations.
+
+Keys are now reserved before the request runs, so ``status_code`` and ``response``
+are empty until it finishes, and each key records a fingerprint of its request.
+Responses stored before fingerprints existed cannot be checked against a retry, so
+they are deleted; they would have expired within the TTL anyway.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def _columns() -> set[str]:
+    inspector = sa.inspect(op.get_bind())
+    return {column["name"] for column in inspector.get_columns("idempotency_keys")}
+
+
+def upgrade() -> None:
+    if "fingerprint" in _columns():
+        return
+    op.execute(sa.table("idempotency_keys").delete())
+    with op.batch_alter_table("idempotency_keys") as batch:
+        batch.add_column(sa.Column("fingerprint", sa.String(64), nullable=False))
+        batch.alter_column("status_code", existing_type=sa.Integer(), nullable=True)
+        batch.alter_column("response", existing_type=sa.Text(), nullable=True)
+
+
+def downgrade() -> None:
+    if "fingerprint" not in _columns():
+        return
+    keys = sa.table("idempotency_keys", sa.column("response", sa.Text()))
+    # Reservations still in progress have no response to keep.
+    op.execute(keys.delete().where(keys.c.response.is_(None)))
+    with op.batch_alter_table("idempotency_keys") as batch:
+        batch.drop_column("fingerprint")
+        batch.alter_column("status_code", existing_type=sa.Integer(), nullable=False)
+        batch.alter_column("response", existing_type=sa.Text(), nullable=False)
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+
+import anyio
+
+from vectorless_rag_service.config import settings
+from vectorless_rag_service.core.models import QueryRequest, QueryResponse
+from vectorless_rag_service.observability.metrics import QUERY_CACHE_HITS, QUERY_CACHE_MISSES
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase and collapse whitespace; retrievers already ignore case."""
+    return " ".join(question.lower().split())
+
+
+def query_cache_key(request: QueryRequest, artifact_version: str, retriever: str) -> str:
+    """Key over everything that determines a response for an already normalized request.
+
+    ``retriever`` is the answering retriever's ``cache_tag``.
+    """
+    fields = [
+        str(request.document_id),
+        artifact_version,
+        retriever,
+        request.question,
+        request.top_k,
+        request.mode,
+        request.include_citations,
+    ]
+    return hashlib.sha256(json.dumps(fields).encode("utf-8")).hexdigest()
+
+
+class QueryResultCache(ABC):
+    """Cache of query responses for one version of a document's artifact.
+
+    Keys include the artifact version, so re-indexing a document makes its old
+    entries unreachable; backends also drop them when a newer version is stored.
+    Keys also include the retriever's ``cache_tag``, and degraded responses are not
+    stored at all.
+    """
+
+    backend = "none"
+
+    async def get(
+        self, request: QueryRequest, artifact_version: str, retriever: str
+    ) -> QueryResponse | None:
+        response = await self._get(query_cache_key(request, artifact_version, retriever))
+        if response is None:
+            QUERY_CACHE_MISSES.labels(self.backend).inc()
+        else:
+            QUERY_CACHE_HITS.labels(self.backend).inc()
+        return response
+
+    async def put(
+        self, request: QueryRequest, artifact_version: str, retriever: str, response: QueryResponse
+    ) -> None:
+        if response.trace.degraded:
+            # A fallback answer would outlive the outage that caused it.
+            return
+        await self._put(
+            query_cache_key(request, artifact_version, retriever),
+            str(request.document_id),
+            artifact_version,
+            response,
+        )
+
+    @abstractmethod
+    async def _get(self, key: str) -> QueryResponse | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def _put(
+        self, key: str, document_id: str, artifact_version: str, response: QueryResponse
+    ) -> None:
+        raise NotImplementedError
+
+
+class MemoryQueryCache(QueryResultCache):
+    """Per-process LRU of responses, bounded by entry count."""
+
+    backend = "memory"
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[str, QueryResponse]] = OrderedDict()
+        # document id -> (artifact version, keys cached for it)
+        self._documents: dict[str, tuple[str, set[str]]] = {}
+        self._lock = threading.Lock()
+
+    async def _get(self, key: str) -> QueryResponse | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    async def _put(
+        self, key: str, document_id: str, artifact_version: str, response: QueryResponse
+    ) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            version, keys = self._documents.get(document_id, (artifact_version, set()))
+            if version != artifact_version:
+                for stale in keys:
+                    self._entries.pop(stale, None)
+                keys = set()
+            keys.add(key)
+            self._documents[document_id] = (artifact_version, keys)
+            self._entries[key] = (document_id, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted, (evicted_document, _) = self._entries.popitem(last=False)
+                remaining = self._documents[evicted_document][1]
+                remaining.discard(evicted)
+                if not remaining:
+                    del self._documents[evicted_document]
+
+
+class SqliteQueryCache(QueryResultCache):
+    """Response cache in a SQLite file shared by every worker process on a host.
+
+    The database runs in WAL mode so readers do not block the writer. Storing a
+    response for a new artifact version deletes the document's entries for older
+    versions. Every ``TRIM_INTERVAL`` writes, the least recently used rows beyond
+    ``max_entries`` are deleted. Calls run on worker threads, with one connection
+    per thread.
+    """
+
+    backend = "sqlite"
+    TRIM_INTERVAL = 64
+
+    def __init__(self, path: str, max_entries: int, max_threads: int = 4) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.limiter = anyio.CapacityLimiter(max_threads)
+        self._local = threading.local()
+        self._writes = 0
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS query_cache ("
+                "key TEXT PRIMARY KEY, document_id TEXT NOT NULL, version TEXT NOT NULL, "
+                "response TEXT NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS ix_query_cache_document ON query_cache (document_id)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS ix_query_cache_accessed ON query_cache (accessed_at)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        connection: sqlite3.Connection | None = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    async def _get(self, key: str) -> QueryResponse | None:
+        return await anyio.to_thread.run_sync(self._get_sync, key, limiter=self.limiter)
+
+    async def _put(
+        self, key: str, document_id: str, artifact_version: str, response: QueryResponse
+    ) -> None:
+        await anyio.to_thread.run_sync(
+            self._put_sync,
+            key,
+            document_id,
+            artifact_version,
+            response.model_dump_json(),
+            limiter=self.limiter,
+        )
+
+    def _get_sync(self, key: str) -> QueryResponse | None:
+        connection = self._connect()
+        row = connection.execute(
+            "SELECT response FROM query_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        connection.execute(
+            "UPDATE query_cache SET accessed_at = ? WHERE key = ?", (time.time(), key)
+        )
+        return QueryResponse.model_validate_json(row[0])
+
+    def _put_sync(self, key: str, document_id: str, artifact_version: str, response: str) -> None:
+        if self.max_entries <= 0:
+            return
+        connection = self._connect()
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute(
+                "DELETE FROM query_cache WHERE document_id = ? AND version != ?",
+                (document_id, artifact_version),
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO query_cache VALUES (?, ?, ?, ?, ?)",
+                (key, document_id, artifact_version, response, time.time()),
+            )
+            self._writes += 1
+            if self._writes % self.TRIM_INTERVAL == 0:
+                connection.execute(
+                    "DELETE FROM query_cache WHERE key IN (SELECT key FROM query_cache "
+                    "ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+
+
+def build_query_cache() -> QueryResultCache | None:
+    config = settings.query_cache
+    if not config.enabled:
+        return None
+    if config.backend == "sqlite":
+        return SqliteQueryCache(config.path, config.max_entries)
+    if config.backend == "memory":
+        return MemoryQueryCache(config.max_entries)
+    raise ValueError(f"Unknown query cache backend: {config.backend}")
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from typing import Any
+
+from vectorless_rag_service.config import settings
+
+# HeadObject reports a missing key as a bare 404; GetObject as NoSuchKey.
+MISSING_OBJECT_CODES = frozenset({"404", "NoSuchKey", "NotFound"})
+
+
+def build_s3_client(endpoint: str | None) -> Any:
+    """S3 client with a keep-alive connection pool and bounded timeouts and retries."""
+    # boto3 takes a noticeable share of startup; only S3-backed deployments pay for it.
+    import boto3
+    from botocore.config import Config
+
+    config = Config(
+        max_pool_connections=settings.storage.s3_max_pool_connections,
+        connect_timeout=settings.storage.s3_connect_timeout_seconds,
+        read_timeout=settings.storage.s3_read_timeout_seconds,
+        retries={"max_attempts": settings.storage.s3_max_attempts, "mode": "standard"},
+        tcp_keepalive=True,
+    )
+    return boto3.client("s3", endpoint_url=endpoint, config=config)
+
+
+def is_missing_object(client: Any, exc: Exception) -> bool:
+    """Whether ``exc`` is a ``ClientError`` for a missing object, rather than a
+    throttling, auth or other failure that must not read as "not found"."""
+    return (
+        isinstance(exc, client.exceptions.ClientError)
+        and exc.response["Error"]["Code"] in MISSING_OBJECT_CODES
+    )
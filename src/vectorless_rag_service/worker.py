@@ -0,0 +1,77 @@
+"""Standalone indexing worker.
+
+Run with ``vectorless-rag-worker --concurrency 4``. Each worker thread leases jobs
+from the durable queue in the ``jobs`` table; scale indexing throughput by
+starting more worker processes. With ``--metrics-port 9100`` the process serves its
+Prometheus metrics at ``http://<host>:9100/metrics``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import signal
+import socket
+from wsgiref.simple_server import WSGIServer
+
+from prometheus_client import start_http_server
+
+from vectorless_rag_service.config import settings
+from vectorless_rag_service.indexing.index_builder import BaselineIndexBuilder
+from vectorless_rag_service.indexing.pipeline import IndexPipeline
+from vectorless_rag_service.indexing.worker import build_worker_pool
+from vectorless_rag_service.observability.logging import get_logger, setup_logging
+from vectorless_rag_service.observability.metrics import exposition_registry
+from vectorless_rag_service.observability.tracing import setup_tracer_provider
+from vectorless_rag_service.storage.artifacts import build_artifact_store
+from vectorless_rag_service.storage.database import init_db
+from vectorless_rag_service.storage.document_text import build_document_text_store
+from vectorless_rag_service.storage.job_queue import build_job_queue
+from vectorless_rag_service.storage.metadata_store import IndexArtifactStore, SqlMetadataStore
+
+logger = get_logger()
+
+
+def serve_metrics(port: int, addr: str = "0.0.0.0") -> WSGIServer:
+    """Serve ``/metrics`` from a daemon thread.
+
+    With ``PROMETHEUS_MULTIPROC_DIR`` set, it reports totals over every process that
+    writes to that directory, like the API's ``/metrics``.
+    """
+    server, _ = start_http_server(port, addr, registry=exposition_registry())
+    return server
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Vectorless RAG indexing worker")
+    parser.add_argument("--concurrency", type=int, default=settings.worker.concurrency)
+    parser.add_argument("--metrics-port", type=int, default=settings.worker.metrics_port)
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    setup_tracer_provider()
+    init_db()
+    queue = build_job_queue()
+    pipeline = IndexPipeline(
+        SqlMetadataStore(),
+        build_artifact_store(),
+        BaselineIndexBuilder(max_pages=settings.limits.max_pages),
+        IndexArtifactStore(),
+        build_document_text_store(),
+    )
+    pool = build_worker_pool(
+        queue, pipeline, f"{socket.gethostname()}-{os.getpid()}", args.concurrency
+    )
+    signal.signal(signal.SIGTERM, lambda *_: pool.stop())
+    signal.signal(signal.SIGINT, lambda *_: pool.stop())
+    metrics = None if args.metrics_port is None else serve_metrics(args.metrics_port)
+    logger.info("worker_started", concurrency=args.concurrency, metrics_port=args.metrics_port)
+    pool.start()
+    pool.join()
+    if metrics is not None:
+        metrics.shutdown()
+    logger.info("worker_stopped")
+
+
+if __name__ == "__main__":
+    main()
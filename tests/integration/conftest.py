@@ -0,0 +1,18 @@
+import time
+
+import pytest
+
+
+@pytest.fixture
+def wait_for_job():
+    """Poll a job until the inline workers finish it, returning its final status."""
+
+    def wait(client, job_id: str, headers: dict[str, str], timeout: float = 10.0) -> str:
+        deadline = time.monotonic() + timeout
+        while True:
+            status = client.get(f"/v1/jobs/{job_id}", headers=headers).json()["status"]
+            if status in ("succeeded", "failed") or time.monotonic() > deadline:
+                return status
+            time.sleep(0.02)
+
+    return wait
@@ -0,0 +1,54 @@
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from vectorless_rag_service.main import create_app
+
+HEADERS = {"X-API-Key": "dev-key"}
+
+
+def upload(client: TestClient, content: bytes, headers: dict[str, str] = HEADERS):
+    return client.post(
+        "/v1/documents", files={"file": ("doc.txt", content, "text/plain")}, headers=headers
+    )
+
+
+def test_identical_uploads_reuse_document_and_index():
+    with TestClient(create_app()) as client:
+        content = f"1 Terms\n\nUnique content {uuid4()}.".encode()
+
+        first = upload(client, content).json()
+        second = upload(client, content).json()
+
+        assert second == {"document_id": first["document_id"], "deduplicated": True}
+        path = f"/v1/documents/{first['document_id']}/index"
+        job = client.post(path, headers=HEADERS).json()
+        assert client.post(path, headers=HEADERS).json()["job_id"] == job["job_id"]
+        assert client.post(f"{path}?force=true", headers=HEADERS).json()["job_id"] != job["job_id"]
+
+
+def test_idempotency_key_replays_stored_response():
+    with TestClient(create_app()) as client:
+        headers = {**HEADERS, "Idempotency-Key": str(uuid4())}
+        content = f"first {uuid4()}".encode()
+
+        first = upload(client, content, headers)
+        retry = upload(client, content, headers)
+
+        assert retry.status_code == 200
+        assert retry.json() == first.json()
+        path = f"/v1/documents/{first.json()['document_id']}/index?force=true"
+        job = client.post(path, headers=headers).json()
+        assert client.post(path, headers=headers).json() == job
+
+
+def test_idempotency_key_reused_for_another_request_is_rejected():
+    with TestClient(create_app()) as client:
+        headers = {**HEADERS, "Idempotency-Key": str(uuid4())}
+
+        first = upload(client, f"first {uuid4()}".encode(), headers)
+        reused = upload(client, f"second {uuid4()}".encode(), headers)
+
+        assert first.status_code == 200
+        assert reused.status_code == 422
+        assert reused.json()["detail"]["error_code"] == "idempotency_key_reused"
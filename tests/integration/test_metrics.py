@@ -0,0 +1,94 @@
+import re
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from vectorless_rag_service.main import create_app
+
+HEADERS = {"X-API-Key": "dev-key"}
+OPENMETRICS = "application/openmetrics-text; version=1.0.0"
+
+
+def test_pipeline_stages_are_exported_with_trace_exemplars(wait_for_job):
+    with TestClient(create_app()) as client:
+        text = f"1 Scope\n\nBackups are restored within four hours. {uuid4()}"
+        document_id = client.post(
+            "/v1/documents",
+            files={"file": ("scope.txt", text.encode("utf-8"), "text/plain")},
+            headers=HEADERS,
+        ).json()["document_id"]
+        job_id = client.post(f"/v1/documents/{document_id}/index", headers=HEADERS).json()["job_id"]
+        assert wait_for_job(client, job_id, HEADERS) == "succeeded"
+        client.post(
+            "/v1/query",
+            json={"document_id": document_id, "question": f"scope {uuid4()}"},
+            headers=HEADERS,
+        )
+        client.post(
+            "/v1/query:batch",
+            json={
+                "queries": [
+                    {"document_id": document_id, "question": f"{word} {uuid4()}"}
+                    for word in ("backups", "restore")
+                ]
+            },
+            headers=HEADERS,
+        )
+
+        response = client.get("/metrics", headers={**HEADERS, "Accept": OPENMETRICS})
+
+        assert response.headers["content-type"].startswith("application/openmetrics-text")
+        body = response.text
+        for name in (
+            "text_load",
+            "span_build",
+            "section_detect",
+            "tree_build",
+            "summarize",
+            "postings",
+            "index_build",
+            "serialize",
+            "artifact_put",
+            "artifact_get",
+            "validate",
+            "title_scores",
+            "tree_walk",
+            "citations",
+        ):
+            assert re.search(rf'vrs_stage_duration_seconds_count{{[^}}]*stage="{name}"', body), name
+        assert re.search(r'stage="tree_walk"\} \d+(\.\d+)? # \{trace_id="[0-9a-f]{32}"\}', body)
+
+
+def test_metrics_default_to_prometheus_text_format():
+    with TestClient(create_app()) as client:
+        response = client.get("/metrics", headers=HEADERS)
+
+    assert response.headers["content-type"].startswith("text/plain")
+    assert response.text.startswith("# HELP")
+
+
+def test_request_metrics_are_labelled_by_route_template():
+    with TestClient(create_app()) as client:
+        route = "/v1/documents/{document_id}/index"
+        labels = {"method": "POST", "route": route}
+
+        def sample(name: str, **extra: str) -> float:
+            return REGISTRY.get_sample_value(name, {**labels, **extra}) or 0.0
+
+        before = sample("vrs_requests_total", status="404")
+        before_bytes = sample("vrs_response_body_bytes_sum")
+        for _ in range(2):
+            response = client.post(
+                f"/v1/documents/{uuid4()}/index", headers={**HEADERS, "X-Request-Id": "req-1"}
+            )
+            assert response.status_code == 404
+            assert response.headers["X-Request-Id"] == "req-1"
+        client.get(f"/no-such-route/{uuid4()}", headers=HEADERS)
+
+        assert sample("vrs_requests_total", status="404") == before + 2
+        assert sample("vrs_response_body_bytes_sum") > before_bytes
+        unmatched = {"method": "GET", "route": "unmatched", "status": "404"}
+        assert REGISTRY.get_sample_value("vrs_requests_total", unmatched)
+        exposition = client.get("/metrics", headers=HEADERS).text
+        assert not re.search(r'route="[^"]*[0-9a-f]{8}-[0-9a-f]{4}-', exposition)
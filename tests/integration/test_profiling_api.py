@@ -0,0 +1,50 @@
+import pstats
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from vectorless_rag_service.config import settings
+from vectorless_rag_service.main import create_app
+
+HEADERS = {"X-API-Key": "dev-key"}
+
+
+def test_admin_can_profile_one_request(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings.profiling, "admin_key", "admin-secret")
+    monkeypatch.setattr(settings.profiling, "path", str(tmp_path))
+    with TestClient(create_app()) as client:
+        services = client.app.state.services
+        document_id = uuid4()
+        text = "1 Scope\n\nBackups are restored within four hours."
+        services.artifact_store.put(document_id, services.index_builder.build(document_id, text))
+        query = {"document_id": str(document_id), "question": f"backups {uuid4()}"}
+
+        response = client.post(
+            "/v1/query",
+            json=query,
+            headers={**HEADERS, "X-Profile": "1", "X-Admin-Key": "admin-secret"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["X-Profile-Status"] == "captured"
+        profile_path = f"/v1/admin/profiles/{response.headers['X-Profile-Id']}"
+        admin = {**HEADERS, "X-Admin-Key": "admin-secret"}
+        summary = client.get(profile_path, params={"format": "text"}, headers=admin)
+        assert "retrieve_many" in summary.text
+        download = client.get(profile_path, headers=admin)
+        (tmp_path / "download.pstats").write_bytes(download.content)
+        assert pstats.Stats(str(tmp_path / "download.pstats")).total_calls > 0
+
+
+def test_profiling_requires_the_admin_key(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings.profiling, "admin_key", "admin-secret")
+    monkeypatch.setattr(settings.profiling, "path", str(tmp_path))
+    with TestClient(create_app()) as client:
+        profiled = client.get(
+            "/healthz", headers={**HEADERS, "X-Profile": "1", "X-Admin-Key": "wrong"}
+        )
+        download = client.get(f"/v1/admin/profiles/{uuid4()}", headers=HEADERS)
+
+        assert profiled.status_code == 403
+        assert download.status_code == 403
+        assert not list(tmp_path.iterdir())
@@ -0,0 +1,31 @@
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from vectorless_rag_service.main import create_app
+
+
+def test_query_batch_preserves_input_order():
+    with TestClient(create_app()) as client:
+        services = client.app.state.services
+        first, second = uuid4(), uuid4()
+        for document_id, text in [(first, "1 Alpha\nFirst doc."), (second, "1 Beta\nSecond doc.")]:
+            services.artifact_store.put(
+                document_id, services.index_builder.build(document_id, text)
+            )
+        queries = [
+            {"document_id": str(first), "question": "alpha", "top_k": 1},
+            {"document_id": str(second), "question": "beta", "top_k": 1},
+            {"document_id": str(first), "question": "first", "top_k": 1},
+        ]
+
+        response = client.post(
+            "/v1/query:batch", json={"queries": queries}, headers={"X-API-Key": "dev-key"}
+        )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        excerpts = [result["citations"][0]["excerpt"] for result in results]
+        assert "First doc." in excerpts[0]
+        assert "Second doc." in excerpts[1]
+        assert "First doc." in excerpts[2]
@@ -0,0 +1,47 @@
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from moto import mock_aws
+
+from vectorless_rag_service.config import settings
+from vectorless_rag_service.main import create_app
+
+BUCKET = "query-test"
+HEADERS = {"X-API-Key": "dev-key"}
+
+
+def test_each_query_is_one_s3_request(monkeypatch, tmp_path):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    monkeypatch.setattr(settings.storage, "provider", "s3")
+    monkeypatch.setattr(settings.storage, "s3_bucket", BUCKET)
+    monkeypatch.setattr(settings.storage, "s3_cache_path", str(tmp_path))
+    with mock_aws(), TestClient(create_app()) as client:
+        services = client.app.state.services
+        s3 = services.artifact_store.inner.client
+        s3.create_bucket(Bucket=BUCKET)
+        document_id = uuid4()
+        services.artifact_store.put(
+            document_id, services.index_builder.build(document_id, "1 Terms\n\nNet thirty.")
+        )
+        calls: list[str] = []
+        s3.meta.events.register("before-call.s3", lambda model, **_: calls.append(model.name))
+
+        for question in ("net terms", "net terms", "thirty"):
+            calls.clear()
+            response = client.post(
+                "/v1/query",
+                json={"document_id": str(document_id), "question": question},
+                headers=HEADERS,
+            )
+            assert response.status_code == 200
+            assert calls == ["GetObject"]
+
+        calls.clear()
+        response = client.post(
+            "/v1/query", json={"document_id": str(uuid4()), "question": "x"}, headers=HEADERS
+        )
+        assert response.status_code == 404
+        # One conditional read per artifact format, and nothing else.
+        assert calls == ["GetObject", "GetObject"]
@@ -0,0 +1,112 @@
+from uuid import UUID, uuid4
+
+from fastapi.testclient import TestClient
+
+from vectorless_rag_service.config import settings
+from vectorless_rag_service.main import create_app
+from vectorless_rag_service.storage.job_queue import build_job_queue
+
+HEADERS = {"X-API-Key": "dev-key"}
+
+
+def test_text_upload_is_streamed_and_stored():
+    with TestClient(create_app()) as client:
+        text = "1 Résumé\n\nÉtude de cas. " * 2000
+
+        response = client.post(
+            "/v1/documents",
+            files={"file": ("notes.txt", text.encode("utf-8"), "text/plain")},
+            headers=HEADERS,
+        )
+
+        assert response.status_code == 200
+        assert response.json()["document_id"]
+
+
+def test_oversized_upload_is_rejected(monkeypatch):
+    monkeypatch.setattr(settings.limits, "max_upload_bytes", 1024)
+    with TestClient(create_app()) as client:
+        # Larger than the body limit: refused from Content-Length alone; larger than the file
+        # limit only: refused while spooling.
+        for size in (200_000, 10_000):
+            response = client.post(
+                "/v1/documents",
+                files={"file": ("big.txt", b"x" * size, "text/plain")},
+                headers=HEADERS,
+            )
+
+            assert response.status_code == 413
+            assert response.json()["detail"]["error_code"] == "payload_too_large"
+
+        replaced = client.put(
+            f"/v1/documents/{uuid4()}",
+            files={"file": ("big.txt", b"x" * 200_000, "text/plain")},
+            headers=HEADERS,
+        )
+        assert replaced.status_code == 413
+
+
+def test_uploaded_text_is_indexed_from_blob_storage(wait_for_job):
+    with TestClient(create_app()) as client:
+        text = "1 Scope\n\nBackups are restored within four hours."
+
+        document_id = client.post(
+            "/v1/documents",
+            files={"file": ("scope.txt", text.encode("utf-8"), "text/plain")},
+            headers=HEADERS,
+        ).json()["document_id"]
+        job_id = client.post(f"/v1/documents/{document_id}/index", headers=HEADERS).json()["job_id"]
+
+        assert wait_for_job(client, job_id, HEADERS) == "succeeded"
+        response = client.post(
+            "/v1/query",
+            json={"document_id": document_id, "question": "backups restored", "mode": "content"},
+            headers=HEADERS,
+        )
+        assert "four hours" in response.json()["answer"]
+
+
+def test_replaced_document_is_reindexed_with_new_text(wait_for_job):
+    with TestClient(create_app()) as client:
+        suffix = uuid4()
+        path = "/v1/documents"
+
+        def text_file(text: str):
+            return {"file": ("terms.txt", f"{text} {suffix}".encode(), "text/plain")}
+
+        document_id = client.post(
+            path, files=text_file("1 Terms\n\nInvoices are due in thirty days."), headers=HEADERS
+        ).json()["document_id"]
+        first_job = client.post(f"{path}/{document_id}/index", headers=HEADERS).json()["job_id"]
+        assert wait_for_job(client, first_job, HEADERS) == "succeeded"
+        query = {"document_id": document_id, "question": "Invoices  due", "mode": "content"}
+        for _ in range(2):
+            answer = client.post("/v1/query", json=query, headers=HEADERS).json()["answer"]
+            assert "thirty days" in answer
+
+        replaced = client.put(
+            f"{path}/{document_id}",
+            files=text_file("1 Terms\n\nInvoices are due in sixty days."),
+            headers=HEADERS,
+        )
+        assert replaced.json() == {"document_id": document_id, "changed": True}
+        second_job = client.post(f"{path}/{document_id}/index", headers=HEADERS).json()["job_id"]
+
+        assert second_job != first_job
+        assert wait_for_job(client, second_job, HEADERS) == "succeeded"
+        # The cached answer for the old artifact version is not served after re-indexing.
+        response = client.post("/v1/query", json=query, headers=HEADERS)
+        assert "sixty days" in response.json()["answer"]
+
+
+def test_jobs_queued_without_an_index_request_are_processed(wait_for_job):
+    with TestClient(create_app()) as client:
+        document_id = client.post(
+            "/v1/documents",
+            files={"file": ("left.txt", f"1 Scope\n\nLeft over {uuid4()}.".encode(), "text/plain")},
+            headers=HEADERS,
+        ).json()["document_id"]
+        # As if enqueued before a restart: nothing wakes the workers for it.
+        job_id = build_job_queue().enqueue(UUID(document_id))
+
+        assert wait_for_job(client, str(job_id), HEADERS) == "succeeded"
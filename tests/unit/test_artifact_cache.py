@@ -0,0 +1,72 @@
+from uuid import UUID, uuid4
+
+from vectorless_rag_service.core.interfaces import ArtifactStore
+from vectorless_rag_service.core.models import IndexArtifact, IndexNode, TextSpan
+from vectorless_rag_service.storage.cache import CachedArtifactStore, estimate_artifact_bytes
+
+
+class CountingStore(ArtifactStore):
+    def __init__(self) -> None:
+        self.artifacts: dict[UUID, IndexArtifact] = {}
+        self.gets = 0
+
+    def put(self, document_id: UUID, artifact: IndexArtifact) -> str:
+        self.artifacts[document_id] = artifact
+        return f"memory://{document_id}"
+
+    def get(self, document_id: UUID) -> IndexArtifact:
+        self.gets += 1
+        return self.artifacts[document_id]
+
+    def exists(self, document_id: UUID) -> bool:
+        return document_id in self.artifacts
+
+
+def make_artifact(document_id: UUID, text: str = "Introduction to RAG") -> IndexArtifact:
+    node = IndexNode(
+        node_id="root",
+        parent_id=None,
+        title="Document",
+        level=0,
+        page_start=1,
+        page_end=1,
+        text_span_ids=["s1"],
+        children=[],
+    )
+    span = TextSpan(span_id="s1", page=1, text=text)
+    return IndexArtifact(document_id=document_id, nodes=[node], spans=[span])
+
+
+def test_cache_serves_repeated_gets_and_invalidates_on_put():
+    inner = CountingStore()
+    store = CachedArtifactStore(inner, max_entries=4, max_bytes=1_000_000)
+    document_id = uuid4()
+    store.put(document_id, make_artifact(document_id, "old"))
+
+    assert store.get(document_id).spans[0].text == "old"
+    assert store.get(document_id).spans[0].text == "old"
+    assert inner.gets == 1
+
+    store.put(document_id, make_artifact(document_id, "new"))
+    assert store.get(document_id).spans[0].text == "new"
+    assert inner.gets == 2
+
+
+def test_cache_evicts_least_recently_used():
+    inner = CountingStore()
+    ids = [uuid4() for _ in range(3)]
+    for document_id in ids:
+        inner.put(document_id, make_artifact(document_id))
+    size = estimate_artifact_bytes(make_artifact(ids[0]))
+    store = CachedArtifactStore(inner, max_entries=10, max_bytes=2 * size)
+
+    store.get(ids[0])
+    store.get(ids[1])
+    store.get(ids[0])
+    store.get(ids[2])
+    inner.gets = 0
+
+    store.get(ids[0])
+    assert inner.gets == 0
+    store.get(ids[1])
+    assert inner.gets == 1
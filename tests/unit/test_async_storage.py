@@ -0,0 +1,80 @@
+import asyncio
+import time
+from uuid import UUID, uuid4
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from vectorless_rag_service.core.interfaces import ArtifactStore
+from vectorless_rag_service.core.models import BlobRef, IndexArtifact, JobStatus
+from vectorless_rag_service.storage.artifacts import ThreadedArtifactStore
+from vectorless_rag_service.storage.database import (
+    async_database_url,
+    create_async_database_engine,
+)
+from vectorless_rag_service.storage.metadata_store import AsyncSqlMetadataStore
+from vectorless_rag_service.storage.models import Base
+
+
+class SlowStore(ArtifactStore):
+    def put(self, document_id: UUID, artifact: IndexArtifact) -> str:
+        return f"memory://{document_id}"
+
+    def get(self, document_id: UUID) -> IndexArtifact:
+        time.sleep(0.2)
+        return IndexArtifact(document_id=document_id, nodes=[], spans=[])
+
+    def exists(self, document_id: UUID) -> bool:
+        return True
+
+
+def test_async_database_url_swaps_drivers():
+    assert (
+        async_database_url("sqlite:///./data/metadata.db")
+        == "sqlite+aiosqlite:///./data/metadata.db"
+    )
+    assert (
+        async_database_url("postgresql+psycopg2://u:p@db/vrs") == "postgresql+asyncpg://u:p@db/vrs"
+    )
+
+
+def test_async_metadata_store_round_trip(tmp_path):
+    url = f"sqlite:///{tmp_path / 'metadata.db'}"
+    Base.metadata.create_all(bind=create_engine(url))
+    engine = create_async_database_engine(async_database_url(url))
+    store = AsyncSqlMetadataStore(async_sessionmaker(bind=engine, expire_on_commit=False))
+
+    async def scenario():
+        document_id = await store.create_document("notes.txt")
+        await store.save_document_blobs(document_id, text_blob, None)
+        job_id = await store.create_job(document_id)
+        await store.update_job(job_id, JobStatus.running.value, 0.5, None)
+        return await store.get_text_blob(document_id), await store.get_job(job_id)
+
+    text_blob = BlobRef(key="ab/abc.gz", sha256="abc", size=5)
+    stored_blob, job = asyncio.run(scenario())
+
+    assert stored_blob == text_blob
+    assert job.status == JobStatus.running
+    assert job.progress == 0.5
+
+
+def test_threaded_artifact_store_keeps_event_loop_responsive():
+    store = ThreadedArtifactStore(SlowStore(), max_threads=4)
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        await asyncio.gather(*(store.get(uuid4()) for _ in range(4)))
+        task.cancel()
+        return ticks
+
+    # Four 200 ms reads run in parallel threads while the loop keeps ticking.
+    assert asyncio.run(scenario()) >= 10
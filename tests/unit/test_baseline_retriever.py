@@ -1,6 +1,8 @@
 from uuid import uuid4
 
 from vectorless_rag_service.core.models import IndexArtifact, IndexNode, QueryRequest, TextSpan
+from vectorless_rag_service.indexing.index_builder import BaselineIndexBuilder
+from vectorless_rag_service.retrieval import baseline_retriever
 from vectorless_rag_service.retrieval.baseline_retriever import BaselineTreeRetriever
 
 
@@ -26,3 +28,65 @@ def test_retriever_returns_citation():
 
     assert response.citations
     assert response.citations[0].page == 1
+
+
+def test_retriever_scores_from_precomputed_term_statistics():
+    document_id = uuid4()
+    text = "1 Termination clause\nEither party may terminate.\n\n2 Payment terms\nNet thirty days."
+    artifact = BaselineIndexBuilder().build(document_id, text)
+    assert artifact.term_stats is not None
+    assert artifact.term_stats.idf["termination"] > 0
+
+    request = QueryRequest(document_id=document_id, question="termination clause", top_k=3)
+    response = BaselineTreeRetriever().retrieve(artifact, request)
+
+    assert response.citations[0].node_id == "page-1-sec-1"
+
+
+def test_retriever_scores_pages_by_their_summaries():
+    document_id = uuid4()
+    filler = " ".join(["General provisions apply to every order."] * 50)
+    text = (
+        f"{filler}\n\nThe provider hosts the service in two data centres.\n\n"
+        f"{filler}\n\nInvoices are due in thirty days. Late invoices accrue interest."
+    )
+    artifact = BaselineIndexBuilder().build(document_id, text)
+    request = QueryRequest(document_id=document_id, question="when are invoices due", top_k=1)
+
+    response = BaselineTreeRetriever().retrieve(artifact, request)
+
+    # Page titles are all "Page N", so only the summaries tell the pages apart.
+    assert response.trace.visited_nodes[1] == "page-3"
+    assert "Invoices are due" in response.citations[0].excerpt
+
+
+def test_retrieve_many_matches_single_queries():
+    document_id = uuid4()
+    text = "1 Termination clause\nEither party may terminate.\n\n2 Payment terms\nNet thirty days."
+    artifact = BaselineIndexBuilder().build(document_id, text)
+    requests = [
+        QueryRequest(document_id=document_id, question=question, top_k=2)
+        for question in ["payment terms", "termination", "unrelated question"]
+    ]
+    retriever = BaselineTreeRetriever()
+
+    batched = retriever.retrieve_many(artifact, requests)
+
+    assert batched == [retriever.retrieve(artifact, request) for request in requests]
+
+
+def test_single_query_scores_only_the_levels_it_walks(monkeypatch):
+    document_id = uuid4()
+    filler = " ".join(["Background material."] * 120)
+    text = "\n\n".join(f"{n} Section {n}\n{filler}" for n in range(1, 6))
+    artifact = BaselineIndexBuilder().build(document_id, text)
+    scored: list[str] = []
+    monkeypatch.setattr(
+        baseline_retriever, "score_text", lambda query, title: scored.append(title) or 0.0
+    )
+
+    BaselineTreeRetriever().retrieve(
+        artifact, QueryRequest(document_id=document_id, question="payment terms")
+    )
+
+    assert 0 < len(scored) < len(artifact.nodes)
@@ -0,0 +1,63 @@
+from uuid import uuid4
+
+from vectorless_rag_service.indexing.index_builder import BaselineIndexBuilder
+from vectorless_rag_service.storage.artifacts import LocalArtifactStore
+from vectorless_rag_service.storage.binary_codec import (
+    MappedArtifact,
+    decode_artifact,
+    encode_artifact,
+)
+from vectorless_rag_service.storage.convert import convert_local_artifacts
+
+SAMPLE_TEXT = (
+    "1 Overview\nRAG without vectors.\n\n2 Details\nTree walk over pages.\n\nClosing notes."
+)
+
+
+def test_binary_round_trip_matches_model():
+    artifact = BaselineIndexBuilder().build(uuid4(), SAMPLE_TEXT)
+
+    assert decode_artifact(encode_artifact(artifact)) == artifact
+
+
+def test_round_trip_without_postings_or_term_stats():
+    artifact = BaselineIndexBuilder().build(uuid4(), SAMPLE_TEXT)
+    artifact = artifact.model_copy(update={"postings": None, "term_stats": None})
+
+    assert decode_artifact(encode_artifact(artifact)) == artifact
+
+
+def test_term_postings_are_read_on_demand():
+    artifact = BaselineIndexBuilder().build(uuid4(), SAMPLE_TEXT)
+    assert artifact.postings is not None
+    data = encode_artifact(artifact)
+    reads: list[tuple[int, int]] = []
+
+    class Recording(MappedArtifact):
+        def _read(self, offset, length):
+            reads.append((offset, length))
+            return super()._read(offset, length)
+
+    mapped = Recording(data)
+    opened = sum(length for _, length in reads)
+    assert opened < len(data) // 4
+
+    for term, entry in artifact.postings.postings.items():
+        assert mapped.term_postings(term) == (list(entry[0]), list(entry[1]))
+    assert mapped.term_postings("absent") is None
+
+
+def test_local_store_maps_binary_and_converts_json(tmp_path):
+    document_id = uuid4()
+    artifact = BaselineIndexBuilder().build(document_id, SAMPLE_TEXT)
+    LocalArtifactStore(str(tmp_path), artifact_format="json").put(document_id, artifact)
+
+    assert convert_local_artifacts(str(tmp_path), "binary") == [document_id]
+    assert not (tmp_path / f"{document_id}.json").exists()
+
+    store = LocalArtifactStore(str(tmp_path), artifact_format="binary")
+    assert store.get(document_id) == artifact
+    with store.open_mapped(document_id) as mapped:
+        assert mapped.node_count == len(artifact.nodes)
+        assert mapped.get_node("page-1") == artifact.nodes[1]
+        assert mapped.span_at(0) == artifact.spans[0]
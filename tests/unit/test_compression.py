@@ -0,0 +1,55 @@
+from uuid import uuid4
+
+import pytest
+
+from vectorless_rag_service.config import settings
+from vectorless_rag_service.indexing.index_builder import BaselineIndexBuilder
+from vectorless_rag_service.storage.artifacts import LocalArtifactStore, build_artifact_store
+from vectorless_rag_service.storage.compression import GZIP_MAGIC, ZSTD_MAGIC, detect_codec
+from vectorless_rag_service.storage.convert import convert_local_artifacts
+
+SAMPLE_TEXT = "1 Terms\n\nInvoices are due in thirty days.\n\n2 Exit\n\nNinety days notice."
+
+
+@pytest.mark.parametrize("artifact_format", ["json", "binary"])
+@pytest.mark.parametrize(("compression", "magic"), [("gzip", GZIP_MAGIC), ("zstd", ZSTD_MAGIC)])
+def test_compressed_artifacts_round_trip(tmp_path, artifact_format, compression, magic):
+    document_id = uuid4()
+    artifact = BaselineIndexBuilder().build(document_id, SAMPLE_TEXT)
+    store = LocalArtifactStore(str(tmp_path), artifact_format, compression=compression)
+
+    path = store.put(document_id, artifact)
+
+    with open(path, "rb") as handle:
+        assert handle.read(len(magic)) == magic
+    assert store.get(document_id) == artifact
+
+
+def test_uncompressed_artifacts_still_load_and_can_be_recompressed(tmp_path):
+    document_id = uuid4()
+    artifact = BaselineIndexBuilder().build(document_id, SAMPLE_TEXT)
+    # Artifacts written before compression existed: indented, uncompressed JSON.
+    (tmp_path / f"{document_id}.json").write_text(artifact.model_dump_json(indent=2))
+
+    store = LocalArtifactStore(str(tmp_path), "json", compression="zstd", compression_level=9)
+    assert store.get(document_id) == artifact
+
+    assert convert_local_artifacts(str(tmp_path), "json", "gzip") == [document_id]
+    data = (tmp_path / f"{document_id}.json").read_bytes()
+    assert detect_codec(data).name == "gzip"
+    assert store.get(document_id) == artifact
+
+
+@pytest.mark.parametrize(("artifact_format", "codec"), [("json", "gzip"), ("binary", None)])
+def test_default_compression_keeps_binary_artifacts_mappable(
+    tmp_path, monkeypatch, artifact_format, codec
+):
+    monkeypatch.setattr(settings.storage, "local_path", str(tmp_path))
+    monkeypatch.setattr(settings.storage, "artifact_format", artifact_format)
+    monkeypatch.setattr(settings.storage, "artifact_compression", None)
+    monkeypatch.setattr(settings.artifact_cache, "enabled", False)
+
+    store = build_artifact_store()
+
+    assert isinstance(store, LocalArtifactStore)
+    assert (store.codec.name if store.codec else None) == codec
@@ -0,0 +1,47 @@
+from pathlib import Path
+from uuid import uuid4
+
+from vectorless_rag_service.indexing.index_builder import BaselineIndexBuilder
+from vectorless_rag_service.indexing.parser import iter_text_pages
+from vectorless_rag_service.storage.blobs import LocalBlobStore
+from vectorless_rag_service.storage.document_text import DocumentTextStore
+
+
+class CountingBlobStore(LocalBlobStore):
+    def __init__(self, base_path: str) -> None:
+        super().__init__(base_path)
+        self.writes = 0
+
+    def put_file(self, key: str, path: Path) -> str:
+        self.writes += 1
+        return super().put_file(key, path)
+
+
+def test_pages_round_trip_and_feed_the_builder(tmp_path):
+    store = DocumentTextStore(LocalBlobStore(str(tmp_path)))
+    text = "\n\n".join(
+        f"{idx} Heading {idx}\n\nBody text with naïve words {idx}." for idx in range(400)
+    )
+
+    ref = store.put_pages(iter_text_pages(text))
+
+    assert ref.size > (tmp_path / ref.key).stat().st_size
+    assert list(store.iter_pages(ref)) == list(iter_text_pages(text))
+    builder = BaselineIndexBuilder()
+    document_id = uuid4()
+    assert builder.build_pages(document_id, store.iter_pages(ref)) == builder.build(
+        document_id, text
+    )
+
+
+def test_identical_content_is_stored_once(tmp_path):
+    blobs = CountingBlobStore(str(tmp_path))
+    store = DocumentTextStore(blobs)
+    upload = tmp_path / "upload.txt"
+    upload.write_bytes(b"same content")
+
+    first = store.put_raw_file(upload)
+    second = store.put_raw_bytes(b"same content")
+
+    assert first == second
+    assert blobs.writes == 1
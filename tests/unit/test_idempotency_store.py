@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from vectorless_rag_service.storage.database import (
+    async_database_url,
+    create_async_database_engine,
+)
+from vectorless_rag_service.storage.idempotency import (
+    AsyncIdempotencyStore,
+    IdempotencyKeyInProgress,
+    IdempotencyKeyReused,
+)
+from vectorless_rag_service.storage.models import Base
+
+
+def make_store(tmp_path, ttl_seconds: float) -> AsyncIdempotencyStore:
+    url = f"sqlite:///{tmp_path / 'idempotency.db'}"
+    Base.metadata.create_all(bind=create_engine(url))
+    engine = create_async_database_engine(async_database_url(url))
+    return AsyncIdempotencyStore(async_sessionmaker(bind=engine), ttl_seconds=ttl_seconds)
+
+
+def test_completed_response_is_replayed_to_its_own_request(tmp_path):
+    store = make_store(tmp_path, ttl_seconds=60)
+
+    async def scenario():
+        assert await store.reserve("scope", "key", "request-a") is None
+        await store.complete("scope", "key", 200, {"value": 1})
+        replay = await store.reserve("scope", "key", "request-a")
+        with pytest.raises(IdempotencyKeyReused):
+            await store.reserve("scope", "key", "request-b")
+        return replay, await store.reserve("other", "key", "request-b")
+
+    replay, other_scope = asyncio.run(scenario())
+
+    assert replay is not None and replay.body == {"value": 1}
+    assert other_scope is None
+
+
+def test_concurrent_requests_with_one_key_run_once(tmp_path):
+    store = make_store(tmp_path, ttl_seconds=60)
+
+    async def scenario():
+        return await asyncio.gather(
+            *(store.reserve("scope", "key", "request-a") for _ in range(5)),
+            return_exceptions=True,
+        )
+
+    outcomes = asyncio.run(scenario())
+
+    assert outcomes.count(None) == 1
+    assert all(isinstance(o, IdempotencyKeyInProgress) for o in outcomes if o is not None)
+
+
+def test_released_and_expired_keys_can_be_reserved_again(tmp_path):
+    store = make_store(tmp_path, ttl_seconds=0)
+
+    async def scenario():
+        await store.reserve("scope", "released", "request-a")
+        await store.release("scope", "released")
+        await store.reserve("scope", "expired", "request-a")
+        await store.complete("scope", "expired", 200, {"value": 1})
+        return (
+            await store.get("scope", "expired"),
+            await store.reserve("scope", "released", "request-b"),
+            await store.reserve("scope", "expired", "request-b"),
+        )
+
+    expired, released, replaced = asyncio.run(scenario())
+
+    assert expired is None
+    assert released is None
+    assert replaced is None
@@ -0,0 +1,164 @@
+import random
+from uuid import uuid4
+
+from vectorless_rag_service.indexing.index_builder import BaselineIndexBuilder
+from vectorless_rag_service.indexing.parser import iter_sections, parse_text
+
+
+def reference_tree(text: str, max_pages: int = 300) -> list[tuple[str, str | None, str, list[str]]]:
+    """The original quadratic build: paginate, then substring-match spans into sections."""
+    paragraphs = text.split("\n\n")
+    pages: list[str] = []
+    current: list[str] = []
+    for para in paragraphs:
+        current.append(para)
+        if len("\n\n".join(current)) > 2000:
+            pages.append("\n\n".join(current))
+            current = []
+            if len(pages) >= max_pages:
+                break
+    if current and len(pages) < max_pages:
+        pages.append("\n\n".join(current))
+
+    tree = []
+    for number, page_text in enumerate(pages, start=1):
+        spans = [
+            (f"p{number}-s{idx}", para.strip())
+            for idx, para in enumerate(page_text.split("\n\n"), start=1)
+        ]
+        page_ids = [span_id for span_id, _ in spans]
+        tree.append((f"page-{number}", "root", f"Page {number}", page_ids))
+        for idx, (title, section_text) in enumerate(iter_sections(page_text), start=1):
+            section_ids = [span_id for span_id, span_text in spans if span_text in section_text]
+            tree.append(
+                (f"page-{number}-sec-{idx}", f"page-{number}", title, section_ids or page_ids)
+            )
+    return tree
+
+
+def random_document(rng: random.Random, paragraphs: int) -> str:
+    counter = iter(range(1_000_000))
+    parts = []
+    for _ in range(paragraphs):
+        kind = rng.random()
+        words = " ".join(f"w{next(counter)}" for _ in range(rng.randint(5, 60)))
+        if kind < 0.15:
+            parts.append(f"{rng.randint(1, 9)}.{rng.randint(1, 9)} Heading {next(counter)}")
+        elif kind < 0.25:
+            parts.append(f"{rng.randint(1, 9)} Title {next(counter)}\n{words}")
+        elif kind < 0.3:
+            parts.append("   ")
+        elif kind < 0.35:
+            parts.append(f"  {words}\n   indented {next(counter)}")
+        else:
+            parts.append(words.replace(" w", "\nw", rng.randint(0, 2)))
+    return "\n\n".join(parts)
+
+
+def test_builder_matches_reference_tree():
+    rng = random.Random(11)
+    for _ in range(20):
+        text = random_document(rng, rng.randint(1, 300))
+        artifact = BaselineIndexBuilder(max_pages=40).build(uuid4(), text)
+        parents = [
+            ("root" if node.parent_id and node.parent_id.startswith("doc-") else node.parent_id)
+            for node in artifact.nodes[1:]
+        ]
+        built = [
+            (node.node_id, parent, node.title, node.text_span_ids)
+            for node, parent in zip(artifact.nodes[1:], parents, strict=True)
+        ]
+        assert built == reference_tree(text, max_pages=40)
+
+
+def test_page_children_include_every_section():
+    text = "1 Scope\n\nCovers hosting.\n\n2 Terms\n\nNet thirty.\n\n3 Exit\n\nNotice period."
+    artifact = BaselineIndexBuilder().build(uuid4(), text)
+    page = artifact.nodes[1]
+
+    assert page.children == ["page-1-sec-1", "page-1-sec-2", "page-1-sec-3"]
+    assert all(artifact.nodes[idx].children == [] for idx in range(2, 5))
+
+
+def assert_same_index(incremental, full):
+    assert incremental.nodes == full.nodes
+    assert incremental.spans == full.spans
+    assert incremental.term_stats == full.term_stats
+    assert incremental.page_hashes == full.page_hashes
+    assert incremental.postings.postings == full.postings.postings
+    assert incremental.postings.idf == full.postings.idf
+    assert incremental.postings.span_lengths == full.postings.span_lengths
+    for term, bound in full.postings.upper_bounds.items():
+        # Bounds of untouched terms are rescaled rather than recomputed: valid, maybe loose.
+        assert incremental.postings.upper_bounds[term] >= bound - 1e-9
+
+
+def test_rebuild_from_previous_artifact_matches_full_build():
+    rng = random.Random(5)
+    builder = BaselineIndexBuilder(max_pages=40)
+    document_id = uuid4()
+    paragraphs = random_document(rng, 400).split("\n\n")
+    previous = builder.build(document_id, "\n\n".join(paragraphs))
+
+    edits = {
+        "word": paragraphs[:50] + [paragraphs[50] + " amended"] + paragraphs[51:],
+        "insert": paragraphs[:120] + ["9 Added Clause\nnew terms apply"] + paragraphs[120:],
+        "delete": paragraphs[:30] + paragraphs[45:],
+        "unchanged": paragraphs,
+    }
+    for edited in edits.values():
+        text = "\n\n".join(edited)
+        incremental = builder.build_pages(
+            document_id, parse_text(text, builder.max_pages), previous=previous
+        )
+        assert_same_index(incremental, builder.build(document_id, text))
+
+
+def test_previous_artifact_of_another_document_is_ignored():
+    builder = BaselineIndexBuilder()
+    text = "1 Scope\n\nCovers hosting."
+    other = builder.build(uuid4(), text)
+    document_id = uuid4()
+
+    artifact = builder.build_pages(document_id, parse_text(text, 300), previous=other)
+
+    assert artifact.nodes[0].node_id == f"doc-{document_id}"
+
+
+def test_summaries_are_built_bottom_up():
+    text = (
+        "1 Termination\n\nEither party may terminate with ninety days notice. "
+        "Termination for cause is immediate.\n\n"
+        "2 Payment terms\n\nInvoices are due in thirty days. Late invoices accrue interest."
+    )
+    artifact = BaselineIndexBuilder().build(uuid4(), text)
+    root, page, termination, payment = artifact.nodes
+
+    assert termination.summary.startswith("Either party may terminate")
+    assert payment.keywords[0] == "invoices"
+    assert "invoices" in page.keywords and "terminate" in page.keywords
+    # Parents are summarized from their children's summaries, not from span text.
+    assert all(sentence in text for sentence in page.summary.split(". "))
+    assert (root.summary, root.keywords) == (page.summary, page.keywords)
+
+
+def test_rebuild_summarizes_pages_reused_from_an_artifact_without_summaries():
+    rng = random.Random(9)
+    builder = BaselineIndexBuilder(max_pages=40)
+    document_id = uuid4()
+    text = random_document(rng, 200)
+    full = builder.build(document_id, text)
+    legacy = full.model_copy(
+        update={
+            "nodes": [
+                node.model_copy(update={"summary": "", "keywords": []}) for node in full.nodes
+            ]
+        }
+    )
+
+    incremental = builder.build_pages(
+        document_id, parse_text(text, builder.max_pages), previous=legacy
+    )
+
+    assert_same_index(incremental, full)
+    assert legacy.nodes[1].keywords == []
@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+
+from vectorless_rag_service.indexing.worker import IndexWorker
+from vectorless_rag_service.storage.job_queue import SqlJobQueue
+from vectorless_rag_service.storage.models import Base, Job
+
+
+@pytest.fixture
+def queue(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'queue.db'}", future=True)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    return SqlJobQueue(session_factory, lease_seconds=30, max_attempts=2, backoff_base_seconds=60)
+
+
+def job_row(queue, job_id):
+    with queue.session_factory() as session:
+        return session.get(Job, str(job_id))
+
+
+def test_each_job_is_leased_once(queue):
+    job_id = queue.enqueue(uuid4())
+
+    leased = queue.lease("worker-a")
+
+    assert leased is not None and leased.job_id == job_id
+    assert queue.lease("worker-b") is None
+    assert not queue.complete(job_id, "worker-b")
+    assert queue.complete(job_id, "worker-a")
+    assert job_row(queue, job_id).status == "succeeded"
+
+
+def test_failed_jobs_retry_with_backoff_then_fail(queue):
+    job_id = queue.enqueue(uuid4())
+
+    first = queue.lease("worker-a")
+    assert queue.fail(first, "worker-a", "boom")
+    row = job_row(queue, job_id)
+    assert row.status == "pending"
+    assert row.available_at > datetime.utcnow() + timedelta(seconds=50)
+    assert queue.lease("worker-a") is None
+
+    with queue.session_factory() as session:
+        session.execute(update(Job).values(available_at=datetime.utcnow()))
+        session.commit()
+    second = queue.lease("worker-a")
+    assert second.attempts == 2
+    assert not queue.fail(second, "worker-a", "boom again")
+    assert job_row(queue, job_id).status == "failed"
+
+
+def test_expired_leases_are_reclaimed(queue):
+    job_id = queue.enqueue(uuid4())
+    queue.lease("crashed-worker")
+    with queue.session_factory() as session:
+        expired = datetime.utcnow() - timedelta(seconds=1)
+        session.execute(update(Job).values(lease_expires_at=expired))
+        session.commit()
+
+    assert queue.reclaim_expired() == 1
+    assert not queue.heartbeat(job_id, "crashed-worker")
+    assert queue.lease("worker-b").job_id == job_id
+
+
+def test_worker_runs_pipeline_and_completes_job(queue):
+    processed = []
+
+    class Pipeline:
+        def run(self, document_id):
+            processed.append(document_id)
+            return "memory://artifact"
+
+    document_id = uuid4()
+    job_id = queue.enqueue(document_id)
+    worker = IndexWorker(queue, Pipeline(), "worker-a", heartbeat_seconds=5, poll_seconds=0.1)
+
+    assert worker.run_once()
+    assert not worker.run_once()
+    assert processed == [document_id]
+    assert job_row(queue, job_id).status == "succeeded"
+    assert queue.depth() == 0
@@ -0,0 +1,158 @@
+import threading
+import time
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from vectorless_rag_service.core.interfaces import LLMClient
+from vectorless_rag_service.core.models import QueryRequest
+from vectorless_rag_service.indexing.index_builder import BaselineIndexBuilder
+from vectorless_rag_service.llm.client import HttpLLMClient, LLMTimeout
+from vectorless_rag_service.llm.fake_server import choose, create_fake_llm_app
+from vectorless_rag_service.retrieval.baseline_retriever import BaselineTreeRetriever
+from vectorless_rag_service.retrieval.llm_navigator import LLMNavigationRetriever
+
+TEXT = (
+    "1 Termination\n\nEither party may terminate with notice.\n\n"
+    "2 Payment terms\n\nInvoices are due in thirty days.\n\n"
+    "3 Liability\n\nLiability is capped at fees paid."
+)
+
+
+class FakeClient(LLMClient):
+    """Answers like the fake server, recording prompts and peak concurrency."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.prompts: list[str] = []
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def complete_json(self, prompt: str, timeout: float | None = None) -> dict[str, object]:
+        with self.lock:
+            self.prompts.append(prompt)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            if timeout is not None and self.delay > timeout:
+                time.sleep(timeout)
+                raise LLMTimeout("timed out")
+            time.sleep(self.delay)
+            return choose(prompt)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+def navigator(client: LLMClient, max_concurrency: int = 4, deadline: float = 5.0):
+    return LLMNavigationRetriever(
+        client,
+        BaselineTreeRetriever(),
+        max_concurrency=max_concurrency,
+        deadline_seconds=deadline,
+        cache_entries=100,
+        preview_chars=80,
+    )
+
+
+def test_siblings_share_one_prompt_and_decisions_are_cached():
+    artifact = BaselineIndexBuilder().build(uuid4(), TEXT)
+    client = FakeClient()
+    retriever = navigator(client)
+    request = QueryRequest(document_id=artifact.document_id, question="payment invoices", top_k=1)
+
+    first = retriever.retrieve(artifact, request)
+    repeat = retriever.retrieve(
+        artifact, request.model_copy(update={"question": "  Payment   INVOICES"})
+    )
+
+    assert first.citations[0].title == "Payment terms"
+    # The page level has a single child and needs no call; its three sections need one.
+    assert len(client.prompts) == 1
+    for title in ("Termination", "Payment terms", "Liability"):
+        assert title in client.prompts[0]
+    assert repeat.citations[0].title == "Payment terms"
+    assert repeat.trace.decisions[-1].startswith("cache selected")
+
+
+def test_query_falls_back_to_baseline_when_deadline_passes():
+    artifact = BaselineIndexBuilder().build(uuid4(), TEXT)
+    retriever = navigator(FakeClient(delay=1.0), deadline=0.05)
+    request = QueryRequest(document_id=artifact.document_id, question="liability cap")
+    before = REGISTRY.get_sample_value("vrs_llm_navigation_fallbacks_total", {"reason": "deadline"})
+
+    start = time.monotonic()
+    response = retriever.retrieve(artifact, request)
+
+    assert time.monotonic() - start < 0.5
+    assert response.trace.degraded
+    baseline = BaselineTreeRetriever().retrieve(artifact, request)
+    assert response.model_copy(update={"trace": baseline.trace}) == baseline
+    after = REGISTRY.get_sample_value("vrs_llm_navigation_fallbacks_total", {"reason": "deadline"})
+    assert after == (before or 0.0) + 1
+
+
+def test_concurrent_llm_calls_are_capped():
+    artifact = BaselineIndexBuilder().build(uuid4(), TEXT)
+    client = FakeClient(delay=0.02)
+    retriever = navigator(client, max_concurrency=2)
+    requests = [
+        QueryRequest(document_id=artifact.document_id, question=f"payment {index}")
+        for index in range(8)
+    ]
+
+    responses = retriever.retrieve_many(artifact, requests)
+
+    assert len(client.prompts) == 8
+    assert client.peak == 2
+    assert all(response.trace.decisions[-1].startswith("llm") for response in responses)
+
+
+def test_http_client_navigates_with_the_fake_server():
+    artifact = BaselineIndexBuilder().build(uuid4(), TEXT)
+    http = TestClient(create_fake_llm_app(), base_url="http://testserver/v1")
+    retriever = navigator(HttpLLMClient("unused", "fake", http=http))
+    request = QueryRequest(document_id=artifact.document_id, question="terminate with notice")
+
+    response = retriever.retrieve(artifact, request)
+
+    assert response.citations[0].title == "Termination"
+    assert http.get("stats").json() == {"calls": 1}
+
+
+def test_concurrent_identical_questions_share_one_call():
+    artifact = BaselineIndexBuilder().build(uuid4(), TEXT)
+    client = FakeClient(delay=0.05)
+    retriever = navigator(client, max_concurrency=4)
+    request = QueryRequest(document_id=artifact.document_id, question="liability cap", top_k=1)
+
+    responses = retriever.retrieve_many(artifact, [request] * 6)
+
+    assert len(client.prompts) == 1
+    assert {response.citations[0].title for response in responses} == {"Liability"}
+
+
+def test_reindexed_document_is_navigated_afresh():
+    document_id = uuid4()
+    filler = " ".join(["Background material without the answer."] * 60)
+
+    def document(answer_page: int) -> str:
+        # One paragraph of over 2000 characters per page, so both builds have the same
+        # page ids and titles.
+        return "\n\n".join(
+            f"Invoices are due in thirty days. {filler}" if page == answer_page else filler
+            for page in range(1, 4)
+        )
+
+    retriever = navigator(FakeClient())
+    request = QueryRequest(document_id=document_id, question="invoices due", top_k=1)
+    builder = BaselineIndexBuilder()
+
+    before = retriever.retrieve(builder.build(document_id, document(1)), request)
+    after = retriever.retrieve(builder.build(document_id, document(3)), request)
+
+    assert before.trace.visited_nodes[1] == "page-1"
+    assert after.trace.visited_nodes[1] == "page-3"
+    assert "thirty days" in after.citations[0].excerpt
@@ -0,0 +1,92 @@
+from datetime import datetime
+
+from alembic import command
+from sqlalchemy import create_engine, inspect, select, text
+
+from vectorless_rag_service.core.models import BlobRef
+from vectorless_rag_service.storage.blobs import LocalBlobStore
+from vectorless_rag_service.storage.document_text import DocumentTextStore
+from vectorless_rag_service.storage.migrations import alembic_config, upgrade_database
+from vectorless_rag_service.storage.models import Base, Document, Job
+
+CREATED = datetime(2024, 1, 1)
+
+
+def _schema(engine) -> dict[str, set[str]]:
+    inspector = inspect(engine)
+    return {
+        table: {column["name"] for column in inspector.get_columns(table)}
+        for table in inspector.get_table_names()
+        if table != "alembic_version"
+    }
+
+
+def _model_schema() -> dict[str, set[str]]:
+    return {table.name: set(table.columns.keys()) for table in Base.metadata.sorted_tables}
+
+
+def test_upgrade_moves_document_text_into_blobs(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'meta.db'}")
+    with engine.begin() as connection:
+        # A database created before migrations: the baseline tables, unversioned.
+        command.upgrade(alembic_config(connection), "0001")
+        connection.execute(text("DROP TABLE alembic_version"))
+        connection.execute(
+            text("INSERT INTO documents VALUES ('doc-1', NULL, :text, :created)"),
+            {"text": "1 Terms\n\nNet thirty.", "created": CREATED},
+        )
+        connection.execute(
+            text("INSERT INTO jobs VALUES ('job-1', 'doc-1', 'pending', 0, NULL, :created)"),
+            {"created": CREATED},
+        )
+    text_store = DocumentTextStore(LocalBlobStore(str(tmp_path / "blobs")))
+
+    upgrade_database(engine, text_store)
+
+    assert _schema(engine) == _model_schema()
+    with engine.connect() as connection:
+        key, sha256, size = connection.execute(
+            select(Document.text_key, Document.text_sha256, Document.text_bytes)
+        ).one()
+        job = connection.execute(select(Job.attempts, Job.max_attempts, Job.available_at)).one()
+    pages = text_store.iter_pages(BlobRef(key=key, sha256=sha256, size=size))
+    assert [page.text for page in pages] == ["1 Terms\n\nNet thirty."]
+    assert tuple(job) == (0, 3, CREATED)
+
+    # A second start finds nothing left to do.
+    upgrade_database(engine, text_store)
+    assert _schema(engine) == _model_schema()
+
+
+def test_empty_database_gets_the_model_schema(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'meta.db'}")
+
+    upgrade_database(engine)
+
+    assert _schema(engine) == _model_schema()
+    with engine.connect() as connection:
+        assert connection.scalar(text("SELECT version_num FROM alembic_version")) == "0003"
+
+
+def test_downgrade_restores_document_text(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'meta.db'}")
+    text_store = DocumentTextStore(LocalBlobStore(str(tmp_path / "blobs")))
+    document_text = "\n\n".join(f"Clause {n}. " + "Net thirty. " * 40 for n in range(1, 8))
+    with engine.begin() as connection:
+        command.upgrade(alembic_config(connection), "0001")
+        connection.execute(
+            text("INSERT INTO documents VALUES ('doc-1', NULL, :text, :created)"),
+            {"text": document_text, "created": CREATED},
+        )
+    upgrade_database(engine, text_store)
+
+    with engine.begin() as connection:
+        command.downgrade(alembic_config(connection, text_store), "0001")
+
+    assert _schema(engine) == {
+        "documents": {"id", "filename", "text", "created_at"},
+        "jobs": {"id", "document_id", "status", "progress", "error", "created_at"},
+        "index_artifacts": {"document_id", "uri", "created_at"},
+    }
+    with engine.connect() as connection:
+        assert connection.scalar(text("SELECT text FROM documents")) == document_text
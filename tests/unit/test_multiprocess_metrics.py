@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+
+# Each snippet runs in its own interpreter: prometheus_client only switches to shared
+# files when PROMETHEUS_MULTIPROC_DIR is set before it is imported.
+WORKER = """
+import sys
+from vectorless_rag_service.observability.metrics import JOB_QUEUE_DEPTH, REQUEST_COUNT
+
+REQUEST_COUNT.labels("GET", "/healthz", "200").inc()
+JOB_QUEUE_DEPTH.set(float(sys.argv[1]))
+"""
+SCRAPE = """
+import sys
+from types import SimpleNamespace
+from prometheus_client import generate_latest
+from vectorless_rag_service import gunicorn_conf
+from vectorless_rag_service.observability.metrics import exposition_registry
+
+for pid in sys.argv[1:]:
+    gunicorn_conf.child_exit(None, SimpleNamespace(pid=int(pid)))
+print(generate_latest(exposition_registry()).decode())
+"""
+
+
+def run(env: dict[str, str], code: str, *args: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, "-c", code, *args], env=env, capture_output=True, check=True, text=True
+    )
+
+
+def test_metrics_aggregate_across_worker_processes(tmp_path):
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    workers = []
+    for depth in ("3", "7"):
+        worker = subprocess.Popen([sys.executable, "-c", WORKER, depth], env=env)
+        assert worker.wait() == 0
+        workers.append(worker)
+
+    before_exit = run(env, SCRAPE).stdout
+    after_exit = run(env, SCRAPE, str(workers[1].pid)).stdout
+
+    healthz = 'vrs_requests_total{method="GET",route="/healthz",status="200"} 2.0'
+    assert healthz in before_exit
+    assert "vrs_job_queue_depth 7.0" in before_exit
+    # The exited worker's count stays in the total; its live gauge value is dropped.
+    assert healthz in after_exit
+    assert "vrs_job_queue_depth 3.0" in after_exit
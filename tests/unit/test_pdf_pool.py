@@ -0,0 +1,105 @@
+import asyncio
+import os
+import signal
+import time
+
+import pytest
+
+from vectorless_rag_service.indexing.pdf_pool import PdfParsePool, PdfParseTimeout
+
+
+def write_pdf(path, page_texts):
+    """Write a minimal single-font PDF with one line of text per page."""
+    page_count = len(page_texts)
+    font_id = 3 + 2 * page_count
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids ["
+        + b" ".join(f"{3 + 2 * idx} 0 R".encode() for idx in range(page_count))
+        + f"] /Count {page_count} >>".encode(),
+    ]
+    for idx, text in enumerate(page_texts):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * idx} 0 R "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> >>".encode()
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream")
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    )
+    path.write_bytes(bytes(out))
+
+
+def test_pool_parses_page_ranges_in_order(tmp_path):
+    path = tmp_path / "doc.pdf"
+    write_pdf(path, [f"Page text {number}" for number in range(1, 8)])
+    pool = PdfParsePool(workers=2, pages_per_task=3, page_timeout_seconds=10.0)
+    try:
+        pages = asyncio.run(pool.parse(str(path), max_pages=6))
+    finally:
+        pool.shutdown()
+
+    assert [page.page_number for page in pages] == [1, 2, 3, 4, 5, 6]
+    assert [page.text.strip() for page in pages] == [f"Page text {n}" for n in range(1, 7)]
+
+
+def sleep_then_pid(seconds):
+    time.sleep(seconds)
+    return os.getpid()
+
+
+def ignore_alarm_and_sleep(seconds):
+    # Stands in for a page stuck where SIGALRM cannot interrupt it.
+    signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+    time.sleep(seconds)
+
+
+def test_stuck_worker_is_killed_and_replaced():
+    pool = PdfParsePool(
+        workers=1, pages_per_task=3, page_timeout_seconds=1.0, timeout_slack_seconds=0.2
+    )
+
+    async def scenario():
+        first = await pool.run(sleep_then_pid, 0, budget_seconds=1.0)
+        with pytest.raises(PdfParseTimeout):
+            await pool.run(ignore_alarm_and_sleep, 30, budget_seconds=0.1)
+        return first, await pool.run(sleep_then_pid, 0, budget_seconds=1.0)
+
+    try:
+        first, second = asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+
+    assert first != second
+    with pytest.raises(ProcessLookupError):
+        os.kill(first, 0)
+
+
+def test_budget_starts_when_a_worker_picks_the_task_up():
+    pool = PdfParsePool(
+        workers=1, pages_per_task=3, page_timeout_seconds=1.0, timeout_slack_seconds=0.0
+    )
+
+    async def scenario():
+        # The second task queues behind the first for longer than its own budget.
+        return await asyncio.gather(
+            *(pool.run(sleep_then_pid, 0.4, budget_seconds=0.6) for _ in range(2))
+        )
+
+    try:
+        pids = asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+
+    assert pids[0] == pids[1]
@@ -0,0 +1,60 @@
+import random
+from collections import Counter
+from uuid import uuid4
+
+import pytest
+
+from vectorless_rag_service.core.models import QueryRequest
+from vectorless_rag_service.indexing.index_builder import BaselineIndexBuilder
+from vectorless_rag_service.indexing.terms import bm25_term_score, tokenize
+from vectorless_rag_service.retrieval.pageindex_retriever import PageIndexRetriever
+from vectorless_rag_service.retrieval.postings_retriever import top_k_spans
+
+WORDS = ["alpha", "beta", "gamma", "delta", "epsilon", "zeta", "eta", "theta", "iota", "kappa"]
+
+
+def exhaustive_top_k(postings, query_counts, k):
+    scores: Counter[int] = Counter()
+    for term, query_tf in query_counts.items():
+        if term not in postings.postings:
+            continue
+        span_ids, tfs = postings.postings[term]
+        for span_idx, tf in zip(span_ids, tfs, strict=True):
+            scores[span_idx] += bm25_term_score(
+                postings.idf[term] * query_tf,
+                tf,
+                postings.span_lengths[span_idx],
+                postings.avg_span_length,
+            )
+    return sorted(scores.values(), reverse=True)[:k]
+
+
+def test_max_score_matches_exhaustive_scoring():
+    rng = random.Random(7)
+    paragraphs = [" ".join(rng.choices(WORDS, k=rng.randint(3, 30))) for _ in range(200)]
+    artifact = BaselineIndexBuilder().build(uuid4(), "\n\n".join(paragraphs))
+    assert artifact.postings is not None
+
+    for question in ["alpha beta", "kappa kappa iota", "theta delta zeta eta"]:
+        query_counts = Counter(tokenize(question))
+        found = [score for score, _ in top_k_spans(artifact.postings, query_counts, 5)]
+        expected = exhaustive_top_k(artifact.postings, query_counts, 5)
+        assert found == pytest.approx(expected)
+
+
+def test_content_mode_rolls_spans_up_to_sections():
+    document_id = uuid4()
+    text = (
+        "1 Scope\n\nThis agreement covers hosting.\n\n"
+        "2 Obligations\n\nThe provider keeps backups for thirty days."
+    )
+    artifact = BaselineIndexBuilder().build(document_id, text)
+    request = QueryRequest(
+        document_id=document_id, question="How long are backups kept?", top_k=1, mode="content"
+    )
+
+    response = PageIndexRetriever().retrieve(artifact, request)
+
+    assert response.citations[0].title == "Obligations"
+    assert "backups" in response.citations[0].excerpt
+    assert response.trace.visited_nodes == ["page-1", "page-1-sec-2"]
@@ -0,0 +1,116 @@
+import asyncio
+import cProfile
+import os
+from uuid import UUID, uuid4
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from vectorless_rag_service.config import settings
+from vectorless_rag_service.indexing.worker import IndexWorker
+from vectorless_rag_service.observability.profiling import (
+    ProfileStore,
+    ProfilingMiddleware,
+    capture,
+)
+from vectorless_rag_service.storage.job_queue import SqlJobQueue
+from vectorless_rag_service.storage.models import Base
+
+
+def build_index(document_id):
+    return sorted(str(document_id) * 100)
+
+
+class Pipeline:
+    def run(self, document_id):
+        build_index(document_id)
+        return "memory://artifact"
+
+
+def test_sampled_index_jobs_are_profiled(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'queue.db'}", future=True)
+    Base.metadata.create_all(bind=engine)
+    queue = SqlJobQueue(sessionmaker(bind=engine), lease_seconds=30, max_attempts=2)
+    store = ProfileStore(str(tmp_path / "profiles"), max_profiles=10)
+    job_id = queue.enqueue(uuid4())
+    worker = IndexWorker(
+        queue, Pipeline(), "worker-a", 5, 0.1, profiles=store, profile_sample_rate=1.0
+    )
+
+    assert worker.run_once()
+
+    assert store.path(job_id).exists()
+    assert "build_index" in store.summary(job_id)
+
+
+def test_only_one_profile_runs_at_a_time(tmp_path):
+    store = ProfileStore(str(tmp_path), max_profiles=10)
+    outer, inner = uuid4(), uuid4()
+
+    with capture(store, outer) as outer_profiling:
+        with capture(store, inner) as inner_profiling:
+            build_index(inner)
+
+    assert outer_profiling and not inner_profiling
+    assert store.path(outer).exists()
+    assert not store.path(inner).exists()
+
+
+def test_store_keeps_the_newest_profiles(tmp_path):
+    store = ProfileStore(str(tmp_path), max_profiles=2)
+    profile_ids = [uuid4() for _ in range(3)]
+    for age, profile_id in enumerate(profile_ids):
+        path = store.save(profile_id, cProfile.Profile())
+        os.utime(path, (age, age))
+    store.save(uuid4(), cProfile.Profile())
+
+    assert not store.path(profile_ids[0]).exists()
+    assert not store.path(profile_ids[1]).exists()
+    assert store.path(profile_ids[2]).exists()
+
+
+class FailingStore(ProfileStore):
+    def save(self, profile_id, profiler):
+        raise OSError("disk full")
+
+
+def test_a_failed_save_is_logged_not_raised(tmp_path):
+    with capture(FailingStore(str(tmp_path), max_profiles=10), uuid4()) as profiling:
+        build_index(uuid4())
+
+    assert profiling
+    # The failure released the lock, so the next capture runs.
+    with capture(ProfileStore(str(tmp_path), max_profiles=10), uuid4()) as profiling:
+        pass
+    assert profiling
+
+
+def test_profile_is_saved_before_the_response_completes(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings.profiling, "admin_key", "secret")
+    store = ProfileStore(str(tmp_path), max_profiles=10)
+    profile_ids: list[UUID] = []
+    saved_when_complete = []
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"partial", "more_body": True})
+        await send({"type": "http.response.body", "body": b"done"})
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            profile_ids.append(UUID(dict(message["headers"])[b"x-profile-id"].decode()))
+        elif not message.get("more_body"):
+            saved_when_complete.append(store.path(profile_ids[0]).exists())
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/healthz",
+        "headers": [(b"x-profile", b"1"), (b"x-admin-key", b"secret")],
+    }
+    asyncio.run(ProfilingMiddleware(app, store)(scope, receive, send))
+
+    assert saved_when_complete == [True]
@@ -0,0 +1,76 @@
+import asyncio
+from uuid import uuid4
+
+from vectorless_rag_service.core.models import QueryRequest, QueryResponse, QueryTrace
+from vectorless_rag_service.storage.query_cache import (
+    MemoryQueryCache,
+    SqliteQueryCache,
+    normalize_question,
+)
+
+
+def response(answer: str) -> QueryResponse:
+    return QueryResponse(
+        answer=answer, citations=[], trace=QueryTrace(visited_nodes=[], decisions=[])
+    )
+
+
+def test_normalize_question_ignores_case_and_spacing():
+    assert normalize_question("  What is\tthe  SUMMARY? ") == "what is the summary?"
+
+
+def test_memory_cache_evicts_lru_and_drops_old_versions():
+    async def scenario():
+        cache = MemoryQueryCache(max_entries=2)
+        document_id = uuid4()
+        first = QueryRequest(document_id=document_id, question="termination")
+        second = first.model_copy(update={"question": "renewal"})
+        third = first.model_copy(update={"question": "payment"})
+
+        await cache.put(first, "v1", "baseline", response("a"))
+        await cache.put(second, "v1", "baseline", response("b"))
+        assert await cache.get(first, "v1", "baseline") == response("a")
+        await cache.put(third, "v1", "baseline", response("c"))
+        assert await cache.get(second, "v1", "baseline") is None
+        assert await cache.get(first.model_copy(update={"top_k": 5}), "v1", "baseline") is None
+
+        await cache.put(third, "v2", "baseline", response("d"))
+        assert await cache.get(first, "v1", "baseline") is None
+        assert await cache.get(third, "v2", "baseline") == response("d")
+
+    asyncio.run(scenario())
+
+
+def test_sqlite_cache_is_shared_and_invalidated_by_new_version(tmp_path):
+    async def scenario():
+        path = str(tmp_path / "query_cache.db")
+        writer = SqliteQueryCache(path, max_entries=100)
+        reader = SqliteQueryCache(path, max_entries=100)
+        request = QueryRequest(document_id=uuid4(), question="termination clause")
+
+        await writer.put(request, "v1", "baseline", response("thirty days"))
+        assert await reader.get(request, "v1", "baseline") == response("thirty days")
+
+        await reader.put(
+            request.model_copy(update={"mode": "content"}), "v2", "baseline", response("x")
+        )
+        assert await writer.get(request, "v1", "baseline") is None
+
+    asyncio.run(scenario())
+
+
+def test_cache_keys_on_retriever_and_skips_degraded_responses():
+    async def scenario():
+        cache = MemoryQueryCache(max_entries=10)
+        request = QueryRequest(document_id=uuid4(), question="termination")
+        fallback = response("fallback")
+        fallback.trace.degraded = True
+
+        await cache.put(request, "v1", "llm-navigation", fallback)
+        assert await cache.get(request, "v1", "llm-navigation") is None
+
+        await cache.put(request, "v1", "baseline", response("baseline"))
+        assert await cache.get(request, "v1", "llm-navigation") is None
+        assert await cache.get(request, "v1", "baseline") == response("baseline")
+
+    asyncio.run(scenario())
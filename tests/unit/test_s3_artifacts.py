@@ -0,0 +1,86 @@
+from uuid import uuid4
+
+import pytest
+from botocore.exceptions import ClientError
+from moto import mock_aws
+
+from vectorless_rag_service.indexing.index_builder import BaselineIndexBuilder
+from vectorless_rag_service.storage.artifacts import S3ArtifactStore
+from vectorless_rag_service.storage.s3 import build_s3_client
+
+BUCKET = "artifacts-test"
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with mock_aws():
+        client = build_s3_client(None)
+        client.create_bucket(Bucket=BUCKET)
+        calls: list[str] = []
+        client.meta.events.register("before-call.s3", lambda model, **_: calls.append(model.name))
+        yield client, calls
+
+
+def test_get_is_one_conditional_request_served_from_disk_cache(s3, tmp_path):
+    client, calls = s3
+    store = S3ArtifactStore(BUCKET, None, cache_path=str(tmp_path), client=client)
+    document_id = uuid4()
+    builder = BaselineIndexBuilder()
+    store.put(document_id, builder.build(document_id, "1 Terms\n\nNet thirty."))
+
+    calls.clear()
+    first = store.get(document_id)
+    second = store.get(document_id)
+    assert calls == ["GetObject", "GetObject"]
+    assert second == first
+
+    calls.clear()
+    _, etag = store.get_versioned(document_id)
+    assert store.get_versioned(document_id, etag) == (None, etag)
+    assert calls == ["GetObject", "GetObject"]
+
+    updated = builder.build(document_id, "1 Terms\n\nNet sixty.")
+    store.put(document_id, updated)
+    assert store.get(document_id) == updated
+
+    with pytest.raises(FileNotFoundError):
+        store.get(uuid4())
+
+
+def test_open_ranged_fetches_only_the_needed_bytes(s3):
+    client, calls = s3
+    store = S3ArtifactStore(BUCKET, None, artifact_format="binary", client=client)
+    document_id = uuid4()
+    text = "\n\n".join(f"{n} Clause {n}\nTerm {n} " + "detail " * 200 for n in range(1, 1000))
+    artifact = BaselineIndexBuilder(max_pages=1000).build(document_id, text)
+    store.put(document_id, artifact)
+    size = client.head_object(Bucket=BUCKET, Key=f"artifacts/{document_id}.vrsa")["ContentLength"]
+
+    fetched: list[int] = []
+    client.meta.events.register(
+        "after-call.s3.GetObject",
+        lambda parsed, **_: fetched.append(parsed["ContentLength"]),
+    )
+    ranged = store.open_ranged(document_id)
+
+    assert ranged.node_at(5) == artifact.nodes[5]
+    assert ranged.span_at(len(artifact.spans) - 1) == artifact.spans[-1]
+    assert sum(fetched) < size / 2
+
+
+def test_only_a_missing_key_reads_as_no_artifact(s3, monkeypatch):
+    client, _ = s3
+    store = S3ArtifactStore(BUCKET, None, client=client)
+    document_id = uuid4()
+    assert store.version(document_id) is None
+    assert not store.exists(document_id)
+
+    def throttled(**_):
+        raise ClientError({"Error": {"Code": "SlowDown", "Message": "Reduce rate"}}, "HeadObject")
+
+    monkeypatch.setattr(client, "head_object", throttled)
+    with pytest.raises(ClientError):
+        store.exists(document_id)
@@ -0,0 +1,64 @@
+import pytest
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from prometheus_client import REGISTRY
+
+from vectorless_rag_service.observability.metrics import STAGE_DURATION
+from vectorless_rag_service.observability.stages import StageTimings, page_bucket, stage
+
+
+def _count(name: str, pages: str, backend: str = "none") -> float:
+    labels = {"stage": name, "pages": pages, "backend": backend}
+    return REGISTRY.get_sample_value("vrs_stage_duration_seconds_count", labels) or 0.0
+
+
+def _exemplars(name: str) -> list[dict[str, str]]:
+    return [
+        sample.exemplar.labels
+        for metric in STAGE_DURATION.collect()
+        for sample in metric.samples
+        if sample.labels.get("stage") == name and sample.exemplar is not None
+    ]
+
+
+def test_page_bucket():
+    assert [page_bucket(pages) for pages in (None, 0, 10, 11, 300, 301)] == [
+        "unknown",
+        "<=10",
+        "<=10",
+        "<=50",
+        "<=300",
+        ">300",
+    ]
+
+
+def test_stage_records_duration_with_trace_exemplar():
+    root_tracer = TracerProvider().get_tracer("test")
+    with root_tracer.start_as_current_span("request") as root:
+        with stage("unit_stage", backend="s3") as labels:
+            labels.pages = 42
+
+    assert _count("unit_stage", "<=50", "s3") == 1
+    trace_id = trace.format_trace_id(root.get_span_context().trace_id)
+    assert _exemplars("unit_stage") == [{"trace_id": trace_id}]
+
+
+def test_failed_stage_is_not_recorded():
+    with pytest.raises(RuntimeError), stage("unit_failing_stage"):
+        raise RuntimeError("boom")
+
+    assert _count("unit_failing_stage", "unknown") == 0
+
+
+def test_stage_timings_record_one_observation_per_stage():
+    timings = StageTimings()
+    for _ in range(3):
+        with timings.measure("unit_looped_a"):
+            pass
+        with timings.measure("unit_looped_b"):
+            pass
+
+    timings.record(pages=120)
+
+    assert _count("unit_looped_a", "<=300") == 1
+    assert _count("unit_looped_b", "<=300") == 1
@@ -0,0 +1,44 @@
+import json
+import os
+import subprocess
+import sys
+
+# Own import time of the app, on top of the frameworks it is built on. It measured
+# about 0.45 s when the budget was set; the margin absorbs slower CI machines.
+IMPORT_BUDGET_SECONDS = 0.75
+LAZY_MODULES = (
+    "boto3",
+    "botocore",
+    "PyPDF2",
+    "opentelemetry.exporter.otlp.proto.http.trace_exporter",
+    "opentelemetry.instrumentation.fastapi",
+)
+PROBE = f"""
+import json, sys, time
+import anyio, fastapi, prometheus_client, pydantic_settings, sqlalchemy.ext.asyncio, structlog
+
+start = time.perf_counter()
+import vectorless_rag_service.main
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "loaded": [name for name in {LAZY_MODULES!r} if name in sys.modules],
+}}))
+"""
+
+
+def test_app_import_is_lazy_and_within_budget():
+    env = {
+        key: value
+        for key, value in os.environ.items()
+        if key not in ("VRS_STORAGE__PROVIDER", "VRS_OBSERVABILITY__OTLP_ENDPOINT")
+    }
+
+    result = json.loads(
+        subprocess.run(
+            [sys.executable, "-c", PROBE], env=env, capture_output=True, check=True, text=True
+        ).stdout
+    )
+
+    assert result["loaded"] == []
+    assert result["seconds"] < IMPORT_BUDGET_SECONDS
@@ -0,0 +1,40 @@
+import asyncio
+
+from vectorless_rag_service.api.uploads import UploadSizeLimitMiddleware, decode_text_file
+
+
+def test_decode_text_file_handles_characters_split_across_chunks(tmp_path):
+    path = tmp_path / "doc.txt"
+    text = "naïve café " * 100
+    path.write_bytes(text.encode("utf-8"))
+
+    assert decode_text_file(path, max_chars=len(text), chunk_size=7) == text
+
+
+def test_malformed_content_length_is_a_bad_request():
+    async def app(scope, receive, send):
+        raise AssertionError("the request should not reach the app")
+
+    middleware = UploadSizeLimitMiddleware(app, max_body_bytes=1024, paths=("/v1/documents",))
+
+    async def request(content_length: bytes) -> int:
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {
+            "type": "http",
+            "method": "POST",
+            "path": "/v1/documents",
+            "headers": [(b"content-length", content_length)],
+        }
+        await middleware(scope, receive, send)
+        return sent[0]["status"]
+
+    for value in (b"-1", b"abc", b"", b"1e3", b"+5"):
+        assert asyncio.run(request(value)) == 400
+    assert asyncio.run(request(b"4096")) == 413
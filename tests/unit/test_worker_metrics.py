@@ -0,0 +1,16 @@
+import httpx
+
+from vectorless_rag_service.observability.metrics import INDEX_DURATION
+from vectorless_rag_service.worker import serve_metrics
+
+
+def test_worker_serves_its_metrics():
+    INDEX_DURATION.observe(0.5)
+    server = serve_metrics(0, "127.0.0.1")
+    try:
+        response = httpx.get(f"http://127.0.0.1:{server.server_port}/metrics")
+    finally:
+        server.shutdown()
+
+    assert response.status_code == 200
+    assert "vrs_index_duration_seconds_count" in response.text